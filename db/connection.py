@@ -1,39 +1,532 @@
+import itertools
+import re
 import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
 from tkinter import filedialog, messagebox
+from db.pool import ReadConnectionPool
+from db.profiles import DEFAULT_PROFILE, apply_tuning_profile
+from db.schema import SchemaCache
+from db.udf import UDFRegistry
+
+# Modos de apertura de una base de datos
+MODE_READ_WRITE = "rw"
+MODE_READ_ONLY = "ro"
+MODE_IMMUTABLE = "immutable"
+MODE_MEMORY = "memory"
+
+MODE_LABELS = {
+    MODE_READ_WRITE: "lectura/escritura",
+    MODE_READ_ONLY: "solo lectura",
+    MODE_IMMUTABLE: "snapshot inmutable",
+    MODE_MEMORY: "copia en memoria",
+}
+
+# Modos que admiten escrituras
+WRITABLE_MODES = (MODE_READ_WRITE, MODE_MEMORY)
+
+
+def build_db_uri(db_path, mode=MODE_READ_WRITE):
+    """
+    Construye la URI SQLite para abrir una base de datos en el modo indicado.
+
+    Parameters:
+    - db_path: Ruta del archivo de base de datos.
+    - mode: MODE_READ_WRITE, MODE_READ_ONLY o MODE_IMMUTABLE.
+
+    En modo inmutable SQLite no toma bloqueos ni comprueba cambios en el archivo.
+    """
+    uri = Path(db_path).resolve().as_uri()
+    if mode == MODE_READ_ONLY:
+        return f"{uri}?mode=ro"
+    if mode == MODE_IMMUTABLE:
+        return f"{uri}?mode=ro&immutable=1"
+    return uri
+
+
+def build_memory_uri(name):
+    """
+    Construye la URI de una base de datos en memoria con caché compartida, a la que
+    pueden abrirse varias conexiones mientras al menos una siga abierta.
+
+    Parameters:
+    - name: Nombre único de la base de datos en memoria.
+    """
+    return f"file:{name}?mode=memory&cache=shared"
+
+
+# Segundos entre dos reintentos de una sentencia bloqueada en una copia en memoria
+LOCKED_RETRY_INTERVAL = 0.02
+
+
+class SharedCacheCursor(sqlite3.Cursor):
+    """
+    Cursor de una copia en memoria. Con caché compartida, SQLite informa de los bloqueos
+    de tabla con SQLITE_LOCKED al instante, sin respetar busy_timeout, así que mientras
+    otra pestaña tiene una transacción de escritura abierta cualquier sentencia fallaría.
+    execute, executemany y executescript la reintentan hasta agotar el busy_timeout de la
+    conexión, como esperaría una conexión a un archivo en modo WAL.
+    """
+
+    def _retry_locked(self, method, *args):
+        """
+        Llama a un método de ejecución y lo repite mientras falle por SQLITE_LOCKED.
+        Solo se repite si el intento fallido no llegó a modificar filas, para no aplicar
+        dos veces las primeras filas de un executemany o las primeras sentencias de un script.
+        """
+        deadline = None
+        while True:
+            changes = self.connection.total_changes
+            try:
+                return method(*args)
+            except sqlite3.OperationalError as e:
+                if getattr(e, 'sqlite_errorcode', 0) & 0xff != sqlite3.SQLITE_LOCKED:
+                    raise
+                if self.connection.total_changes != changes:
+                    raise
+                if deadline is None:
+                    timeout = self.connection.execute("PRAGMA busy_timeout;").fetchone()[0]
+                    deadline = time.monotonic() + timeout / 1000
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(LOCKED_RETRY_INTERVAL)
+
+    def execute(self, sql, parameters=()):
+        return self._retry_locked(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        # Un reintento tiene que volver a recorrer las filas desde la primera
+        if not isinstance(seq_of_parameters, (list, tuple)):
+            seq_of_parameters = list(seq_of_parameters)
+        return self._retry_locked(super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self._retry_locked(super().executescript, sql_script)
+
+
+class SharedCacheConnection(sqlite3.Connection):
+    """Conexión a una copia en memoria cuyos cursores reintentan las sentencias bloqueadas."""
+
+    def cursor(self, factory=SharedCacheCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
 
 class DatabaseManager:
+    """
+    Registro de las bases de datos abiertas por la aplicación.
+
+    Mantiene varias bases de datos abiertas a la vez; una de ellas es la activa y su
+    conexión es la que usa la interfaz. Cada base de datos tiene además un pool de
+    conexiones de solo lectura para el trabajo en segundo plano y conexiones de
+    sesión, una por pestaña del editor, para ejecutar consultas en paralelo.
+    """
+
+    READ_POOL_SIZE = 4
+    # Sentencias preparadas que conserva cada conexión (sqlite3 usa 128 por defecto)
+    STATEMENT_CACHE_SIZE = 512
+
     def __init__(self):
-        self.db_connection = None
-        self.db_path = None
+        self.databases = {}   # Ruta -> {'connection', 'mode', 'uri', 'pool', 'attached', 'sessions', 'schema'}
+        self.db_path = None   # Ruta de la base de datos activa
+        self.profile = DEFAULT_PROFILE
+        self.memory_names = itertools.count(1)
+        self.udf_registry = UDFRegistry()   # Funciones y extensiones que se registran en cada conexión
+
+    @property
+    def db_connection(self):
+        """Conexión de la base de datos activa, o None si no hay ninguna."""
+        entry = self.databases.get(self.db_path)
+        return entry['connection'] if entry else None
+
+    @property
+    def mode(self):
+        """Modo de apertura de la base de datos activa."""
+        entry = self.databases.get(self.db_path)
+        return entry['mode'] if entry else MODE_READ_WRITE
+
+    @property
+    def read_only(self):
+        """Indica si la conexión actual no admite escrituras."""
+        return self.mode not in WRITABLE_MODES
+
+    @property
+    def is_memory_copy(self):
+        """Indica si la base de datos activa es una copia en memoria de su archivo."""
+        return self.mode == MODE_MEMORY
+
+    def _open_connection(self, db_path, mode=MODE_READ_WRITE, check_same_thread=True, uri=None, query_only=None):
+        """
+        Abre una conexión SQLite en el modo indicado y le aplica el perfil de ajuste activo.
+        Las copias en memoria se abren con su URI propia en lugar de la del archivo y con
+        SharedCacheConnection, que espera a los bloqueos de tabla de la caché compartida.
+        Las funciones y extensiones del registro de complementos se registran en todas.
+        """
+        # Siempre se abre mediante URI para que ATTACH también acepte URIs
+        connection = sqlite3.connect(
+            uri or build_db_uri(db_path, mode),
+            uri=True,
+            check_same_thread=check_same_thread,
+            cached_statements=self.STATEMENT_CACHE_SIZE,
+            factory=SharedCacheConnection if uri else sqlite3.Connection
+        )
+        if query_only is None:
+            query_only = mode not in WRITABLE_MODES
+        if query_only:
+            connection.execute("PRAGMA query_only=ON;")
+        self.udf_registry.apply(connection)
+        # journal_mode no tiene sentido en una base de datos en memoria
+        apply_tuning_profile(connection, self.profile, read_only=mode != MODE_READ_WRITE)
+        return connection
+
+    def _register(self, db_path, connection, mode, uri=None):
+        """Añade una base de datos al registro y la marca como activa."""
+        read_mode = mode if mode in (MODE_IMMUTABLE, MODE_MEMORY) else MODE_READ_ONLY
+        self.databases[db_path] = {
+            'connection': connection,
+            'mode': mode,
+            'uri': uri,   # URI de la copia en memoria, o None si se usa el archivo
+            'pool': ReadConnectionPool(
+                lambda: self._open_connection(
+                    db_path, read_mode, check_same_thread=False, uri=uri, query_only=True
+                ),
+                self.READ_POOL_SIZE
+            ),
+            'attached': {},
+            'sessions': {},   # Conexión de sesión -> alias adjuntados en ella
+            'stale_sessions': set(),   # Sesiones que aún no tienen el perfil de ajuste activo
+            'schema': SchemaCache(connection)
+        }
+        self.db_path = db_path
+
+    def _close(self, db_path):
+        """Cierra la conexión principal y el pool de una base de datos y la quita del registro."""
+        entry = self.databases.pop(db_path)
+        entry['pool'].close_all()
+        for session in entry['sessions']:
+            session.interrupt()
+            session.close()
+        entry['connection'].close()
+
+    def set_profile(self, profile_name):
+        """
+        Cambia el perfil de ajuste activo y lo aplica a las conexiones abiertas.
+
+        La conexión principal se reajusta en el momento. Las conexiones del pool se
+        reabren con el perfil nuevo y las sesiones lo reciben en sync_session, antes de su
+        siguiente consulta, porque pueden estar ejecutando una en otro hilo.
+
+        Devuelve la lista de PRAGMAs que no pudieron aplicarse en la conexión activa.
+        """
+        failed = []
+        self.profile = profile_name
+        for db_path, entry in self.databases.items():
+            result = apply_tuning_profile(
+                entry['connection'], profile_name, read_only=entry['mode'] != MODE_READ_WRITE
+            )
+            if db_path == self.db_path:
+                failed = result
+            entry['pool'].recycle()
+            entry['stale_sessions'].update(entry['sessions'])
+        return failed
 
-    def connect_db(self):
-        """Conecta la aplicación a una base de datos SQLite seleccionada por el usuario."""
+    def open_databases(self):
+        """Devuelve las rutas de las bases de datos abiertas, en orden de apertura."""
+        return list(self.databases)
+
+    def switch_db(self, db_path):
+        """
+        Cambia la base de datos activa por otra ya abierta.
+
+        Returns:
+            True si el cambio se realizó
+        """
+        if db_path in self.databases:
+            self.db_path = db_path
+            return True
+        return False
+
+    def schema_cache(self, db_path=None):
+        """
+        Devuelve la caché del esquema de una base de datos abierta.
+
+        Args:
+            db_path: Base de datos (por defecto, la activa)
+
+        Returns:
+            SchemaCache o None si no hay base de datos abierta
+        """
+        entry = self.databases.get(db_path or self.db_path)
+        return entry['schema'] if entry else None
+
+    @contextmanager
+    def read_connection(self, db_path=None):
+        """
+        Context manager que presta una conexión de solo lectura del pool.
+
+        Args:
+            db_path: Base de datos a leer (por defecto, la activa)
+        """
+        entry = self.databases[db_path or self.db_path]
+        with entry['pool'].connection() as connection:
+            yield connection
+
+    def read_uri(self, db_path=None):
+        """
+        Devuelve la URI con la que otra conexión puede leer una base de datos abierta,
+        por ejemplo para adjuntarla con ATTACH: la de su copia en memoria, o la del
+        archivo en solo lectura (o como snapshot inmutable si se abrió así).
+
+        Args:
+            db_path: Base de datos (por defecto, la activa)
+        """
+        db_path = db_path or self.db_path
+        entry = self.databases[db_path]
+        if entry['uri']:
+            return entry['uri']
+        return build_db_uri(db_path, MODE_IMMUTABLE if entry['mode'] == MODE_IMMUTABLE else MODE_READ_ONLY)
+
+    def open_read_only(self, db_path):
+        """
+        Abre una conexión de solo lectura a un archivo que no tiene por qué estar en el
+        registro, por ejemplo para compararlo con la base de datos activa. Puede usarse
+        desde un hilo de trabajo y debe cerrarla quien la abre.
+
+        Args:
+            db_path: Ruta del archivo de base de datos
+        """
+        return self._open_connection(db_path, MODE_READ_ONLY, check_same_thread=False)
+
+    def open_reader(self, db_path=None):
+        """
+        Abre una conexión de solo lectura propia a una base de datos abierta, en el mismo
+        modo que las del pool: sobre su copia en memoria si la tiene, o sobre el archivo.
+        Puede usarse desde un hilo de trabajo y debe cerrarla quien la abre.
+
+        Args:
+            db_path: Base de datos (por defecto, la activa)
+        """
+        db_path = db_path or self.db_path
+        entry = self.databases.get(db_path)
+        if entry is None:
+            raise ValueError(f"La base de datos ya no está abierta: {db_path}")
+        read_mode = entry['mode'] if entry['mode'] in (MODE_IMMUTABLE, MODE_MEMORY) else MODE_READ_ONLY
+        return self._open_connection(db_path, read_mode, check_same_thread=False, uri=entry['uri'], query_only=True)
+
+    def acquire_session(self, db_path=None):
+        """
+        Abre una conexión de sesión para una pestaña del editor. Se abre en el mismo modo
+        que la base de datos y puede usarse desde un hilo de trabajo.
+
+        Args:
+            db_path: Base de datos de la sesión (por defecto, la activa)
+
+        Returns:
+            Tupla (conexión, ruta de la base de datos)
+        """
+        db_path = db_path or self.db_path
+        entry = self.databases[db_path]
+        connection = self._open_connection(db_path, entry['mode'], check_same_thread=False, uri=entry['uri'])
+        entry['sessions'][connection] = set()
+        self.sync_session(connection, db_path)
+        return connection, db_path
+
+    def sync_session(self, connection, db_path):
+        """
+        Replica en una conexión de sesión las bases de datos adjuntadas a la base activa
+        y le aplica el perfil de ajuste si cambió desde que se abrió o se sincronizó.
+        Debe llamarse cuando la sesión no está ejecutando ninguna consulta.
+
+        Args:
+            connection: Conexión de sesión
+            db_path: Base de datos a la que pertenece la sesión
+        """
+        entry = self.databases[db_path]
+        if connection in entry['stale_sessions']:
+            entry['stale_sessions'].discard(connection)
+            # journal_mode es del archivo y ya lo cambió la conexión principal
+            apply_tuning_profile(connection, self.profile, read_only=True)
+        session_aliases = entry['sessions'][connection]
+        for alias in session_aliases - set(entry['attached']):
+            connection.execute(f"DETACH DATABASE {alias};")
+            session_aliases.discard(alias)
+        for alias, attach_path in entry['attached'].items():
+            if alias not in session_aliases:
+                mode = MODE_READ_WRITE if entry['mode'] in WRITABLE_MODES else MODE_READ_ONLY
+                connection.execute(f"ATTACH DATABASE ? AS {alias};", (build_db_uri(attach_path, mode),))
+                session_aliases.add(alias)
+
+    def has_session(self, connection, db_path):
+        """Indica si una conexión de sesión sigue abierta en el registro."""
+        entry = self.databases.get(db_path)
+        return bool(entry) and connection in entry['sessions']
+
+    def release_session(self, connection, db_path):
+        """
+        Cierra una conexión de sesión. No hace nada si su base de datos ya se cerró.
+
+        Args:
+            connection: Conexión de sesión
+            db_path: Base de datos a la que pertenece la sesión
+        """
+        entry = self.databases.get(db_path)
+        if entry and entry['sessions'].pop(connection, None) is not None:
+            entry['stale_sessions'].discard(connection)
+            connection.close()
+
+    def attach_database(self, attach_path, alias):
+        """
+        Adjunta otra base de datos a la conexión activa con ATTACH DATABASE,
+        para poder hacer consultas entre archivos (alias.tabla).
+
+        Args:
+            attach_path: Ruta de la base de datos a adjuntar
+            alias: Nombre del esquema con el que se adjunta
+        """
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", alias):
+            raise ValueError(f"Alias no válido: {alias}")
+        entry = self.databases[self.db_path]
+        mode = MODE_READ_WRITE if entry['mode'] in WRITABLE_MODES else MODE_READ_ONLY
+        entry['connection'].execute(
+            f"ATTACH DATABASE ? AS {alias};", (build_db_uri(attach_path, mode),)
+        )
+        entry['attached'][alias] = attach_path
+
+    def detach_database(self, alias):
+        """
+        Separa una base de datos adjuntada previamente a la conexión activa.
+
+        Args:
+            alias: Nombre del esquema adjuntado
+        """
+        entry = self.databases[self.db_path]
+        entry['connection'].execute(f"DETACH DATABASE {alias};")
+        del entry['attached'][alias]
+
+    def attached_databases(self):
+        """Devuelve el diccionario alias -> ruta de las bases adjuntas a la base activa."""
+        entry = self.databases.get(self.db_path)
+        return dict(entry['attached']) if entry else {}
+
+    def _load_into_memory(self, db_path):
+        """
+        Copia un archivo de base de datos a una base de datos en memoria con
+        Connection.backup y devuelve la conexión principal a la copia, que la mantiene viva.
+
+        Returns:
+            Tupla (conexión, URI de la copia en memoria)
+        """
+        uri = build_memory_uri(f"tsuki_mem_{next(self.memory_names)}")
+        connection = self._open_connection(db_path, MODE_MEMORY, uri=uri)
+        source = sqlite3.connect(build_db_uri(db_path, MODE_READ_ONLY), uri=True)
+        try:
+            source.backup(connection)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        finally:
+            source.close()
+        return connection, uri
+
+    def save_memory_copy(self, target_path=None, db_path=None):
+        """
+        Guarda una copia en memoria en un archivo con Connection.backup. Lee la copia con
+        una conexión del pool, por lo que puede llamarse desde un hilo de trabajo.
+
+        Args:
+            target_path: Archivo de destino (por defecto, el archivo original: escribir de vuelta)
+            db_path: Base de datos en memoria (por defecto, la activa)
+        """
+        db_path = db_path or self.db_path
+        if self.databases[db_path]['mode'] != MODE_MEMORY:
+            raise ValueError(f"La base de datos no es una copia en memoria: {db_path}")
+        target = sqlite3.connect(target_path or db_path)
+        try:
+            with self.read_connection(db_path) as source:
+                source.backup(target)
+        finally:
+            target.close()
+
+    def connect_db(self, mode=MODE_READ_WRITE):
+        """
+        Conecta la aplicación a una base de datos SQLite seleccionada por el usuario.
+
+        El modo permite abrirla en solo lectura, como snapshot inmutable o como copia en
+        memoria: en este último caso las consultas trabajan sobre la RAM y el archivo no
+        cambia hasta que se escribe de vuelta con save_memory_copy. Si la base de datos
+        ya estaba abierta, se reabre en el modo pedido tras confirmarlo y pasa a ser la
+        activa; una copia en memoria abierta no se reabre, para no perder sus cambios.
+        """
         db_path = filedialog.askopenfilename(
             title="Selecciona una base de datos existente",
             filetypes=[("SQLite DB", "*.db *.sqlite3")]
         )
 
+        if db_path and db_path in self.databases:
+            if self.databases[db_path]['mode'] == MODE_MEMORY:
+                # Reabrirla descartaría sin aviso los cambios que aún no se escribieron
+                messagebox.showwarning(
+                    "Copia en Memoria",
+                    f"{db_path} ya está abierta como copia en memoria.\n"
+                    "Escríbela de vuelta o desconéctala antes de volver a abrirla."
+                )
+                return False, None, None
+            if not messagebox.askyesno(
+                "Reabrir Base de Datos",
+                f"{db_path} ya está abierta. Al reabrirla se cancelarán las consultas en curso "
+                "sobre ella. ¿Continuar?"
+            ):
+                return False, None, None
+
         if db_path:
             try:
-                self.db_connection = sqlite3.connect(db_path)
-                self.db_path = db_path
-                messagebox.showinfo("Conexión Exitosa", f"Conectado a la base de datos: {db_path}")
-                return True, self.db_connection, db_path
+                uri = None
+                if mode == MODE_MEMORY:
+                    connection, uri = self._load_into_memory(db_path)
+                else:
+                    connection = self._open_connection(db_path, mode)
+                if db_path in self.databases:
+                    self._close(db_path)
+                self._register(db_path, connection, mode, uri)
+                messagebox.showinfo(
+                    "Conexión Exitosa",
+                    f"Conectado a la base de datos ({MODE_LABELS[mode]}): {db_path}"
+                )
+                return True, connection, db_path
             except Exception as e:
                 messagebox.showerror("Error de Conexión", str(e))
                 return False, None, None
         return False, None, None
 
     def disconnect_db(self):
-        """Desconecta la aplicación de la base de datos actualmente conectada."""
+        """
+        Desconecta la base de datos activa. Si quedan otras abiertas,
+        la última abierta pasa a ser la activa.
+        """
         if self.db_connection:
-            self.db_connection.close()
-            self.db_connection = None
-            self.db_path = None
-            messagebox.showinfo("Desconexión Exitosa", "Se ha desconectado de la base de datos.")
+            db_path = self.db_path
+            self._close(db_path)
+            remaining = self.open_databases()
+            self.db_path = remaining[-1] if remaining else None
+            messagebox.showinfo("Desconexión Exitosa", f"Se ha desconectado de la base de datos: {db_path}")
             return True
         return False
 
+    def close_all(self):
+        """Cierra todas las bases de datos abiertas."""
+        for db_path in self.open_databases():
+            self._close(db_path)
+        self.db_path = None
+
     def create_new_db(self):
         """Crea una nueva base de datos SQLite y la conecta."""
         db_path = filedialog.asksaveasfilename(
@@ -43,10 +536,12 @@ class DatabaseManager:
         )
         if db_path:
             try:
-                self.db_connection = sqlite3.connect(db_path)
-                self.db_path = db_path
+                connection = self._open_connection(db_path)
+                if db_path in self.databases:
+                    self._close(db_path)
+                self._register(db_path, connection, MODE_READ_WRITE)
                 messagebox.showinfo("Base de Datos Creada", f"Nueva base de datos creada: {db_path}")
-                return True, self.db_connection, db_path
+                return True, connection, db_path
             except Exception as e:
                 messagebox.showerror("Error al Crear Base de Datos", str(e))
                 return False, None, None
@@ -0,0 +1,159 @@
+import sqlite3
+import time
+from pathlib import Path
+
+# Archivo de historial por defecto, fuera de las bases de datos del usuario
+DEFAULT_HISTORY_PATH = Path.home() / ".tsukisql" / "history.db"
+
+# Criterios de ordenación del historial
+ORDER_RECENT = "recent"
+ORDER_SLOWEST = "slowest"
+ORDER_FREQUENT = "frequent"
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queries (
+    id INTEGER PRIMARY KEY,
+    executed_at REAL NOT NULL,
+    db_path TEXT,
+    sql TEXT NOT NULL,
+    duration REAL,
+    rows INTEGER,
+    status TEXT NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS queries_executed_at ON queries (executed_at);
+CREATE INDEX IF NOT EXISTS queries_duration ON queries (duration);
+CREATE INDEX IF NOT EXISTS queries_sql ON queries (sql);
+"""
+
+# Índice de texto completo sobre la columna sql, mantenido por un trigger
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS queries_fts USING fts5 (sql, content='queries', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS queries_fts_insert AFTER INSERT ON queries BEGIN
+    INSERT INTO queries_fts (rowid, sql) VALUES (new.id, new.sql);
+END;
+CREATE TRIGGER IF NOT EXISTS queries_fts_delete AFTER DELETE ON queries BEGIN
+    INSERT INTO queries_fts (queries_fts, rowid, sql) VALUES ('delete', old.id, old.sql);
+END;
+"""
+
+
+def fts_query(text):
+    """
+    Convierte el texto de búsqueda en una consulta FTS5 que busca todas las palabras
+    como prefijos, escapando las comillas para que no se interpreten como sintaxis.
+
+    Parameters:
+    - text: Texto de búsqueda escrito por el usuario.
+    """
+    terms = text.split()
+    return " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+class QueryHistory:
+    """
+    Historial persistente de las sentencias ejecutadas, guardado en su propio archivo SQLite.
+
+    Cada ejecución guarda la fecha, la base de datos, la duración, las filas y el resultado.
+    Si SQLite incluye FTS5, las búsquedas usan un índice de texto completo; si no, LIKE.
+    """
+
+    def __init__(self, history_path=DEFAULT_HISTORY_PATH):
+        """
+        Abre (o crea) el archivo de historial.
+
+        Args:
+            history_path: Ruta del archivo de historial
+        """
+        Path(history_path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(history_path))
+        self.connection.execute("PRAGMA journal_mode=WAL;")
+        self.connection.execute("PRAGMA synchronous=NORMAL;")
+        self.connection.executescript(SCHEMA)
+        try:
+            self.connection.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False  # SQLite compilado sin FTS5
+        self.connection.commit()
+
+    def record(self, db_path, sql, duration, rows=None, status=STATUS_OK, error=None):
+        """
+        Guarda una ejecución en el historial.
+
+        Args:
+            db_path: Base de datos sobre la que se ejecutó
+            sql: Texto SQL ejecutado
+            duration: Duración en segundos
+            rows: Filas devueltas o modificadas
+            status: STATUS_OK o STATUS_ERROR
+            error: Mensaje de error, si lo hubo
+        """
+        self.connection.execute(
+            "INSERT INTO queries (executed_at, db_path, sql, duration, rows, status, error) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?);",
+            (time.time(), db_path, sql, duration, rows, status, error)
+        )
+        self.connection.commit()
+
+    def search(self, text="", db_path=None, order=ORDER_RECENT, limit=500):
+        """
+        Busca en el historial.
+
+        Args:
+            text: Palabras que debe contener la sentencia (vacío para no filtrar)
+            db_path: Limita la búsqueda a una base de datos (None para todas)
+            order: ORDER_RECENT, ORDER_SLOWEST u ORDER_FREQUENT
+            limit: Número máximo de resultados
+
+        Returns:
+            Lista de tuplas (sql, db_path, executed_at, duration, rows, status, executions).
+            Con ORDER_FREQUENT cada sentencia aparece una vez por base de datos, con los datos
+            de su última ejecución, su duración media y el número de ejecuciones; en los
+            demás casos executions es 1.
+        """
+        conditions = []
+        params = []
+        if text.strip():
+            if self.has_fts:
+                conditions.append("id IN (SELECT rowid FROM queries_fts WHERE queries_fts MATCH ?)")
+                params.append(fts_query(text))
+            else:
+                for term in text.split():
+                    conditions.append("sql LIKE ? ESCAPE '\\'")
+                    params.append("%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        if db_path:
+            conditions.append("db_path = ?")
+            params.append(db_path)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        if order == ORDER_FREQUENT:
+            # Con un único max(), SQLite toma rows y status de la fila de la última ejecución
+            query = (
+                "SELECT sql, db_path, max(executed_at), avg(duration), rows, status, count(*) AS executions "
+                f"FROM queries {where} GROUP BY sql, db_path ORDER BY executions DESC, max(executed_at) DESC LIMIT ?;"
+            )
+        else:
+            order_by = "duration DESC" if order == ORDER_SLOWEST else "executed_at DESC"
+            query = (
+                "SELECT sql, db_path, executed_at, duration, rows, status, 1 "
+                f"FROM queries {where} ORDER BY {order_by} LIMIT ?;"
+            )
+        params.append(limit)
+        return self.connection.execute(query, params).fetchall()
+
+    def clear(self):
+        """
+        Elimina todo el historial.
+        """
+        self.connection.execute("DELETE FROM queries;")
+        self.connection.commit()
+
+    def close(self):
+        """
+        Cierra el archivo de historial.
+        """
+        self.connection.close()
@@ -0,0 +1,133 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+
+class ReadConnectionPool:
+    """
+    Pool pequeño de conexiones de solo lectura a un mismo archivo de base de datos.
+    Permite que el trabajo en segundo plano (exportaciones, ERD, consultas largas)
+    lea en paralelo sin competir por la conexión que usa el editor.
+    """
+
+    def __init__(self, connection_factory, size=4):
+        """
+        Inicializa el pool. Las conexiones se crean bajo demanda.
+
+        Args:
+            connection_factory: Función sin argumentos que abre una conexión de solo lectura
+            size: Número máximo de conexiones abiertas a la vez
+        """
+        self.connection_factory = connection_factory
+        self.size = size
+        self.idle = queue.LifoQueue()
+        self.created = 0
+        self.generation = 0     # Se incrementa con recycle()
+        self.generations = {}   # Conexión -> generación en la que se abrió
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        """
+        Obtiene una conexión libre, creándola si aún no se alcanzó el tamaño máximo.
+        Si todas están en uso, espera a que se libere alguna.
+
+        Args:
+            timeout: Segundos máximos de espera (None espera indefinidamente)
+
+        Returns:
+            Conexión de solo lectura
+        """
+        if self.closed:
+            raise RuntimeError("El pool de conexiones está cerrado")
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self.lock:
+            create = self.created < self.size
+            if create:
+                self.created += 1
+        if create:
+            try:
+                connection = self.connection_factory()
+            except Exception:
+                with self.lock:
+                    self.created -= 1
+                raise
+            with self.lock:
+                self.generations[connection] = self.generation
+            return connection
+        return self.idle.get(timeout=timeout)
+
+    def release(self, connection):
+        """
+        Devuelve una conexión al pool. Si el pool ya se cerró, la conexión se cierra.
+
+        Args:
+            connection: Conexión obtenida con acquire()
+        """
+        if self.closed:
+            connection.close()
+            return
+        with self.lock:
+            stale = self.generations.get(connection) != self.generation
+            if stale:
+                self.generations.pop(connection, None)
+        if stale:
+            # Se abrió antes de recycle(): se sustituye por una nueva para no dejar sin
+            # conexión a quien esté esperando en acquire()
+            connection.close()
+            try:
+                connection = self.connection_factory()
+            except Exception:
+                with self.lock:
+                    self.created -= 1
+                raise
+            with self.lock:
+                self.generations[connection] = self.generation
+        self.idle.put(connection)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        Context manager que obtiene una conexión y la devuelve al terminar.
+
+        Args:
+            timeout: Segundos máximos de espera por una conexión libre
+        """
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def recycle(self):
+        """
+        Cierra las conexiones libres para que las siguientes se abran de nuevo con la
+        fábrica, por ejemplo tras cambiar el perfil de ajuste. Las conexiones en uso se
+        cierran cuando se devuelven.
+        """
+        with self.lock:
+            self.generation += 1
+        while True:
+            try:
+                connection = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            with self.lock:
+                self.generations.pop(connection, None)
+                self.created -= 1
+            connection.close()
+
+    def close_all(self):
+        """
+        Cierra las conexiones libres y marca el pool como cerrado.
+        Las conexiones en uso se cierran cuando se devuelven.
+        """
+        self.closed = True
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
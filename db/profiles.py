@@ -0,0 +1,65 @@
+import sqlite3
+
+# Perfiles de ajuste para las conexiones SQLite.
+# Cada perfil define los PRAGMAs que se aplican al abrir (o reajustar) una conexión.
+TUNING_PROFILES = {
+    "Lectura interactiva": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,        # 64 MB de caché de páginas
+        "mmap_size": 268435456,      # 256 MB de E/S mapeada en memoria
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "Carga masiva": {
+        "journal_mode": "MEMORY",
+        "synchronous": "OFF",
+        "cache_size": -262144,       # 256 MB de caché de páginas
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+    "Seguro": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,         # Valor por defecto de SQLite (~2 MB)
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+}
+
+DEFAULT_PROFILE = "Lectura interactiva"
+
+# Orden en el que se aplican los PRAGMAs (busy_timeout primero para esperar bloqueos)
+PRAGMA_ORDER = ("busy_timeout", "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store")
+
+# PRAGMAs que modifican el archivo y no pueden aplicarse en conexiones de solo lectura
+WRITE_PRAGMAS = ("journal_mode",)
+
+
+def apply_tuning_profile(db_connection, profile_name, read_only=False):
+    """
+    Aplica los PRAGMAs de un perfil de ajuste a una conexión abierta.
+
+    Parameters:
+    - db_connection: Conexión a la base de datos SQLite.
+    - profile_name: Nombre del perfil definido en TUNING_PROFILES.
+    - read_only (opcional): Si la conexión es de solo lectura se omiten los PRAGMAs de escritura.
+
+    Devuelve la lista de PRAGMAs que no pudieron aplicarse (por ejemplo, cambiar
+    journal_mode en medio de una transacción), para que la interfaz pueda informarlos.
+    """
+    if profile_name not in TUNING_PROFILES:
+        raise ValueError(f"Perfil de conexión desconocido: {profile_name}")
+
+    pragmas = TUNING_PROFILES[profile_name]
+    failed = []
+    for pragma in PRAGMA_ORDER:
+        if read_only and pragma in WRITE_PRAGMAS:
+            continue
+        try:
+            db_connection.execute(f"PRAGMA {pragma}={pragmas[pragma]};").fetchall()
+        except sqlite3.Error:
+            failed.append(pragma)
+    return failed
@@ -0,0 +1,196 @@
+import sqlite3
+
+OBJECT_TYPES = ("table", "view", "index", "trigger")
+
+# Sufijos de las tablas sombra de FTS3/4, FTS5 y R*Tree, para SQLite anterior a 3.37
+SHADOW_SUFFIXES = ("content", "segments", "segdir", "docsize", "stat", "data", "idx", "config", "node", "rowid", "parent")
+
+
+def quote_identifier(name):
+    """
+    Devuelve un identificador SQL entre comillas dobles, escapando las comillas internas.
+
+    Args:
+        name: Nombre de tabla, columna u otro objeto
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def foreign_key_graph(db_connection):
+    """
+    Obtiene con una sola consulta el grafo de claves foráneas de todas las tablas.
+
+    Args:
+        db_connection: Conexión a la base de datos SQLite
+
+    Returns:
+        Diccionario tabla -> lista de (id, columna, tabla referenciada, columna referenciada),
+        con una entrada (posiblemente vacía) por cada tabla
+    """
+    graph = {
+        name: [] for (name,) in db_connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name;"
+        )
+    }
+    rows = db_connection.execute(
+        "SELECT m.name, f.id, f.\"from\", f.\"table\", f.\"to\" "
+        "FROM sqlite_master AS m, pragma_foreign_key_list(m.name) AS f "
+        "WHERE m.type = 'table' ORDER BY m.name, f.id, f.seq;"
+    ).fetchall()
+    for table_name, fk_id, from_column, to_table, to_column in rows:
+        graph[table_name].append((fk_id, from_column, to_table, to_column))
+    return graph
+
+
+def shadow_tables(db_connection):
+    """
+    Devuelve el conjunto de tablas sombra de las tablas virtuales (por ejemplo f_data,
+    f_idx... de una tabla FTS5 f). Las crea y mantiene la propia tabla virtual, por lo
+    que no deben copiarse ni escribirse directamente.
+
+    Args:
+        db_connection: Conexión a la base de datos SQLite
+    """
+    try:
+        # pragma_table_list marca las tablas sombra desde SQLite 3.37
+        return {
+            name for (name,) in db_connection.execute(
+                "SELECT name FROM pragma_table_list WHERE schema = 'main' AND type = 'shadow';"
+            )
+        }
+    except sqlite3.OperationalError:
+        pass
+    # Versiones anteriores: las tablas sombra se llaman <tabla virtual>_<sufijo>
+    rows = db_connection.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table';").fetchall()
+    virtual = [
+        name.lower() for name, sql in rows if sql and " ".join(sql.split()[:3]).upper() == "CREATE VIRTUAL TABLE"
+    ]
+    return {
+        name for name, _ in rows
+        if any(name.lower() in (f"{table}_{suffix}" for suffix in SHADOW_SUFFIXES) for table in virtual)
+    }
+
+
+class SchemaCache:
+    """
+    Caché del esquema de una base de datos.
+
+    La lista de objetos se obtiene con una única consulta a sqlite_master y los
+    detalles de cada tabla (columnas, índices, claves foráneas) se cargan bajo
+    demanda. Todo se invalida cuando cambia PRAGMA schema_version.
+    """
+
+    def __init__(self, db_connection):
+        """
+        Inicializa la caché sobre una conexión.
+
+        Args:
+            db_connection: Conexión a la base de datos SQLite
+        """
+        self.db_connection = db_connection
+        self.version = None
+        self.objects = {}          # Tipo -> lista ordenada de nombres
+        self.shadow = set()        # Tablas sombra de las tablas virtuales
+        self.table_of = {}         # Nombre de índice o trigger -> tabla a la que pertenece
+        self._columns = {}
+        self._indexes = {}
+        self._foreign_keys = {}
+
+    def refresh_if_changed(self):
+        """
+        Vuelve a leer la lista de objetos si el esquema cambió desde la última lectura.
+
+        Returns:
+            True si la caché se reconstruyó
+        """
+        version = self.db_connection.execute("PRAGMA schema_version;").fetchone()[0]
+        if version == self.version:
+            return False
+        self.objects = {object_type: [] for object_type in OBJECT_TYPES}
+        self.table_of = {}
+        rows = self.db_connection.execute(
+            "SELECT type, name, tbl_name FROM sqlite_master "
+            "WHERE type IN ('table', 'view', 'index', 'trigger') ORDER BY name COLLATE NOCASE;"
+        ).fetchall()
+        for object_type, name, table_name in rows:
+            self.objects[object_type].append(name)
+            if object_type in ("index", "trigger"):
+                self.table_of[name] = table_name
+        self.shadow = shadow_tables(self.db_connection)
+        self._columns = {}
+        self._indexes = {}
+        self._foreign_keys = {}
+        self.version = version
+        return True
+
+    def names(self, object_type):
+        """
+        Devuelve los nombres de los objetos de un tipo ('table', 'view', 'index', 'trigger').
+        """
+        self.refresh_if_changed()
+        return self.objects[object_type]
+
+    def user_tables(self):
+        """
+        Devuelve los nombres de las tablas con datos propios: sin las tablas internas de
+        SQLite (sqlite_*) ni las tablas sombra de las tablas virtuales.
+        """
+        self.refresh_if_changed()
+        return [
+            name for name in self.objects["table"] if not name.startswith("sqlite_") and name not in self.shadow
+        ]
+
+    def columns(self, table_name):
+        """
+        Devuelve las columnas de una tabla o vista como tuplas de PRAGMA table_info
+        (cid, name, type, notnull, dflt_value, pk). Se consultan una sola vez por versión.
+        """
+        self.refresh_if_changed()
+        if table_name not in self._columns:
+            self._columns[table_name] = self.db_connection.execute(
+                "SELECT cid, name, type, \"notnull\", dflt_value, pk FROM pragma_table_info(?);",
+                (table_name,)
+            ).fetchall()
+        return self._columns[table_name]
+
+    def all_columns(self):
+        """
+        Devuelve un diccionario tabla -> nombres de columnas de todas las tablas y vistas,
+        obtenido con una sola consulta.
+        """
+        self.refresh_if_changed()
+        result = {name: [] for name in self.objects["table"] + self.objects["view"]}
+        rows = self.db_connection.execute(
+            "SELECT m.name, p.name FROM sqlite_master AS m, pragma_table_info(m.name) AS p "
+            "WHERE m.type IN ('table', 'view') ORDER BY m.name, p.cid;"
+        ).fetchall()
+        for table_name, column_name in rows:
+            result.setdefault(table_name, []).append(column_name)
+        return result
+
+    def indexes(self, table_name):
+        """
+        Devuelve los índices de una tabla como tuplas de PRAGMA index_list
+        (seq, name, unique, origin, partial).
+        """
+        self.refresh_if_changed()
+        if table_name not in self._indexes:
+            self._indexes[table_name] = self.db_connection.execute(
+                "SELECT seq, name, \"unique\", origin, partial FROM pragma_index_list(?);",
+                (table_name,)
+            ).fetchall()
+        return self._indexes[table_name]
+
+    def foreign_keys(self, table_name):
+        """
+        Devuelve las claves foráneas de una tabla como tuplas de PRAGMA foreign_key_list
+        (id, seq, table, from, to, on_update, on_delete, match).
+        """
+        self.refresh_if_changed()
+        if table_name not in self._foreign_keys:
+            self._foreign_keys[table_name] = self.db_connection.execute(
+                "SELECT id, seq, \"table\", \"from\", \"to\", on_update, on_delete, \"match\" "
+                "FROM pragma_foreign_key_list(?);",
+                (table_name,)
+            ).fetchall()
+        return self._foreign_keys[table_name]
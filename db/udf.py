@@ -0,0 +1,186 @@
+import importlib.util
+import sqlite3
+from pathlib import Path
+
+# Carpeta de complementos por defecto, junto al historial de consultas
+DEFAULT_PLUGIN_DIR = Path.home() / ".tsukisql" / "plugins"
+
+# Extensiones compiladas de SQLite que se cargan desde la carpeta de complementos
+EXTENSION_SUFFIXES = (".so", ".dylib", ".dll")
+
+KIND_SCALAR = "scalar"
+KIND_AGGREGATE = "aggregate"
+KIND_WINDOW = "window"
+
+# Atributo con el que los decoradores marcan las funciones de un complemento
+UDF_ATTRIBUTE = "_tsuki_udf"
+
+
+def _marker(kind, name, num_args, deterministic):
+    """Devuelve un decorador que marca una función o clase para registrarla en SQLite."""
+    def decorate(obj):
+        setattr(obj, UDF_ATTRIBUTE, (kind, name or obj.__name__, num_args, deterministic))
+        return obj
+    return decorate
+
+
+def scalar(name=None, num_args=-1, deterministic=True):
+    """
+    Marca una función de un complemento como función escalar de SQL.
+
+    Parameters:
+    - name (opcional): Nombre en SQL (por defecto, el de la función de Python).
+    - num_args (opcional): Número de argumentos, o -1 para un número variable.
+    - deterministic (opcional): True si el resultado solo depende de los argumentos, lo que
+      permite a SQLite usarla en índices y evaluarla una sola vez por valor constante.
+    """
+    return _marker(KIND_SCALAR, name, num_args, deterministic)
+
+
+def aggregate(name=None, num_args=-1):
+    """
+    Marca una clase de un complemento (con step y finalize) como agregado de SQL.
+
+    Parameters:
+    - name (opcional): Nombre en SQL (por defecto, el de la clase).
+    - num_args (opcional): Número de argumentos, o -1 para un número variable.
+    """
+    return _marker(KIND_AGGREGATE, name, num_args, False)
+
+
+def window(name=None, num_args=-1):
+    """
+    Marca una clase de un complemento (con step, inverse, value y finalize) como función
+    de ventana de SQL. Requiere Python 3.11 y SQLite 3.25.
+
+    Parameters:
+    - name (opcional): Nombre en SQL (por defecto, el de la clase).
+    - num_args (opcional): Número de argumentos, o -1 para un número variable.
+    """
+    return _marker(KIND_WINDOW, name, num_args, False)
+
+
+class UDFRegistry:
+    """
+    Registro de funciones definidas por el usuario y de extensiones compiladas.
+
+    Los complementos son módulos de Python de una carpeta cuyas funciones y clases se
+    marcan con los decoradores scalar, aggregate y window; las bibliotecas compiladas de
+    la misma carpeta se cargan como extensiones de SQLite. DatabaseManager aplica el
+    registro a cada conexión que abre, de modo que las funciones se ejecutan dentro de
+    las consultas en lugar de procesar las filas en Python después.
+    """
+
+    def __init__(self):
+        self.functions = []    # Tuplas (tipo, nombre, argumentos, objeto, determinista)
+        self.extensions = []   # Rutas de extensiones compiladas
+        self.reported = set()  # Mensajes de error ya añadidos a self.errors
+        self.errors = []       # Mensajes de lo que no pudo cargarse o registrarse, pendientes de mostrar
+
+    def load_directory(self, directory=DEFAULT_PLUGIN_DIR):
+        """
+        Carga los complementos de una carpeta. Los errores de un complemento no impiden
+        cargar los demás y quedan en self.errors.
+
+        Args:
+            directory: Carpeta de complementos; si no existe no se carga nada
+
+        Returns:
+            Número de funciones y extensiones registradas
+        """
+        directory = Path(directory)
+        if not directory.is_dir():
+            return 0
+        loaded = 0
+        for path in sorted(directory.iterdir()):
+            if path.suffix == ".py":
+                try:
+                    loaded += self.load_module(path)
+                except Exception as e:
+                    self.errors.append(f"{path.name}: {str(e)}")
+            elif path.suffix in EXTENSION_SUFFIXES:
+                self.extensions.append(str(path))
+                loaded += 1
+        return loaded
+
+    def load_module(self, path):
+        """
+        Importa un módulo de complemento y registra las funciones marcadas.
+
+        Args:
+            path: Ruta del archivo .py
+
+        Returns:
+            Número de funciones registradas
+        """
+        spec = importlib.util.spec_from_file_location(f"tsuki_plugin_{path.stem}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        count = 0
+        for obj in vars(module).values():
+            marker = getattr(obj, UDF_ATTRIBUTE, None)
+            if marker is None:
+                continue
+            kind, name, num_args, deterministic = marker
+            self.functions.append((kind, name, num_args, obj, deterministic))
+            count += 1
+        return count
+
+    def apply(self, db_connection):
+        """
+        Registra las funciones y carga las extensiones en una conexión. Lo que no pudo
+        registrarse se añade a self.errors una sola vez, aunque falle en todas las conexiones.
+
+        Args:
+            db_connection: Conexión recién abierta
+
+        Returns:
+            Lista de mensajes de lo que no pudo registrarse en esta conexión
+        """
+        failed = []
+        for kind, name, num_args, obj, deterministic in self.functions:
+            try:
+                if kind == KIND_SCALAR:
+                    db_connection.create_function(name, num_args, obj, deterministic=deterministic)
+                elif kind == KIND_AGGREGATE:
+                    db_connection.create_aggregate(name, num_args, obj)
+                elif hasattr(db_connection, "create_window_function"):
+                    db_connection.create_window_function(name, num_args, obj)
+                else:
+                    failed.append(f"{name}: las funciones de ventana requieren Python 3.11")
+            except sqlite3.NotSupportedError:
+                # SQLite anterior a 3.8.3 no admite funciones deterministas
+                db_connection.create_function(name, num_args, obj)
+            except sqlite3.Error as e:
+                failed.append(f"{name}: {str(e)}")
+
+        if self.extensions:
+            if not hasattr(db_connection, "enable_load_extension"):
+                failed.append("Este Python se compiló sin soporte para cargar extensiones de SQLite")
+                self._record(failed)
+                return failed
+            db_connection.enable_load_extension(True)
+            try:
+                for extension in self.extensions:
+                    try:
+                        db_connection.load_extension(extension)
+                    except sqlite3.Error as e:
+                        failed.append(f"{Path(extension).name}: {str(e)}")
+            finally:
+                db_connection.enable_load_extension(False)
+        self._record(failed)
+        return failed
+
+    def _record(self, failed):
+        """Guarda los mensajes de error nuevos para mostrarlos una sola vez."""
+        for message in failed:
+            if message not in self.reported:
+                self.reported.add(message)
+                self.errors.append(message)
+
+    def take_errors(self):
+        """
+        Devuelve los mensajes de error pendientes de mostrar y los marca como mostrados.
+        """
+        errors, self.errors = self.errors, []
+        return errors
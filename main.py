@@ -1,13 +1,36 @@
 import tkinter as tk
 import sqlite3
-from tkinter import ttk, messagebox, filedialog
-from db.connection import DatabaseManager
+from tkinter import ttk, messagebox, filedialog, simpledialog
+from db.connection import DatabaseManager, MODE_READ_WRITE, MODE_READ_ONLY, MODE_IMMUTABLE, MODE_MEMORY, MODE_LABELS
+from db.profiles import TUNING_PROFILES
+from db.history import QueryHistory, STATUS_OK, STATUS_ERROR
+from db.udf import DEFAULT_PLUGIN_DIR
+from db.schema import quote_identifier
 from ui.menu import Menu
 from ui.ui_builder import UIBuilder
 from utils.erd_generator import generate_erd_dialog, generate_erd
-from utils.exporter import export_database
-from ui.sql_executor import on_table_select, execute_sql, display_results
-from ui.ui_updater import update_tools_menu_state, update_db_label, update_tables_list
+from utils.exporter import ask_export_path, write_sql_dump
+from utils.data_diff import diff_databases
+from utils.lazy_values import LazyValue, BlobReader, table_preview, simple_table_select
+from ui.background import run_in_background
+from utils.completion_index import CompletionIndex
+from utils.result_buffer import ResultBuffer
+from utils.column_profiler import profile_columns
+from ui.profile_window import ColumnProfileWindow
+from ui.storage_window import StorageWindow
+from ui.integrity_window import IntegrityWindow
+from ui.copy_tables_window import CopyTablesWindow
+from ui.data_generator_window import DataGeneratorWindow
+from ui.history_window import HistoryWindow
+from ui.value_viewer import ValueViewer
+from ui.watch import QueryWatcher
+from ui.diagnostics_window import DiagnosticsWindow
+from utils.instrumentation import metrics, timed, LagMonitor, ProfileCapture
+from ui.sql_executor import validate_sql_command, show_sql_result, show_sql_error, display_results
+from ui.ui_updater import (
+    update_tools_menu_state, update_write_actions_state, update_memory_actions_state, update_db_label,
+    update_tables_list
+)
 
 
 class TsukiSQLApp:
@@ -39,6 +62,27 @@ class TsukiSQLApp:
             self.export_database_wrapper
         )
         self.menu.create_menu()
+        self.menu.add_read_only_menu(
+            lambda: self.connect_db(MODE_READ_ONLY),
+            lambda: self.connect_db(MODE_IMMUTABLE)
+        )
+        self.menu.add_memory_menu(
+            lambda: self.connect_db(MODE_MEMORY),
+            self.write_back_memory_copy,
+            self.save_memory_copy_as
+        )
+        self.menu.add_database_registry_menu(self.attach_database)
+        self.menu.add_tool("Perfilar Columnas", self.profile_columns)
+        self.menu.add_tool("Almacenamiento y Mantenimiento", self.show_storage)
+        self.menu.add_tool("Comparar Datos...", self.compare_data)
+        self.menu.add_tool("Comprobar Integridad", self.check_integrity)
+        self.menu.add_tool("Copiar Tablas a...", self.copy_tables)
+        self.menu.add_tool("Generar Datos de Prueba...", self.generate_test_data, writes=True)
+        self.menu.add_profile_menu(
+            list(TUNING_PROFILES),
+            self.db_manager.profile,
+            self.change_profile
+        )
 
         # Agregar menú de editor
         self.menu.add_editor_menu(
@@ -46,6 +90,14 @@ class TsukiSQLApp:
             self.open_sql_file,
             self.save_sql_file
         )
+        self.menu.add_history_menu(self.show_history)
+        self.menu.add_diagnostics_menu(self.show_diagnostics)
+
+        # Instrumentación: retardo del bucle de eventos y captura opcional de cProfile
+        self.lag_monitor = LagMonitor(self.root)
+        self.lag_monitor.start()
+        self.profile_capture = ProfileCapture()
+        self.diagnostics_window = None   # Única ventana de diagnóstico abierta
 
         # Etiqueta para mostrar la base de datos conectada
         self.db_label = tk.Label(self.root, text="No hay base de datos conectada")
@@ -53,6 +105,23 @@ class TsukiSQLApp:
 
         # Inicialización de componentes UI
         self.ui_builder = UIBuilder(self.root, self.on_table_select)
+        self.completion_indexes = {}  # Ruta de base de datos -> CompletionIndex
+        self.ui_builder.completion_provider = self.get_completion_index
+        self.ui_builder.value_opener = self.open_value
+        self.ui_builder.watch_toggler = self.toggle_watch
+
+        # Historial persistente de consultas
+        try:
+            self.history = QueryHistory()
+        except (sqlite3.Error, OSError) as e:
+            self.history = None
+            self.ui_builder.append_to_console(f"Historial de consultas no disponible: {str(e)}", 'error')
+
+        # Funciones definidas por el usuario y extensiones de la carpeta de complementos
+        loaded = self.db_manager.udf_registry.load_directory(DEFAULT_PLUGIN_DIR)
+        if loaded:
+            self.ui_builder.append_to_console(f"Complementos cargados desde {DEFAULT_PLUGIN_DIR}: {loaded}", 'info')
+        self.report_udf_errors()
         
         # Frame para botones
         self.button_frame = ttk.Frame(self.root)
@@ -66,6 +135,14 @@ class TsukiSQLApp:
         )
         self.execute_button.pack(side=tk.LEFT, padx=5)
 
+        # Botón para interrumpir la consulta en curso de la pestaña activa
+        self.cancel_button = ttk.Button(
+            self.button_frame,
+            text="Cancelar",
+            command=self.cancel_sql
+        )
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+
         # Crear el primer editor por defecto
         self.ui_builder.create_sql_editor()
 
@@ -75,15 +152,15 @@ class TsukiSQLApp:
         self.root.bind('<Control-o>', lambda e: self.open_sql_file())
         self.root.bind('<Control-s>', lambda e: self.save_sql_file())
         self.root.bind('<Control-w>', lambda e: self.close_current_editor())
+        self.root.bind('<Control-h>', lambda e: self.show_history())
 
     def close_current_editor(self):
         """
         Cierra la pestaña del editor actualmente seleccionada.
         """
-        current_tab = self.ui_builder.notebook.select()
-        if current_tab:
-            tab_text = self.ui_builder.notebook.tab(current_tab, "text")
-            self.ui_builder.close_editor(tab_text)
+        name = self.ui_builder.get_current_editor_name()
+        if name:
+            self.ui_builder.close_editor(name)
 
     def open_sql_file(self):
         """
@@ -161,32 +238,156 @@ class TsukiSQLApp:
         """
         return self.ui_builder.get_current_editor()
 
-    def connect_db(self):
+    def connect_db(self, mode=MODE_READ_WRITE):
         """
         Establece conexión con una base de datos existente.
         Actualiza la interfaz según el resultado de la conexión.
+
+        Args:
+            mode: Modo de apertura (lectura/escritura, solo lectura, snapshot inmutable o copia en memoria)
         """
-        success, db_connection, db_path = self.db_manager.connect_db()
+        success, db_connection, db_path = self.db_manager.connect_db(mode)
         if success:
-            self.db_connection = db_connection
-            self.db_path = db_path
-            update_db_label(self.db_label, self.db_path)
-            update_tools_menu_state(self.menu, True)
-            update_tables_list(self.db_connection, self.ui_builder.tables_listbox)
+            self.sync_active_db()
             self.ui_builder.append_to_console(f"Conectado a la base de datos: {db_path}", 'success')
+            self.report_udf_errors()
+
+    def report_udf_errors(self):
+        """
+        Muestra en la consola los complementos que no pudieron cargarse o registrarse.
+        """
+        for message in self.db_manager.udf_registry.take_errors():
+            self.ui_builder.append_to_console(f"Complemento: {message}", 'error')
 
     def disconnect_db(self):
         """
-        Desconecta la base de datos actual y actualiza la interfaz.
+        Desconecta la base de datos activa y actualiza la interfaz.
+        Si quedan otras bases de datos abiertas, una de ellas pasa a ser la activa.
+        Al cerrar una copia en memoria se ofrece escribirla antes en su archivo.
         """
+        if self.db_manager.is_memory_copy:
+            answer = messagebox.askyesnocancel(
+                "Copia en Memoria",
+                f"¿Escribir la copia en memoria en {self.db_path} antes de cerrarla?\n"
+                "Si no se escribe, los cambios se perderán."
+            )
+            if answer is None:
+                return
+            if answer:
+                try:
+                    self.db_manager.save_memory_copy()
+                except (sqlite3.Error, OSError) as e:
+                    messagebox.showerror("Error", f"No se pudo escribir la copia en memoria:\n{str(e)}")
+                    return
+                self.ui_builder.append_to_console(f"Copia en memoria escrita en {self.db_path}", 'success')
         if self.db_manager.disconnect_db():
-            self.db_connection = None
-            self.db_path = None
-            update_db_label(self.db_label, self.db_path)
-            update_tools_menu_state(self.menu, False)
-            self.ui_builder.tables_listbox.delete(0, tk.END)
+            self.sync_active_db()
             self.ui_builder.append_to_console("Desconectado de la base de datos", 'info')
 
+    def switch_db(self, db_path):
+        """
+        Activa otra de las bases de datos abiertas.
+
+        Args:
+            db_path: Ruta de la base de datos a activar
+        """
+        if self.db_manager.switch_db(db_path):
+            self.sync_active_db()
+            self.ui_builder.append_to_console(f"Base de datos activa: {db_path}", 'info')
+
+    def sync_active_db(self):
+        """
+        Refleja en la aplicación la base de datos activa del registro:
+        conexión, etiqueta, estado de menús y lista de tablas.
+        """
+        self.db_connection = self.db_manager.db_connection
+        self.db_path = self.db_manager.db_path
+        connected = self.db_connection is not None
+        self.update_connection_label()
+        update_tools_menu_state(self.menu, connected)
+        update_write_actions_state(self.menu, connected and not self.db_manager.read_only)
+        update_memory_actions_state(self.menu, self.db_manager.is_memory_copy)
+        open_databases = self.db_manager.open_databases()
+        self.menu.update_open_databases(open_databases, self.db_path, self.switch_db)
+        self.completion_indexes = {
+            db_path: index for db_path, index in self.completion_indexes.items() if db_path in open_databases
+        }
+        update_tables_list(self.db_manager.schema_cache(), self.ui_builder.structure_tree)
+
+    def attach_database(self):
+        """
+        Adjunta otra base de datos a la conexión activa con ATTACH DATABASE
+        para permitir consultas entre archivos.
+        """
+        if not self.db_connection:
+            messagebox.showwarning("Advertencia", "No hay base de datos conectada.")
+            return
+        attach_path = filedialog.askopenfilename(
+            title="Selecciona la base de datos a adjuntar",
+            filetypes=[("SQLite DB", "*.db *.sqlite3")]
+        )
+        if not attach_path:
+            return
+        alias = simpledialog.askstring("Adjuntar Base de Datos", "Alias del esquema:", parent=self.root)
+        if not alias:
+            return
+        try:
+            self.db_manager.attach_database(attach_path, alias)
+            self.ui_builder.append_to_console(f"Base de datos adjuntada como '{alias}': {attach_path}", 'success')
+        except Exception as e:
+            self.ui_builder.append_to_console(f"Error al adjuntar: {str(e)}", 'error')
+            messagebox.showerror("Error", str(e))
+
+    def write_back_memory_copy(self):
+        """
+        Escribe la copia en memoria activa en su archivo original, en segundo plano.
+        """
+        if not self.db_manager.is_memory_copy:
+            return
+        db_path = self.db_path
+        if not messagebox.askyesno(
+            "Escribir de Vuelta",
+            f"Se sobrescribirá {db_path} con el contenido de la copia en memoria. ¿Continuar?"
+        ):
+            return
+        self.save_memory_copy(db_path, None, f"Escritura de la copia en memoria en {db_path}")
+
+    def save_memory_copy_as(self):
+        """
+        Guarda la copia en memoria activa en otro archivo, en segundo plano.
+        El archivo original no se modifica.
+        """
+        if not self.db_manager.is_memory_copy:
+            return
+        target_path = filedialog.asksaveasfilename(
+            title="Guardar copia en memoria como",
+            defaultextension=".db",
+            filetypes=[("SQLite DB", "*.db *.sqlite3")]
+        )
+        if target_path:
+            self.save_memory_copy(self.db_path, target_path, f"Guardado de la copia en memoria en {target_path}")
+
+    def save_memory_copy(self, db_path, target_path, description):
+        """
+        Copia en segundo plano una base de datos en memoria a un archivo con Connection.backup.
+
+        Args:
+            db_path: Base de datos en memoria
+            target_path: Archivo de destino (None para escribir en el archivo original)
+            description: Descripción de la tarea para los mensajes de la consola
+        """
+        def on_success(_):
+            self.ui_builder.append_to_console(f"{description}: completado", 'success')
+
+        def on_error(error):
+            self.ui_builder.append_to_console(f"{description}: {str(error)}", 'error')
+            messagebox.showerror("Error", f"{description}:\n{str(error)}")
+
+        self.ui_builder.append_to_console(f"{description}: en curso...", 'info')
+        run_in_background(
+            self.root, lambda: self.db_manager.save_memory_copy(target_path, db_path), on_success, on_error
+        )
+
     def create_new_db(self):
         """
         Crea una nueva base de datos SQLite y establece conexión con ella.
@@ -194,76 +395,500 @@ class TsukiSQLApp:
         """
         success, db_connection, db_path = self.db_manager.create_new_db()
         if success:
-            self.db_connection = db_connection
-            self.db_path = db_path
-            update_db_label(self.db_label, self.db_path)
-            update_tools_menu_state(self.menu, True)
-            update_tables_list(self.db_connection, self.ui_builder.tables_listbox)
+            self.sync_active_db()
+
+    def update_connection_label(self):
+        """
+        Actualiza la etiqueta de conexión con la ruta, el modo de apertura y el perfil activo.
+        """
+        mode = self.db_manager.mode
+        mode_label = MODE_LABELS[mode] if mode != MODE_READ_WRITE else None
+        update_db_label(self.db_label, self.db_path, self.db_manager.profile, mode_label)
+
+    def change_profile(self, profile_name):
+        """
+        Cambia el perfil de ajuste de la conexión en tiempo de ejecución.
+
+        Args:
+            profile_name: Nombre del perfil seleccionado en el menú
+        """
+        failed = self.db_manager.set_profile(profile_name)
+        self.update_connection_label()
+        self.ui_builder.append_to_console(f"Perfil de conexión: {profile_name}", 'info')
+        if failed:
+            self.ui_builder.append_to_console(
+                f"No se pudieron aplicar los PRAGMAs: {', '.join(failed)}", 'error'
+            )
+
+    def run_with_read_connection(self, task, description):
+        """
+        Ejecuta una tarea en segundo plano con una conexión de solo lectura del pool,
+        sin bloquear la interfaz ni la conexión del editor.
+
+        Args:
+            task: Función que recibe la conexión de solo lectura
+            description: Descripción de la tarea para los mensajes de la consola
+        """
+        db_path = self.db_path
+
+        def work():
+            with self.db_manager.read_connection(db_path) as connection:
+                return task(connection)
+
+        def on_success(_):
+            self.ui_builder.append_to_console(f"{description}: completado", 'success')
+
+        def on_error(error):
+            self.ui_builder.append_to_console(f"{description}: {str(error)}", 'error')
+            messagebox.showerror("Error", f"{description}:\n{str(error)}")
+
+        self.ui_builder.append_to_console(f"{description}: en curso...", 'info')
+        run_in_background(self.root, work, on_success, on_error)
+
+    def profile_columns(self):
+        """
+        Muestra el perfil de las columnas del resultado de la pestaña activa.
+        Las estadísticas se calculan en segundo plano sobre la copia por columnas del resultado.
+        """
+        context = self.ui_builder.get_current_context()
+        result = context.result if context else None
+        if result is None:
+            messagebox.showwarning("Advertencia", "Ejecuta primero una consulta que devuelva filas.")
+            return
+
+        self.ui_builder.append_to_console(f"[{context.name}] Perfilando {result.row_count} filas...", 'info')
+        run_in_background(
+            self.root,
+            lambda: profile_columns(result),
+            lambda profiles: ColumnProfileWindow(self.root, profiles, f"Perfil de Columnas - {context.name}"),
+            lambda e: self.ui_builder.append_to_console(f"Error al perfilar columnas: {str(e)}", 'error')
+        )
+
+    def show_storage(self):
+        """
+        Abre la ventana de almacenamiento y mantenimiento de la base de datos activa.
+        """
+        if not self.db_connection:
+            messagebox.showwarning("Advertencia", "No hay base de datos conectada.")
+            return
+        StorageWindow(
+            self.root,
+            self.db_manager,
+            self.db_path,
+            self.db_manager.read_only,
+            self.ui_builder.append_to_console
+        )
+
+    def check_integrity(self):
+        """
+        Abre la ventana de comprobación de integridad y de claves foráneas de la base de datos activa.
+        """
+        if not self.db_connection:
+            messagebox.showwarning("Advertencia", "No hay base de datos conectada.")
+            return
+        IntegrityWindow(self.root, self.db_manager, self.db_path, self.ui_builder.append_to_console)
+
+    def copy_tables(self):
+        """
+        Abre la ventana para copiar tablas de la base de datos activa a otro archivo.
+        """
+        if not self.db_connection:
+            messagebox.showwarning("Advertencia", "No hay base de datos conectada.")
+            return
+        tables = self.db_manager.schema_cache().user_tables()
+        CopyTablesWindow(self.root, self.db_manager, self.db_path, tables, self.ui_builder.append_to_console)
+
+    def generate_test_data(self):
+        """
+        Abre la ventana para rellenar tablas de la base de datos activa con datos de prueba.
+        """
+        if not self.db_connection:
+            messagebox.showwarning("Advertencia", "No hay base de datos conectada.")
+            return
+        if self.db_manager.read_only:
+            messagebox.showwarning("Advertencia", "La base de datos está abierta en modo de solo lectura.")
+            return
+        tables = self.db_manager.schema_cache().user_tables()
+        DataGeneratorWindow(self.root, self.db_manager, self.db_path, tables, self.ui_builder.append_to_console)
+
+    def compare_data(self):
+        """
+        Compara los datos de la base de datos activa con los de otro archivo en segundo plano
+        y abre en un editor nuevo el SQL que hace que el otro archivo quede igual.
+        """
+        if not self.db_connection:
+            messagebox.showwarning("Advertencia", "No hay base de datos conectada.")
+            return
+        other_path = filedialog.askopenfilename(
+            title="Selecciona la base de datos con la que comparar",
+            filetypes=[("SQLite DB", "*.db *.sqlite3")]
+        )
+        if not other_path:
+            return
+        db_path = self.db_path
+
+        def work():
+            other_connection = self.db_manager.open_read_only(other_path)
+            try:
+                with self.db_manager.read_connection(db_path) as connection:
+                    return diff_databases(connection, other_connection, db_path, other_path)
+            finally:
+                other_connection.close()
+
+        def on_success(report):
+            self.ui_builder.append_to_console("Comparación de datos: completada", 'success')
+            self.open_sql_in_editor(report)
+
+        def on_error(error):
+            self.ui_builder.append_to_console(f"Comparación de datos: {str(error)}", 'error')
+            messagebox.showerror("Error", f"Comparación de datos:\n{str(error)}")
+
+        self.ui_builder.append_to_console(f"Comparando {db_path} con {other_path}...", 'info')
+        run_in_background(self.root, work, on_success, on_error)
 
     def generate_erd(self):
         """
-        Inicia el proceso de generación del diagrama ERD.
+        Inicia el proceso de generación del diagrama ERD en segundo plano.
         """
-        generate_erd_dialog(self.db_connection, generate_erd)
+        generate_erd_dialog(
+            self.db_connection,
+            lambda _, save_path, file_format: self.run_with_read_connection(
+                lambda connection: generate_erd(connection, save_path, file_format),
+                "Generación de ERD"
+            )
+        )
 
     def export_database_wrapper(self):
         """
-        Maneja la exportación de la base de datos actual.
+        Maneja la exportación de la base de datos actual en segundo plano.
         Muestra mensaje de advertencia si no hay base de datos conectada.
         """
         if self.db_connection:
-            export_database(self.db_connection)
+            sql_file_path = ask_export_path()
+            if sql_file_path:
+                self.run_with_read_connection(
+                    lambda connection: write_sql_dump(connection, sql_file_path),
+                    f"Exportación a {sql_file_path}"
+                )
         else:
             messagebox.showwarning("Advertencia", "No hay base de datos conectada para exportar.")
 
-    def execute_sql_in_console(self, sql_command):
+    def execute_sql_in_console(self, sql_command, preview=None):
         """
         Ejecuta comandos SQL directamente desde la consola.
         
         Args:
             sql_command: Comando SQL a ejecutar
+            preview: TablePreview opcional que lee solo el principio de los valores grandes
         """
-        if self.db_connection:
-            execute_sql(
-                self.db_connection,
-                None,  # No editor needed
-                self.ui_builder.results_table,
-                lambda conn: update_tables_list(conn, self.ui_builder.tables_listbox),
-                self.ui_builder,
-                custom_sql=sql_command
-            )
+        context = self.ui_builder.get_current_context()
+        if self.db_connection and context:
+            self.run_in_context(context, sql_command, preview=preview)
 
     def on_table_select(self, event):
         """
-        Manejador de eventos para la selección de tablas.
-        Ejecuta una consulta SELECT * cuando se selecciona una tabla.
+        Manejador de eventos para la selección de objetos en el árbol de estructura.
+        Ejecuta una consulta SELECT * cuando se selecciona una tabla o vista. En las tablas
+        con columnas TEXT o BLOB solo se lee el principio de los valores grandes.
         
         Args:
             event: Evento de selección
         """
-        selected_index = self.ui_builder.tables_listbox.curselection()
-        if selected_index:
-            table_name = self.ui_builder.tables_listbox.get(selected_index)
-            sql_command = f"SELECT * FROM {table_name}"
-            self.execute_sql_in_console(sql_command)
+        selected = self.ui_builder.structure_tree.selected_object()
+        if selected and selected[0] in ("table", "view"):
+            sql_command = f"SELECT * FROM {quote_identifier(selected[1])}"
+            preview = None
+            if selected[0] == "table":
+                columns = self.db_manager.schema_cache().columns(selected[1])
+                preview = table_preview(self.db_connection, selected[1], [(c[1], c[2]) for c in columns])
+            self.execute_sql_in_console(sql_command, preview)
 
+    @timed()
     def execute_sql(self):
         """
         Ejecuta el SQL desde el editor activo.
         Muestra advertencia si no hay editor activo.
         """
-        current_editor = self.get_current_editor()
-        if current_editor:
-            execute_sql(
-                self.db_connection,
-                current_editor,
-                self.ui_builder.results_table,
-                lambda conn: update_tables_list(conn, self.ui_builder.tables_listbox),
-                self.ui_builder
-            )
+        context = self.ui_builder.get_current_context()
+        if context:
+            sql_command = context.text_widget.get("1.0", tk.END).strip()
+            try:
+                params, many = context.bind_panel.get_bindings(sql_command)
+            except ValueError as e:
+                show_sql_error(e, self.ui_builder)
+                return
+            preview = self.editor_preview(sql_command) if params is None else None
+            self.run_in_context(context, sql_command, params, many, preview)
         else:
             messagebox.showwarning("Advertencia", "No hay editor activo")
 
+    def editor_preview(self, sql_command):
+        """
+        Devuelve la vista previa que lee solo el principio de los valores grandes cuando el
+        SQL del editor es un SELECT * de una tabla, como al seleccionarla en el árbol. Las
+        demás consultas se ejecutan tal cual: sin el rowid de origen no podría cargarse
+        después el valor completo.
+
+        Args:
+            sql_command: Texto SQL del editor
+
+        Returns:
+            TablePreview o None
+        """
+        simple = simple_table_select(sql_command)
+        if simple is None or not self.db_connection:
+            return None
+        name, suffix = simple
+        schema_cache = self.db_manager.schema_cache()
+        # Los nombres de tabla no distinguen mayúsculas en SQLite
+        table = next((table for table in schema_cache.names("table") if table.lower() == name.lower()), None)
+        if table is None:
+            return None
+        columns = schema_cache.columns(table)
+        return table_preview(self.db_connection, table, [(c[1], c[2]) for c in columns], suffix)
+
+    def run_in_context(self, context, sql_command, params=None, many=False, preview=None):
+        """
+        Ejecuta SQL en el contexto de una pestaña: con su propia conexión de sesión,
+        en su propio hilo de trabajo y mostrando el resultado en su propia tabla.
+        Las demás pestañas pueden seguir ejecutando consultas en paralelo.
+
+        Args:
+            context: ExecutionContext de la pestaña
+            sql_command: Texto SQL a ejecutar
+            params: Valores de los parámetros del SQL, o lista de filas de valores si many es True
+            many: True para ejecutar la sentencia una vez por fila con executemany
+            preview: TablePreview que se ejecuta en lugar de sql_command
+        """
+        if not validate_sql_command(self.db_connection, sql_command, self.ui_builder, self.db_manager.read_only):
+            return
+        if context.busy:
+            self.ui_builder.append_to_console(f"[{context.name}] Ya hay una consulta en curso en esta pestaña.", 'error')
+            return
+        try:
+            context.ensure_connection(self.db_manager)
+        except sqlite3.Error as e:
+            show_sql_error(e, self.ui_builder)
+            return
+
+        db_path = self.db_path
+
+        def on_success(result):
+            rows, description = result
+            metrics.record("execute_sql (SQLite)", context.last_duration)
+            self.record_history(context, db_path, sql_command, len(rows) if description else context.last_changes)
+            if description:
+                context.results_grid.reset()
+                context.result = ResultBuffer(rows, description, sql_command, db_path)
+                context.last_query = (sql_command, params, many, preview)
+            show_sql_result(
+                sql_command,
+                rows,
+                description,
+                context.results_table,
+                self.refresh_tables_list,
+                self.ui_builder
+            )
+            if description:
+                context.results_grid.attach(context.result)
+
+        def on_error(error):
+            self.record_history(context, db_path, sql_command, None, error)
+            show_sql_error(error, self.ui_builder)
+
+        message = f"[{context.name}] Ejecutando: {sql_command}"
+        if many:
+            message += f"  ({len(params)} filas de parámetros)"
+        self.ui_builder.append_to_console(message, 'info')
+        context.run(self.root, sql_command, on_success, on_error, params, many, preview)
+
+    def toggle_watch(self, context, enabled):
+        """
+        Activa o desactiva el modo vigilancia de una pestaña: su última consulta se vuelve
+        a ejecutar cuando PRAGMA data_version indica que otra conexión cambió los datos.
+
+        Args:
+            context: ExecutionContext de la pestaña
+            enabled: True para activar la vigilancia
+        """
+        if not enabled:
+            if context.watcher:
+                context.watcher.stop()
+            self.ui_builder.append_to_console(f"[{context.name}] Vigilancia desactivada", 'info')
+            return
+        # Tras desconectar, la pestaña conserva la referencia a una sesión ya cerrada
+        if context.last_query is None or not self.db_manager.has_session(context.connection, context.db_path):
+            context.results_grid.watch_var.set(False)
+            messagebox.showwarning("Advertencia", "Ejecuta primero en esta pestaña una consulta que devuelva filas.")
+            return
+        try:
+            context.watcher = QueryWatcher(self.root, context, lambda: self.refresh_watched(context))
+        except sqlite3.Error as e:
+            context.results_grid.watch_var.set(False)
+            self.ui_builder.append_to_console(f"[{context.name}] No se pudo activar la vigilancia: {str(e)}", 'error')
+            return
+        self.ui_builder.append_to_console(f"[{context.name}] Vigilando cambios en los datos", 'info')
+
+    def refresh_watched(self, context):
+        """
+        Vuelve a ejecutar la última consulta de una pestaña vigilada y aplica a la tabla
+        solo las filas que cambiaron.
+
+        Args:
+            context: ExecutionContext de la pestaña
+        """
+        sql_command, params, many, preview = context.last_query
+        db_path = context.db_path
+
+        def on_success(result):
+            rows, description = result
+            if not description:
+                return
+            new_result = ResultBuffer(rows, description, sql_command, db_path)
+            changed = context.results_grid.apply_diff(new_result)
+            context.result = new_result
+            self.ui_builder.append_to_console(
+                f"[{context.name}] Datos actualizados: {changed} filas cambiadas de {new_result.row_count}", 'info'
+            )
+
+        def on_error(error):
+            if context.watcher:
+                context.watcher.stop()
+            self.ui_builder.append_to_console(f"[{context.name}] Vigilancia detenida: {str(error)}", 'error')
+
+        context.run(self.root, sql_command, on_success, on_error, params, many, preview)
+
+    def record_history(self, context, db_path, sql_command, rows, error=None):
+        """
+        Guarda una ejecución en el historial de consultas con la duración medida
+        en el hilo de trabajo de la pestaña.
+
+        Args:
+            context: ExecutionContext que ejecutó el SQL
+            db_path: Base de datos sobre la que se ejecutó
+            sql_command: Texto SQL ejecutado
+            rows: Filas devueltas o modificadas
+            error: Excepción producida, si la hubo
+        """
+        if self.history is None:
+            return
+        try:
+            self.history.record(
+                db_path,
+                sql_command,
+                context.last_duration,
+                rows,
+                STATUS_ERROR if error else STATUS_OK,
+                str(error) if error else None
+            )
+        except sqlite3.Error as e:
+            self.ui_builder.append_to_console(f"No se pudo guardar en el historial: {str(e)}", 'error')
+
+    def show_diagnostics(self):
+        """
+        Abre la ventana de diagnóstico con los tiempos de las acciones de la interfaz.
+        Si ya está abierta, la trae al frente: la captura de perfil es de toda la aplicación.
+        """
+        window = self.diagnostics_window
+        if window is not None and window.dialog.winfo_exists():
+            window.dialog.deiconify()
+            window.dialog.lift()
+            window.dialog.focus_set()
+            return
+        self.diagnostics_window = DiagnosticsWindow(self.root, self.profile_capture)
+
+    def show_history(self):
+        """
+        Abre la ventana del historial de consultas.
+        """
+        if self.history is None:
+            messagebox.showwarning("Advertencia", "El historial de consultas no está disponible.")
+            return
+        HistoryWindow(self.root, self.history, self.db_path, self.open_sql_in_editor)
+
+    def open_sql_in_editor(self, sql_command):
+        """
+        Abre un texto SQL en un editor nuevo.
+
+        Args:
+            sql_command: Texto SQL a mostrar
+        """
+        editor = self.create_new_editor()
+        editor.insert('1.0', sql_command)
+        editor.focus_set()
+
+    def open_value(self, result, row, column):
+        """
+        Abre el valor completo de una celda de resultados en el visor de texto/hexadecimal.
+        Los valores que se leyeron recortados se cargan por bloques con E/S incremental
+        de BLOB sobre una conexión de solo lectura propia del visor, abierta sobre la base
+        de datos de la que procede el resultado (su copia en memoria, si lo es).
+
+        Args:
+            result: ResultBuffer mostrado en la tabla
+            row: Índice de la fila en el resultado
+            column: Posición de la columna
+        """
+        value = result.rows[row][column]
+        title = f"{result.columns[column]} (fila {row + 1})"
+        if isinstance(value, LazyValue):
+            try:
+                # Una copia en memoria se lee en la RAM: el archivo no tiene sus cambios
+                connection = self.db_manager.open_reader(result.db_path)
+                reader = BlobReader(connection, value)
+            except (sqlite3.Error, ValueError) as e:
+                self.ui_builder.append_to_console(f"No se pudo abrir el valor: {str(e)}", 'error')
+                return
+
+            def close():
+                reader.close()
+                connection.close()
+
+            ValueViewer(self.root, title, reader.size, reader.read, value.is_blob, close)
+            return
+        if value is None:
+            return
+        data = value if isinstance(value, bytes) else str(value).encode("utf-8")
+        ValueViewer(
+            self.root, title, len(data), lambda offset, size: data[offset:offset + size], isinstance(value, bytes)
+        )
+
+    def get_completion_index(self):
+        """
+        Devuelve el índice de autocompletado de la base de datos activa.
+        Solo se reconstruye cuando cambia PRAGMA schema_version.
+
+        Returns:
+            CompletionIndex o None si no hay base de datos conectada
+        """
+        schema_cache = self.db_manager.schema_cache()
+        if schema_cache is None:
+            return None
+        try:
+            schema_cache.refresh_if_changed()
+            index = self.completion_indexes.get(self.db_path)
+            if index is None or index.version != schema_cache.version:
+                index = CompletionIndex(schema_cache)
+                self.completion_indexes[self.db_path] = index
+            return index
+        except sqlite3.Error as e:
+            self.ui_builder.append_to_console(f"Autocompletado no disponible: {str(e)}", 'error')
+            return None
+
+    def cancel_sql(self):
+        """
+        Interrumpe la consulta en curso de la pestaña activa.
+        """
+        context = self.ui_builder.get_current_context()
+        if context and context.cancel():
+            self.ui_builder.append_to_console(f"[{context.name}] Consulta cancelada", 'info')
+
+    def refresh_tables_list(self):
+        """
+        Actualiza la lista de tablas de la base de datos activa.
+        """
+        update_tables_list(self.db_manager.schema_cache(), self.ui_builder.structure_tree)
+
     def display_results(self, rows, description):
         """
         Muestra los resultados de una consulta en la tabla de resultados.
@@ -279,4 +904,7 @@ if __name__ == "__main__":
     root = tk.Tk()
     app = TsukiSQLApp(root)
     root.geometry("800x600")
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    app.db_manager.close_all()
+    if app.history:
+        app.history.close()
\ No newline at end of file
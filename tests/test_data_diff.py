@@ -0,0 +1,76 @@
+import sqlite3
+import pytest
+from utils.data_diff import TableDiff, sql_literal, table_key
+
+
+def connect(path):
+    # TableDiff consulta cada lado desde su propio hilo
+    return sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+
+
+@pytest.fixture
+def databases(tmp_path):
+    left = connect(tmp_path / "left.db")
+    right = connect(tmp_path / "right.db")
+    for connection in (left, right):
+        connection.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, price REAL, data BLOB);")
+    rows = [(i, f"item {i}", i * 1.5, bytes([i % 256])) for i in range(1, 5001)]
+    for connection in (left, right):
+        with connection:
+            connection.execute("BEGIN;")
+            connection.executemany("INSERT INTO items VALUES (?, ?, ?, ?);", rows)
+    yield left, right
+    left.close()
+    right.close()
+
+
+def test_applying_to_sql_leaves_no_differences(databases):
+    left, right = databases
+    left.execute("UPDATE items SET name = 'it''s', price = 9e999 WHERE id = 17;")
+    left.execute("UPDATE items SET price = NULL, data = X'00ff' WHERE id = 2500;")
+    left.execute("DELETE FROM items WHERE id BETWEEN 3000 AND 3010;")
+    left.execute("INSERT INTO items VALUES (7000, 'nuevo', -9e999, NULL);")
+    right.execute("INSERT INTO items VALUES (6000, 'sobra', 1, NULL);")
+
+    diff = TableDiff(left, right, "items")
+    assert len(diff.run()) == 1 + 1 + 11 + 1 + 1
+    right.executescript(diff.to_sql())
+
+    assert TableDiff(left, right, "items").run() == []
+
+
+def test_identical_tables_have_no_differences(databases):
+    assert TableDiff(*databases, "items").run() == []
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, "NULL"),
+    (3, "3"),
+    (1.5, "1.5"),
+    (float("inf"), "9e999"),
+    (float("-inf"), "-9e999"),
+    (float("nan"), "NULL"),
+    (b"\x01\xab", "X'01ab'"),
+    ("o'clock", "'o''clock'"),
+])
+def test_sql_literal(value, expected):
+    assert sql_literal(value) == expected
+
+
+def test_table_key():
+    connection = sqlite3.connect(":memory:")
+    connection.executescript("""
+        CREATE TABLE with_alias (id INTEGER PRIMARY KEY, v);
+        CREATE TABLE plain (v);
+        CREATE TABLE without_rowid (id INTEGER PRIMARY KEY, v) WITHOUT ROWID;
+        CREATE TABLE text_key (id TEXT PRIMARY KEY, v) WITHOUT ROWID;
+        INSERT INTO without_rowid VALUES (1, 'a');
+    """)
+    assert table_key(connection, "with_alias") == "id"
+    assert table_key(connection, "plain") == "rowid"
+    assert table_key(connection, "without_rowid") == "id"
+    assert table_key(connection, "text_key") is None
+
+    # Sin alias de rowid, una clave INTEGER admite valores de otros tipos
+    connection.execute("INSERT INTO without_rowid VALUES ('x', 'b');")
+    assert table_key(connection, "without_rowid") is None
@@ -0,0 +1,72 @@
+import sqlite3
+import pytest
+from utils.data_generator import DataGenerator
+
+SCHEMA = """
+    CREATE TABLE authors (id INTEGER PRIMARY KEY, email TEXT NOT NULL UNIQUE, name TEXT);
+    CREATE TABLE books (
+        id INTEGER PRIMARY KEY,
+        author_id INTEGER NOT NULL REFERENCES authors(id),
+        isbn TEXT UNIQUE,
+        price REAL
+    );
+    CREATE TABLE book_authors (
+        book_id INTEGER NOT NULL REFERENCES books(id),
+        author_id INTEGER NOT NULL REFERENCES authors(id),
+        PRIMARY KEY (book_id, author_id)
+    ) WITHOUT ROWID;
+    CREATE TABLE reviews (
+        code TEXT PRIMARY KEY,
+        book_id INTEGER REFERENCES books(id),
+        stars INTEGER,
+        UNIQUE (book_id, stars)
+    );
+"""
+
+
+@pytest.fixture
+def connection(tmp_path):
+    connection = sqlite3.connect(tmp_path / "generated.db")
+    connection.executescript(SCHEMA)
+    yield connection
+    connection.close()
+
+
+def duplicates(connection, table, columns):
+    """Cuenta las combinaciones repetidas (sin NULL) de unas columnas."""
+    column_list = ", ".join(columns)
+    conditions = " AND ".join(f"{column} IS NOT NULL" for column in columns)
+    return connection.execute(
+        f"SELECT count(*) FROM (SELECT 1 FROM {table} WHERE {conditions} "
+        f"GROUP BY {column_list} HAVING count(*) > 1);"
+    ).fetchone()[0]
+
+
+def test_generated_rows_respect_keys(connection):
+    row_counts = {"book_authors": 3000, "reviews": 500, "books": 200, "authors": 100}
+    generator = DataGenerator(connection, row_counts)
+    assert generator.run()
+
+    for table, count in row_counts.items():
+        assert connection.execute(f"SELECT count(*) FROM {table};").fetchone()[0] == count
+    assert connection.execute("PRAGMA foreign_key_check;").fetchall() == []
+    assert duplicates(connection, "authors", ["email"]) == 0
+    assert duplicates(connection, "books", ["isbn"]) == 0
+    assert duplicates(connection, "book_authors", ["book_id", "author_id"]) == 0
+    assert duplicates(connection, "reviews", ["code"]) == 0
+    assert duplicates(connection, "reviews", ["book_id", "stars"]) == 0
+
+
+def test_second_run_continues_after_existing_rows(connection):
+    assert DataGenerator(connection, {"authors": 50, "books": 50, "book_authors": 500}).run()
+    assert DataGenerator(connection, {"authors": 50, "books": 50, "book_authors": 500}).run()
+
+    assert connection.execute("SELECT count(*) FROM book_authors;").fetchone()[0] == 1000
+    assert connection.execute("PRAGMA foreign_key_check;").fetchall() == []
+    assert duplicates(connection, "authors", ["email"]) == 0
+
+
+def test_missing_parent_rows_are_rejected(connection):
+    with pytest.raises(ValueError):
+        DataGenerator(connection, {"books": 10}).run()
+    assert connection.execute("SELECT count(*) FROM books;").fetchone()[0] == 0
@@ -0,0 +1,39 @@
+import sqlite3
+from utils.lazy_values import LazyValue
+from utils.result_buffer import ResultBuffer, sort_key
+
+MIXED_VALUES = [b"\x00", "b", 2.5, None, "a", 1, b"\xff", -3, "", 2]
+
+
+def sorted_like_sqlite(values):
+    """Ordena los valores con ORDER BY de SQLite."""
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE t (v);")
+    connection.executemany("INSERT INTO t VALUES (?);", [(value,) for value in values])
+    return [row[0] for row in connection.execute("SELECT v FROM t ORDER BY v;")]
+
+
+def test_sort_key_orders_mixed_types_like_sqlite():
+    assert sorted(MIXED_VALUES, key=sort_key) == sorted_like_sqlite(MIXED_VALUES)
+
+
+def test_sort_mixed_column():
+    buffer = ResultBuffer([(value,) for value in MIXED_VALUES], [("v",)])
+    buffer.sort(0)
+    assert [MIXED_VALUES[index] for index in buffer.order] == sorted_like_sqlite(MIXED_VALUES)
+    buffer.sort(0, descending=True)
+    assert [MIXED_VALUES[index] for index in buffer.order] == sorted_like_sqlite(MIXED_VALUES)[::-1]
+
+
+def test_sort_numeric_column():
+    values = [3, 1.5, -2, 10, 0]
+    buffer = ResultBuffer([(value,) for value in values], [("v",)])
+    buffer.sort(0)
+    assert [values[index] for index in buffer.order] == [-2, 0, 1.5, 3, 10]
+
+
+def test_lazy_values_sort_by_prefix_after_equal_full_values():
+    text = LazyValue("abc", 5000, "t", "v", 1)
+    blob = LazyValue(b"abc", 5000, "t", "v", 2)
+    values = [blob, "abd", text, "abc", 7, None, b"abc"]
+    assert sorted(values, key=sort_key) == [None, 7, "abc", text, "abd", b"abc", blob]
@@ -0,0 +1,46 @@
+from utils.sql_lexer import (
+    STATE_BLOCK_COMMENT, STATE_IDENTIFIER, STATE_NORMAL, STATE_STRING, tokenize, tokenize_line
+)
+
+
+def test_block_comment_continues_across_lines():
+    tokens, state = tokenize_line("SELECT /* empieza", STATE_NORMAL)
+    assert state == STATE_BLOCK_COMMENT
+    assert tokens[-1] == ("comment", 7, 17)
+
+    tokens, state = tokenize_line("sigue SELECT", state)
+    assert state == STATE_BLOCK_COMMENT
+    assert tokens == [("comment", 0, 12)]
+
+    tokens, state = tokenize_line("termina */ FROM", state)
+    assert state == STATE_NORMAL
+    assert tokens == [("comment", 0, 10), ("keyword", 11, 15)]
+
+
+def test_string_and_identifier_continue_across_lines():
+    _, state = tokenize_line("SELECT 'abierta", STATE_NORMAL)
+    assert state == STATE_STRING
+    tokens, state = tokenize_line("it''s' AS x", state)
+    assert state == STATE_NORMAL
+    assert tokens[0] == ("string", 0, 6)
+
+    _, state = tokenize_line('SELECT "col', STATE_NORMAL)
+    assert state == STATE_IDENTIFIER
+    tokens, state = tokenize_line('umna"', state)
+    assert state == STATE_NORMAL
+    assert tokens == [("identifier", 0, 5)]
+
+
+def test_empty_line_keeps_state():
+    assert tokenize_line("", STATE_STRING) == ([], STATE_STRING)
+
+
+def test_tokenize_matches_line_by_line():
+    sql = "SELECT /* a\nb */ 1,\n'x\ny', :p;"
+    state = STATE_NORMAL
+    expected = []
+    for number, line in enumerate(sql.split("\n"), start=1):
+        tokens, state = tokenize_line(line, state)
+        expected.extend((kind, number, start, end) for kind, start, end in tokens)
+    assert tokenize(sql) == expected
+    assert ("parameter", 4, 4, 6) in expected
@@ -0,0 +1,41 @@
+import pytest
+from utils.sql_params import bind_values, find_parameters, number_parameters
+
+
+@pytest.mark.parametrize("sql, expected", [
+    ("SELECT 1;", []),
+    ("SELECT ?, ?;", ["?1", "?2"]),
+    ("SELECT ?3, ?;", ["?1", "?2", "?3", "?4"]),
+    ("SELECT ?2, ?1, ?2;", ["?1", "?2"]),
+    ("SELECT :a, @b, :a, $c;", [":a", "@b", "$c"]),
+    ("SELECT ?5, :a;", ["?1", "?2", "?3", "?4", "?5", ":a"]),
+    ("SELECT ':no', \"?no\" -- ?no\n, /* :no */ :yes;", [":yes"]),
+])
+def test_find_parameters(sql, expected):
+    assert find_parameters(sql) == expected
+
+
+def test_number_parameters_matches_find_parameters():
+    tokens = ["?", ":name", "?"]
+    assert number_parameters(tokens) == ["?1", ":name", "?3"]
+
+
+def test_parameters_inside_multiline_strings_are_ignored():
+    sql = "SELECT 'línea 1\n:dentro' AS t,\n:fuera;"
+    assert find_parameters(sql) == [":fuera"]
+
+
+def test_bind_values():
+    assert bind_values(["?1", "?2"], [1, "a"]) == (1, "a")
+    assert bind_values([":a", "@b"], [1, 2]) == {"a": 1, "b": 2}
+    assert bind_values([], []) == ()
+
+
+def test_bind_values_rejects_mixed_parameters():
+    with pytest.raises(ValueError):
+        bind_values(["?1", ":a"], [1, 2])
+
+
+def test_bind_values_rejects_wrong_count():
+    with pytest.raises(ValueError):
+        bind_values(["?1", "?2"], [1])
@@ -0,0 +1,140 @@
+import tkinter as tk
+
+# Teclas que no deben volver a calcular las sugerencias
+NAVIGATION_KEYS = ("Up", "Down", "Return", "Tab", "Escape")
+
+
+class AutoCompleter:
+    """
+    Ventana emergente de autocompletado para un editor SQL.
+    Se abre con Ctrl+Espacio o al escribir un punto, y se actualiza mientras se escribe.
+    Las sugerencias salen de un índice por prefijo, sin consultar la base de datos.
+    """
+
+    def __init__(self, text_widget, get_completion_index):
+        """
+        Conecta el autocompletado a un editor.
+
+        Args:
+            text_widget: Widget de texto del editor SQL
+            get_completion_index: Función sin argumentos que devuelve el CompletionIndex
+                                  de la base de datos activa, o None si no hay conexión
+        """
+        self.text_widget = text_widget
+        self.get_completion_index = get_completion_index
+        self.popup = None
+        self.listbox = None
+        self.prefix = ""
+
+        text_widget.bind("<Control-space>", self.show, add="+")
+        text_widget.bind("<KeyPress>", self.on_key_press, add="+")
+        text_widget.bind("<KeyRelease>", self.on_key_release, add="+")
+        text_widget.bind("<FocusOut>", lambda e: self.hide(), add="+")
+        text_widget.bind("<Button-1>", lambda e: self.hide(), add="+")
+
+    def current_statement(self):
+        """
+        Devuelve el texto de la sentencia donde está el cursor (entre puntos y coma).
+        """
+        start = self.text_widget.search(";", "insert", stopindex="1.0", backwards=True) or "1.0"
+        end = self.text_widget.search(";", "insert", stopindex="end") or "end"
+        return self.text_widget.get(start, end)
+
+    def show(self, event=None):
+        """
+        Calcula las sugerencias para la palabra actual y muestra la ventana emergente.
+        """
+        index = self.get_completion_index()
+        if index is None:
+            self.hide()
+            return "break"
+        text_before_cursor = self.text_widget.get("insert linestart", "insert")
+        self.prefix, suggestions = index.complete(self.current_statement(), text_before_cursor)
+        if not suggestions:
+            self.hide()
+            return "break"
+
+        if self.popup is None:
+            self.popup = tk.Toplevel(self.text_widget)
+            self.popup.wm_overrideredirect(True)
+            self.listbox = tk.Listbox(self.popup, height=8, exportselection=False)
+            self.listbox.pack(fill=tk.BOTH, expand=True)
+            self.listbox.bind("<Double-Button-1>", lambda e: self.accept())
+
+        self.listbox.delete(0, tk.END)
+        self.listbox.insert(tk.END, *suggestions)
+        self.listbox.selection_set(0)
+
+        # Colocar la ventana bajo el cursor
+        bbox = self.text_widget.bbox("insert")
+        if bbox:
+            x, y, _, height = bbox
+            self.popup.wm_geometry(
+                f"+{self.text_widget.winfo_rootx() + x}+{self.text_widget.winfo_rooty() + y + height}"
+            )
+        return "break"
+
+    def hide(self):
+        """
+        Cierra la ventana emergente si está abierta.
+        """
+        if self.popup is not None:
+            self.popup.destroy()
+            self.popup = None
+            self.listbox = None
+
+    def accept(self):
+        """
+        Sustituye la palabra que se está escribiendo por la sugerencia seleccionada.
+        """
+        selection = self.listbox.curselection()
+        if selection:
+            choice = self.listbox.get(selection[0])
+            self.text_widget.delete(f"insert-{len(self.prefix)}c", "insert")
+            self.text_widget.insert("insert", choice)
+        self.hide()
+
+    def move_selection(self, step):
+        """
+        Mueve la selección de la lista de sugerencias.
+        """
+        selection = self.listbox.curselection()
+        position = (selection[0] if selection else 0) + step
+        position = max(0, min(position, self.listbox.size() - 1))
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(position)
+        self.listbox.see(position)
+
+    def on_key_press(self, event):
+        """
+        Gestiona la navegación por la lista mientras la ventana está abierta.
+        """
+        if self.popup is None:
+            return None
+        if event.keysym == "Up":
+            self.move_selection(-1)
+            return "break"
+        if event.keysym == "Down":
+            self.move_selection(1)
+            return "break"
+        if event.keysym in ("Return", "Tab"):
+            self.accept()
+            return "break"
+        if event.keysym == "Escape":
+            self.hide()
+            return "break"
+        return None
+
+    def on_key_release(self, event):
+        """
+        Actualiza las sugerencias al escribir, o las abre al escribir un punto.
+        """
+        if event.keysym in NAVIGATION_KEYS or (event.state & 0x4):  # Ignorar navegación y Ctrl
+            return
+        if event.char == ".":
+            self.show()
+        elif self.popup is not None:
+            if event.char and not (event.char.isalnum() or event.char in "_$") and event.keysym != "BackSpace":
+                self.hide()
+            else:
+                self.show()
@@ -0,0 +1,44 @@
+import queue
+import threading
+
+
+def run_in_background(root, task, on_success=None, on_error=None, poll_interval=50):
+    """
+    Ejecuta una tarea en un hilo de trabajo y entrega su resultado en el hilo de Tkinter.
+
+    Parameters:
+    - root: Ventana principal de Tkinter, usada para programar la comprobación del resultado.
+    - task: Función sin argumentos que se ejecuta en segundo plano. No debe tocar widgets.
+    - on_success (opcional): Función que recibe el valor devuelto por la tarea.
+    - on_error (opcional): Función que recibe la excepción lanzada por la tarea.
+    - poll_interval (opcional): Milisegundos entre comprobaciones del resultado.
+
+    Tkinter no es seguro entre hilos, por lo que el hilo de trabajo solo deja el resultado
+    en una cola y el bucle principal lo recoge con `after`.
+
+    Returns:
+    - El hilo de trabajo creado.
+    """
+    results = queue.Queue(maxsize=1)
+
+    def worker():
+        try:
+            results.put((True, task()))
+        except Exception as e:
+            results.put((False, e))
+
+    def poll():
+        try:
+            ok, value = results.get_nowait()
+        except queue.Empty:
+            root.after(poll_interval, poll)
+            return
+        if ok and on_success:
+            on_success(value)
+        elif not ok and on_error:
+            on_error(value)
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    root.after(poll_interval, poll)
+    return thread
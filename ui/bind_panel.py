@@ -0,0 +1,151 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from utils.sql_params import find_parameters, number_parameters, convert_value, bind_values, parse_parameter_rows
+
+# Milisegundos de espera tras la última tecla antes de volver a detectar los parámetros
+DETECT_DELAY = 400
+
+
+class BindPanel:
+    """
+    Panel de valores de los parámetros (?, ?N, :nombre, @nombre, $nombre) de un editor SQL.
+
+    Aparece bajo el editor cuando el SQL contiene parámetros y muestra un campo por cada
+    uno. También admite una lista de filas de valores, pegada o cargada de un CSV, para
+    ejecutar la sentencia una vez por fila con executemany.
+    """
+
+    def __init__(self, parent, text_widget, anchor, highlighter):
+        """
+        Crea el panel (oculto hasta que se detecten parámetros).
+
+        Args:
+            parent: Frame del editor
+            text_widget: Widget de texto del editor SQL
+            anchor: Widget ante el que se coloca el panel al mostrarse
+            highlighter: SQLHighlighter del editor, que ya conoce los parámetros de cada línea
+        """
+        self.text_widget = text_widget
+        self.highlighter = highlighter
+        self.anchor = anchor
+        self.parameters = []
+        self.values = {}        # Parámetro -> StringVar con su valor
+        self.rows_text = ""     # Filas de valores para executemany
+        self.detect_job = None
+
+        self.frame = ttk.LabelFrame(parent, text="Parámetros")
+        self.fields_frame = ttk.Frame(self.frame)
+        self.fields_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5, pady=2)
+        ttk.Button(self.frame, text="Filas...", command=self.edit_rows).pack(side=tk.RIGHT, padx=5)
+        self.rows_label = ttk.Label(self.frame, text="")
+        self.rows_label.pack(side=tk.RIGHT)
+
+        text_widget.bind("<KeyRelease>", lambda e: self.schedule_detect(), add="+")
+
+    def schedule_detect(self):
+        """
+        Detecta los parámetros cuando se deja de escribir durante DETECT_DELAY milisegundos.
+        """
+        if self.detect_job:
+            self.text_widget.after_cancel(self.detect_job)
+        self.detect_job = self.text_widget.after(DETECT_DELAY, self.detect)
+
+    def detect(self):
+        """
+        Vuelve a detectar los parámetros del editor y reconstruye los campos si cambiaron.
+        Los valores ya escritos se conservan para los parámetros que siguen presentes.
+        Los parámetros salen de los tokens que guarda el resaltado por línea, de modo que
+        el coste no depende del tamaño del texto; si el resaltado no ha terminado, se
+        vuelve a intentar más tarde.
+        """
+        self.detect_job = None
+        tokens = self.highlighter.parameter_tokens()
+        if tokens is None:
+            self.schedule_detect()
+            return
+        parameters = number_parameters(tokens)
+        if parameters == self.parameters:
+            return
+        self.parameters = parameters
+
+        for child in self.fields_frame.winfo_children():
+            child.destroy()
+        self.values = {parameter: self.values.get(parameter) or tk.StringVar() for parameter in parameters}
+        for position, parameter in enumerate(parameters):
+            row, column = divmod(position, 4)
+            ttk.Label(self.fields_frame, text=parameter).grid(row=row, column=2 * column, padx=(0, 2), sticky=tk.E)
+            ttk.Entry(self.fields_frame, textvariable=self.values[parameter], width=15).grid(
+                row=row, column=2 * column + 1, padx=(0, 8), pady=1
+            )
+
+        if parameters:
+            self.frame.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=(0, 5), before=self.anchor)
+        else:
+            self.frame.pack_forget()
+
+    def get_bindings(self, sql_command):
+        """
+        Devuelve los valores que se enlazan al ejecutar el SQL.
+
+        Args:
+            sql_command: Texto del editor que se va a ejecutar
+
+        Returns:
+            Tupla (params, many): params es None si el SQL no tiene parámetros, una fila de
+            valores, o la lista de filas si hay filas cargadas (many es True)
+
+        Raises:
+            ValueError: Si el número de valores no coincide con el de parámetros
+        """
+        tokens = self.highlighter.parameter_tokens()
+        # Con el resaltado al día no hace falta volver a analizar el texto
+        parameters = number_parameters(tokens) if tokens is not None else find_parameters(sql_command)
+        if not parameters:
+            return None, False
+        if parameters != self.parameters:
+            self.detect()  # El texto pudo cambiar sin pulsar teclas (p. ej. al abrir un archivo)
+        if self.rows_text.strip():
+            return parse_parameter_rows(self.rows_text, parameters), True
+        values = [convert_value(self.values[parameter].get()) if parameter in self.values else None
+                  for parameter in parameters]
+        return bind_values(parameters, values), False
+
+    def edit_rows(self):
+        """
+        Abre una ventana para pegar o cargar de un CSV las filas de valores de executemany.
+        """
+        dialog = tk.Toplevel(self.text_widget)
+        dialog.title("Filas de parámetros")
+        dialog.geometry("500x350")
+        ttk.Label(
+            dialog,
+            text=f"Una fila por línea, separada por comas, punto y coma o tabuladores: {', '.join(self.parameters)}"
+        ).pack(fill=tk.X, padx=5, pady=5)
+        rows_text = tk.Text(dialog, wrap=tk.NONE)
+        rows_text.pack(fill=tk.BOTH, expand=True, padx=5)
+        rows_text.insert("1.0", self.rows_text)
+
+        def load_csv():
+            path = filedialog.askopenfilename(parent=dialog, filetypes=[("CSV", "*.csv"), ("All files", "*.*")])
+            if not path:
+                return
+            try:
+                with open(path, 'r', encoding='utf-8', newline='') as file:
+                    content = file.read()
+            except OSError as e:
+                messagebox.showerror("Error", f"Error al leer el archivo: {str(e)}", parent=dialog)
+                return
+            rows_text.delete("1.0", tk.END)
+            rows_text.insert("1.0", content)
+
+        def accept(text):
+            self.rows_text = text
+            count = sum(1 for line in text.splitlines() if line.strip())
+            self.rows_label.config(text=f"{count} filas (executemany)" if count else "")
+            dialog.destroy()
+
+        buttons = ttk.Frame(dialog)
+        buttons.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(buttons, text="Cargar CSV...", command=load_csv).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Quitar filas", command=lambda: accept("")).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Aceptar", command=lambda: accept(rows_text.get("1.0", "end-1c"))).pack(side=tk.RIGHT)
@@ -0,0 +1,110 @@
+import logging
+import tkinter as tk
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+# Número máximo de líneas que conserva la consola
+DEFAULT_MAX_LINES = 5000
+
+# Milisegundos entre volcados de mensajes (aproximadamente un fotograma)
+FLUSH_INTERVAL = 16
+
+# Colores de cada tipo de mensaje
+TAG_COLORS = {
+    'info': 'white',
+    'error': 'red',
+    'success': 'green',
+}
+
+
+class ConsoleLog:
+    """
+    Consola de mensajes con un número máximo de líneas.
+    Los mensajes se encolan y se insertan en bloque una vez por fotograma, y las
+    líneas más antiguas se descartan al superar el límite. Opcionalmente, el registro
+    completo se guarda en un archivo rotativo.
+    """
+
+    def __init__(self, text_widget, max_lines=DEFAULT_MAX_LINES, log_file=None,
+                 max_bytes=1024 * 1024, backup_count=3):
+        """
+        Inicializa la consola sobre un widget de texto.
+
+        Args:
+            text_widget: Widget de texto (ScrolledText) de la consola
+            max_lines: Número máximo de líneas visibles
+            log_file: Ruta opcional del archivo donde volcar el registro completo
+            max_bytes: Tamaño máximo de cada archivo de registro antes de rotar
+            backup_count: Número de archivos de registro rotados que se conservan
+        """
+        self.text_widget = text_widget
+        self.max_lines = max_lines
+        self.pending = deque(maxlen=max_lines)  # Mensajes pendientes de mostrar
+        self.line_count = 0                     # Líneas actualmente en el widget
+        self.flush_scheduled = False
+
+        # Los tags se configuran una sola vez
+        for tag, color in TAG_COLORS.items():
+            self.text_widget.tag_config(tag, foreground=color)
+        self.text_widget.config(state='disabled')
+
+        self.logger = None
+        if log_file:
+            self.logger = logging.getLogger(f"tsukisql.console.{id(self)}")
+            self.logger.propagate = False
+            self.logger.setLevel(logging.INFO)
+            handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.logger.addHandler(handler)
+
+    def append(self, text, type='info'):
+        """
+        Encola un mensaje para mostrarlo en el próximo volcado.
+
+        Args:
+            text: Texto del mensaje
+            type: Tipo de mensaje ('info', 'error', 'success')
+        """
+        tag = type if type in TAG_COLORS else 'info'
+        self.pending.append((text, tag))
+        if self.logger:
+            self.logger.info("[%s] %s", tag, text)
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            self.text_widget.after(FLUSH_INTERVAL, self.flush)
+
+    def flush(self):
+        """
+        Inserta en bloque los mensajes pendientes y recorta las líneas que superan el límite.
+        """
+        self.flush_scheduled = False
+        if not self.pending:
+            return
+
+        # Una sola llamada a insert con pares texto/tag
+        chunks = []
+        added_lines = 0
+        while self.pending:
+            text, tag = self.pending.popleft()
+            chunks.extend((f"{text}\n", tag))
+            added_lines += text.count("\n") + 1
+
+        self.text_widget.config(state='normal')
+        self.text_widget.insert(tk.END, *chunks)
+        self.line_count += added_lines
+        if self.line_count > self.max_lines:
+            excess = self.line_count - self.max_lines
+            self.text_widget.delete("1.0", f"{excess + 1}.0")
+            self.line_count = self.max_lines
+        self.text_widget.see(tk.END)
+        self.text_widget.config(state='disabled')
+
+    def clear(self):
+        """
+        Borra el contenido de la consola y los mensajes pendientes.
+        """
+        self.pending.clear()
+        self.text_widget.config(state='normal')
+        self.text_widget.delete("1.0", tk.END)
+        self.text_widget.config(state='disabled')
+        self.line_count = 0
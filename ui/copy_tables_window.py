@@ -0,0 +1,196 @@
+import queue
+import tkinter as tk
+from pathlib import Path
+from tkinter import ttk, filedialog, messagebox, simpledialog
+from ui.background import run_in_background
+from utils.table_copy import TableCopier
+
+# Milisegundos entre dos lecturas del progreso enviado por el hilo de trabajo
+POLL_INTERVAL = 100
+
+
+class CopyTablesWindow:
+    """
+    Ventana para copiar tablas a otro archivo SQLite.
+
+    Se eligen las tablas (y, con doble clic, un filtro WHERE para cada una) y la copia
+    se hace en segundo plano con ATTACH e INSERT INTO ... SELECT, en una sola transacción.
+    """
+
+    def __init__(self, parent, db_manager, db_path, tables, log):
+        """
+        Crea la ventana.
+
+        Args:
+            parent: Ventana principal de la aplicación
+            db_manager: Registro de bases de datos de la aplicación
+            db_path: Base de datos de origen
+            tables: Nombres de las tablas de la base de datos de origen
+            log: Función que recibe un mensaje y su tipo para la consola
+        """
+        self.parent = parent
+        self.db_manager = db_manager
+        self.db_path = db_path
+        self.log = log
+        self.copier = None
+        self.events = queue.Queue()
+        self.poll_job = None
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(f"Copiar Tablas - {db_path}")
+        self.dialog.geometry("600x450")
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+        self.create_widgets(tables)
+
+    def create_widgets(self, tables):
+        """
+        Crea la lista de tablas, los botones y la barra de progreso.
+
+        Args:
+            tables: Nombres de las tablas que pueden copiarse
+        """
+        ttk.Label(
+            self.dialog,
+            text="Selecciona las tablas a copiar. Doble clic para filtrar las filas de una tabla con WHERE."
+        ).pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        table_frame = ttk.Frame(self.dialog)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10)
+        self.tables_list = ttk.Treeview(table_frame, columns=("WHERE",), show='tree headings', selectmode='extended')
+        self.tables_list.heading("#0", text="Tabla")
+        self.tables_list.column("#0", width=200)
+        self.tables_list.heading("WHERE", text="WHERE")
+        self.tables_list.column("WHERE", width=350)
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tables_list.yview)
+        self.tables_list.configure(yscrollcommand=scrollbar.set)
+        self.tables_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        for table in tables:
+            self.tables_list.insert("", tk.END, iid=table, text=table, values=("",))
+        self.tables_list.bind("<Double-Button-1>", self.edit_filter)
+
+        buttons = ttk.Frame(self.dialog)
+        buttons.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Button(buttons, text="Seleccionar todas",
+                   command=lambda: self.tables_list.selection_set(self.tables_list.get_children())).pack(side=tk.LEFT)
+        self.cancel_button = ttk.Button(buttons, text="Cancelar", command=self.cancel, state="disabled")
+        self.cancel_button.pack(side=tk.RIGHT)
+        self.copy_button = ttk.Button(buttons, text="Copiar a...", command=self.start)
+        self.copy_button.pack(side=tk.RIGHT, padx=5)
+
+        status_bar = ttk.Frame(self.dialog)
+        status_bar.pack(fill=tk.X, padx=10, pady=(0, 10))
+        self.progress = ttk.Progressbar(status_bar, mode='determinate', length=200)
+        self.progress.pack(side=tk.LEFT)
+        self.status_label = ttk.Label(status_bar, text="")
+        self.status_label.pack(side=tk.LEFT, padx=5)
+
+    def edit_filter(self, event=None):
+        """
+        Pide la condición WHERE de la tabla sobre la que se hizo doble clic.
+        """
+        table = self.tables_list.identify_row(event.y) if event else self.tables_list.focus()
+        if not table:
+            return
+        where = simpledialog.askstring(
+            "Filtro", f"Condición WHERE para {table} (vacío para copiar todas las filas):",
+            initialvalue=self.tables_list.set(table, "WHERE"), parent=self.dialog
+        )
+        if where is not None:
+            self.tables_list.set(table, "WHERE", where.strip())
+            self.tables_list.selection_add(table)
+
+    def start(self):
+        """
+        Pide el archivo de destino e inicia la copia de las tablas seleccionadas.
+        """
+        if self.copier:
+            return
+        tables = list(self.tables_list.selection())
+        if not tables:
+            messagebox.showwarning("Advertencia", "Selecciona al menos una tabla.", parent=self.dialog)
+            return
+        target_path = filedialog.asksaveasfilename(
+            parent=self.dialog,
+            title="Copiar tablas a",
+            defaultextension=".db",
+            filetypes=[("SQLite DB", "*.db *.sqlite3")],
+            confirmoverwrite=False
+        )
+        if not target_path:
+            return
+        if Path(target_path).resolve() == Path(self.db_path).resolve():
+            messagebox.showwarning("Advertencia", "El destino debe ser otro archivo.", parent=self.dialog)
+            return
+
+        filters = {table: self.tables_list.set(table, "WHERE") for table in tables}
+        self.copier = copier = TableCopier(self.db_manager.read_uri(self.db_path), target_path, tables, filters)
+        events = self.events = queue.Queue()
+        self.progress.config(value=0, maximum=len(tables))
+        self.copy_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        description = f"Copia de {len(tables)} tablas a {target_path}"
+
+        def on_success(completed):
+            rows = sum(copier.copied.values())
+            message = f"{rows} filas copiadas" if completed else "cancelada, el destino no cambió"
+            self._finish(f"{description}: {message}")
+            self.log(f"{description}: {message}", 'success' if completed else 'info')
+
+        def on_error(error):
+            self._finish(f"Error: {str(error)}")
+            self.log(f"{description}: {str(error)}", 'error')
+
+        self.log(f"{description}: en curso...", 'info')
+        self.poll_job = self.dialog.after(POLL_INTERVAL, self.poll)
+        run_in_background(
+            self.parent, lambda: copier.run(lambda *position: events.put(position)), on_success, on_error
+        )
+
+    def poll(self):
+        """
+        Muestra el progreso enviado desde el hilo de trabajo.
+        """
+        self.poll_job = None
+        if not self.dialog.winfo_exists():
+            return
+        self._drain()
+        self.poll_job = self.dialog.after(POLL_INTERVAL, self.poll)
+
+    def _drain(self):
+        """Vacía la cola de progreso del hilo de trabajo."""
+        while True:
+            try:
+                index, total, table = self.events.get_nowait()
+            except queue.Empty:
+                return
+            self.progress.config(value=index)
+            if table is not None:
+                self.status_label.config(text=f"Tabla {index + 1} de {total}: {table}")
+
+    def cancel(self):
+        """
+        Cancela la copia en curso.
+        """
+        if self.copier:
+            self.copier.cancel()
+
+    def close(self):
+        """
+        Cierra la ventana, cancelando la copia en curso si la hay.
+        """
+        self.cancel()
+        self.dialog.destroy()
+
+    def _finish(self, message):
+        """Detiene la lectura del progreso y restaura los botones."""
+        self.copier = None
+        if self.poll_job:
+            self.dialog.after_cancel(self.poll_job)
+            self.poll_job = None
+        if not self.dialog.winfo_exists():
+            return
+        self._drain()
+        self.copy_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+        self.status_label.config(text=message)
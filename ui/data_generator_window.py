@@ -0,0 +1,213 @@
+import queue
+import sqlite3
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog
+from ui.background import run_in_background
+from utils.data_generator import DataGenerator
+
+# Filas por tabla que se proponen al abrir la ventana
+DEFAULT_ROWS = 1000
+
+# Milisegundos entre dos lecturas del progreso enviado por el hilo de trabajo
+POLL_INTERVAL = 100
+
+
+class DataGeneratorWindow:
+    """
+    Ventana para rellenar tablas con datos de prueba.
+
+    Se eligen las tablas y el número de filas de cada una (doble clic para cambiarlo);
+    la generación se hace en segundo plano con una conexión de sesión propia y en una
+    sola transacción, por lo que cancelarla deja la base de datos como estaba.
+    """
+
+    def __init__(self, parent, db_manager, db_path, tables, log):
+        """
+        Crea la ventana.
+
+        Args:
+            parent: Ventana principal de la aplicación
+            db_manager: Registro de bases de datos de la aplicación
+            db_path: Base de datos a rellenar
+            tables: Nombres de las tablas de la base de datos
+            log: Función que recibe un mensaje y su tipo para la consola
+        """
+        self.parent = parent
+        self.db_manager = db_manager
+        self.db_path = db_path
+        self.log = log
+        self.generator = None
+        self.running = False
+        self.poll_job = None
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(f"Generar Datos de Prueba - {db_path}")
+        self.dialog.geometry("550x450")
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+        self.create_widgets(tables)
+
+    def create_widgets(self, tables):
+        """
+        Crea la lista de tablas, los botones y la barra de progreso.
+
+        Args:
+            tables: Nombres de las tablas que pueden rellenarse
+        """
+        options = ttk.Frame(self.dialog)
+        options.pack(fill=tk.X, padx=10, pady=(10, 5))
+        ttk.Label(options, text="Filas por tabla:").pack(side=tk.LEFT)
+        self.rows_var = tk.StringVar(value=str(DEFAULT_ROWS))
+        ttk.Entry(options, textvariable=self.rows_var, width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Button(options, text="Aplicar a la selección", command=self.apply_rows).pack(side=tk.LEFT)
+
+        table_frame = ttk.Frame(self.dialog)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10)
+        self.tables_list = ttk.Treeview(table_frame, columns=("Filas",), show='tree headings', selectmode='extended')
+        self.tables_list.heading("#0", text="Tabla")
+        self.tables_list.column("#0", width=300)
+        self.tables_list.heading("Filas", text="Filas")
+        self.tables_list.column("Filas", width=120, anchor=tk.E)
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tables_list.yview)
+        self.tables_list.configure(yscrollcommand=scrollbar.set)
+        self.tables_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        for table in tables:
+            self.tables_list.insert("", tk.END, iid=table, text=table, values=(DEFAULT_ROWS,))
+        self.tables_list.bind("<Double-Button-1>", self.edit_rows)
+
+        buttons = ttk.Frame(self.dialog)
+        buttons.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(buttons, text="Las tablas referenciadas se rellenan antes que las que las referencian.").pack(
+            side=tk.LEFT
+        )
+        self.cancel_button = ttk.Button(buttons, text="Cancelar", command=self.cancel, state="disabled")
+        self.cancel_button.pack(side=tk.RIGHT)
+        self.generate_button = ttk.Button(buttons, text="Generar", command=self.start)
+        self.generate_button.pack(side=tk.RIGHT, padx=5)
+
+        status_bar = ttk.Frame(self.dialog)
+        status_bar.pack(fill=tk.X, padx=10, pady=(0, 10))
+        self.progress = ttk.Progressbar(status_bar, mode='determinate', length=200)
+        self.progress.pack(side=tk.LEFT)
+        self.status_label = ttk.Label(status_bar, text="")
+        self.status_label.pack(side=tk.LEFT, padx=5)
+
+    def apply_rows(self):
+        """
+        Asigna el número de filas indicado a las tablas seleccionadas.
+        """
+        try:
+            rows = int(self.rows_var.get())
+        except ValueError:
+            messagebox.showwarning("Advertencia", "El número de filas debe ser un entero.", parent=self.dialog)
+            return
+        for table in self.tables_list.selection():
+            self.tables_list.set(table, "Filas", max(0, rows))
+
+    def edit_rows(self, event):
+        """
+        Pide el número de filas de la tabla sobre la que se hizo doble clic.
+        """
+        table = self.tables_list.identify_row(event.y)
+        if not table:
+            return
+        rows = simpledialog.askinteger(
+            "Filas", f"Filas a generar en {table}:", minvalue=0,
+            initialvalue=int(self.tables_list.set(table, "Filas")), parent=self.dialog
+        )
+        if rows is not None:
+            self.tables_list.set(table, "Filas", rows)
+            self.tables_list.selection_add(table)
+
+    def start(self):
+        """
+        Genera los datos de las tablas seleccionadas en segundo plano.
+        """
+        if self.running:
+            return
+        row_counts = {
+            table: int(self.tables_list.set(table, "Filas")) for table in self.tables_list.selection()
+        }
+        row_counts = {table: rows for table, rows in row_counts.items() if rows > 0}
+        if not row_counts:
+            messagebox.showwarning("Advertencia", "Selecciona al menos una tabla con filas.", parent=self.dialog)
+            return
+
+        if self.db_path not in self.db_manager.open_databases():
+            messagebox.showwarning("Advertencia", "La base de datos ya no está abierta.", parent=self.dialog)
+            return
+        # La sesión se abre y se cierra en el hilo de la interfaz, el único que modifica el registro
+        try:
+            connection, _ = self.db_manager.acquire_session(self.db_path)
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", str(e), parent=self.dialog)
+            return
+        self.generator = generator = DataGenerator(connection, row_counts)
+
+        total = sum(row_counts.values())
+        done = {}
+        events = queue.Queue()
+        self.running = True
+        self.progress.config(value=0, maximum=total)
+        self.generate_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        description = f"Generación de {total} filas en {len(row_counts)} tablas"
+
+        def work():
+            return generator.run(lambda *position: events.put(position))
+
+        def on_success(completed):
+            message = "completada" if completed else "cancelada, la base de datos no cambió"
+            self._finish(f"{description}: {message}")
+            self.log(f"{description}: {message}", 'success' if completed else 'info')
+
+        def on_error(error):
+            self._finish(f"Error: {str(error)}")
+            self.log(f"{description}: {str(error)}", 'error')
+
+        def poll():
+            self.poll_job = None
+            if not self.dialog.winfo_exists():
+                return
+            while True:
+                try:
+                    table, inserted, _ = events.get_nowait()
+                except queue.Empty:
+                    break
+                done[table] = inserted
+                self.status_label.config(text=f"{table}: {inserted} filas")
+            self.progress.config(value=sum(done.values()))
+            self.poll_job = self.dialog.after(POLL_INTERVAL, poll)
+
+        self.log(f"{description}: en curso...", 'info')
+        self.poll_job = self.dialog.after(POLL_INTERVAL, poll)
+        run_in_background(self.parent, work, on_success, on_error)
+
+    def cancel(self):
+        """
+        Cancela la generación en curso.
+        """
+        if self.running and self.generator:
+            self.generator.cancel()
+
+    def close(self):
+        """
+        Cierra la ventana, cancelando la generación en curso si la hay.
+        """
+        self.cancel()
+        self.dialog.destroy()
+
+    def _finish(self, message):
+        """Cierra la sesión de trabajo, detiene la lectura del progreso y restaura los botones."""
+        self.running = False
+        if self.generator:
+            self.db_manager.release_session(self.generator.db_connection, self.db_path)
+        self.generator = None
+        if self.poll_job:
+            self.dialog.after_cancel(self.poll_job)
+            self.poll_job = None
+        if not self.dialog.winfo_exists():
+            return
+        self.generate_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+        self.status_label.config(text=message)
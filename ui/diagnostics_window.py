@@ -0,0 +1,125 @@
+import tkinter as tk
+from tkinter import ttk
+from utils.instrumentation import metrics
+
+METRIC_COLUMNS = ("Llamadas", "p50", "p99", "Máximo")
+
+# Milisegundos entre dos actualizaciones de la tabla de métricas
+REFRESH_INTERVAL = 1000
+
+
+def _format_ms(seconds):
+    """Formatea una duración en milisegundos."""
+    return f"{seconds * 1000:.1f} ms"
+
+
+class DiagnosticsWindow:
+    """
+    Ventana de diagnóstico del rendimiento de la interfaz.
+
+    Muestra p50, p99 y el máximo de cada acción instrumentada y del retardo del bucle de
+    eventos, y permite capturar un perfil de cProfile del hilo de la interfaz.
+    """
+
+    def __init__(self, parent, profile_capture):
+        """
+        Crea la ventana y empieza a actualizar las métricas.
+
+        Args:
+            parent: Ventana principal de la aplicación
+            profile_capture: ProfileCapture de la aplicación
+        """
+        self.profile_capture = profile_capture
+        self.refresh_job = None
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Diagnóstico")
+        self.dialog.geometry("700x550")
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+        self.create_widgets()
+        self.refresh()
+
+    def create_widgets(self):
+        """
+        Crea la tabla de métricas, los controles de captura y el área del perfil.
+        """
+        self.metrics_table = ttk.Treeview(self.dialog, columns=METRIC_COLUMNS, show='tree headings', height=10)
+        self.metrics_table.heading("#0", text="Acción")
+        self.metrics_table.column("#0", width=250)
+        for column in METRIC_COLUMNS:
+            self.metrics_table.heading(column, text=column)
+            self.metrics_table.column(column, width=90, anchor=tk.E)
+        self.metrics_table.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+
+        controls = ttk.Frame(self.dialog)
+        controls.pack(fill=tk.X, padx=10, pady=5)
+        self.profile_var = tk.BooleanVar(value=self.profile_capture.active)
+        ttk.Checkbutton(
+            controls, text="Capturar perfil (cProfile)", variable=self.profile_var, command=self.toggle_profile
+        ).pack(side=tk.LEFT)
+        ttk.Button(controls, text="Reiniciar métricas", command=self.reset).pack(side=tk.RIGHT)
+
+        self.profile_text = tk.Text(self.dialog, wrap=tk.NONE, height=12, font=("Courier", 9))
+        self.profile_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        self.profile_text.insert("1.0", "Activa la captura, reproduce la acción lenta y desactívala para ver el perfil.")
+        self.profile_text.configure(state=tk.DISABLED)
+
+    def refresh(self):
+        """
+        Vuelve a mostrar las métricas cada REFRESH_INTERVAL milisegundos.
+        """
+        self.refresh_job = None
+        if not self.dialog.winfo_exists():
+            return
+        self.metrics_table.delete(*self.metrics_table.get_children())
+        for metric in metrics.summary():
+            self.metrics_table.insert("", tk.END, text=metric['name'], values=(
+                metric['count'],
+                _format_ms(metric['p50']),
+                _format_ms(metric['p99']),
+                _format_ms(metric['max']),
+            ))
+        self.refresh_job = self.dialog.after(REFRESH_INTERVAL, self.refresh)
+
+    def toggle_profile(self):
+        """
+        Inicia o detiene la captura de cProfile y muestra el resultado al detenerla.
+        """
+        if self.profile_var.get():
+            self.profile_capture.start()
+            return
+        self.show_report(self.profile_capture.stop())
+
+    def show_report(self, report):
+        """
+        Muestra el informe de una captura de perfil.
+
+        Args:
+            report: Texto devuelto por ProfileCapture.stop()
+        """
+        self.profile_text.configure(state=tk.NORMAL)
+        self.profile_text.delete("1.0", tk.END)
+        self.profile_text.insert("1.0", report)
+        self.profile_text.configure(state=tk.DISABLED)
+
+    def reset(self):
+        """
+        Borra las mediciones acumuladas.
+        """
+        metrics.reset()
+        if self.refresh_job:
+            self.dialog.after_cancel(self.refresh_job)
+        self.refresh()
+
+    def close(self):
+        """
+        Cierra la ventana. Una captura en curso se detiene para no seguir perfilando y su
+        informe se muestra antes: la ventana se cierra en el siguiente intento.
+        """
+        if self.profile_capture.active:
+            self.profile_var.set(False)
+            self.show_report(self.profile_capture.stop())
+            return
+        if self.refresh_job:
+            self.dialog.after_cancel(self.refresh_job)
+        self.dialog.destroy()
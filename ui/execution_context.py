@@ -0,0 +1,140 @@
+import time
+from ui.background import run_in_background
+from ui.sql_executor import run_sql
+
+
+class ExecutionContext:
+    """
+    Contexto de ejecución de una pestaña del editor SQL.
+    Cada pestaña tiene su propia conexión de sesión, su propio hilo de trabajo
+    y su propia tabla de resultados, de modo que varias consultas pueden
+    ejecutarse en paralelo mientras se sigue trabajando en otra pestaña.
+    """
+
+    def __init__(self, name, text_widget, results_table, results_grid=None, bind_panel=None):
+        """
+        Inicializa el contexto de una pestaña.
+
+        Args:
+            name: Nombre del editor al que pertenece
+            text_widget: Widget de texto del editor
+            results_table: Tabla de resultados propia de la pestaña
+            results_grid: ResultsGrid que ordena y filtra la tabla de resultados
+            bind_panel: BindPanel con los valores de los parámetros del editor
+        """
+        self.name = name
+        self.text_widget = text_widget
+        self.results_table = results_table
+        self.results_grid = results_grid
+        self.bind_panel = bind_panel
+        self.db_manager = None     # Registro de bases de datos que prestó la sesión
+        self.connection = None     # Conexión de sesión de la pestaña
+        self.db_path = None        # Base de datos a la que pertenece la sesión
+        self.result = None         # ResultBuffer del último resultado con filas
+        self.last_query = None     # (sql, params, many, preview) del último resultado con filas
+        self.watcher = None        # QueryWatcher activo del modo vigilancia
+        self.busy = False          # True mientras hay una consulta en curso
+        self.last_duration = None  # Segundos que tardó la última ejecución en SQLite
+        self.last_changes = None   # Filas modificadas por la última ejecución
+        self.closed = False        # True cuando la pestaña se cerró
+
+    def ensure_connection(self, db_manager):
+        """
+        Garantiza que la pestaña tenga una sesión abierta sobre la base de datos activa.
+        Si la base de datos activa cambió o la sesión se cerró, abre una nueva.
+
+        Args:
+            db_manager: Registro de bases de datos de la aplicación
+
+        Returns:
+            Conexión de sesión de la pestaña
+        """
+        if self.connection and (
+            self.db_path != db_manager.db_path
+            or not db_manager.has_session(self.connection, self.db_path)
+        ):
+            self.release()
+        if self.connection:
+            db_manager.sync_session(self.connection, self.db_path)
+        else:
+            self.db_manager = db_manager
+            self.connection, self.db_path = db_manager.acquire_session()
+        return self.connection
+
+    def run(self, root, sql_command, on_success, on_error, params=None, many=False, preview=None):
+        """
+        Ejecuta el SQL en el hilo de trabajo de la pestaña.
+
+        Args:
+            root: Ventana principal de Tkinter
+            sql_command: Texto SQL a ejecutar
+            on_success: Función que recibe la tupla (rows, description) de run_sql
+            on_error: Función que recibe la excepción producida
+            params: Valores de los parámetros, o lista de filas de valores si many es True
+            many: True para ejecutar la sentencia una vez por fila con executemany
+            preview: TablePreview que sustituye a sql_command para leer solo el principio
+                     de los valores grandes
+        """
+        connection = self.connection
+        self.busy = True
+
+        def work():
+            # Se mide en el hilo de trabajo para no contar la espera hasta que la interfaz recoge el resultado
+            changes = connection.total_changes
+            started = time.perf_counter()
+            try:
+                if preview is not None:
+                    rows, _ = run_sql(connection, preview.sql)
+                    return preview.convert(rows)
+                return run_sql(connection, sql_command, params, many)
+            finally:
+                self.last_duration = time.perf_counter() - started
+                self.last_changes = connection.total_changes - changes
+
+        def finished(callback, value):
+            self.busy = False
+            if self.closed:
+                self.release()
+                return
+            callback(value)
+
+        run_in_background(
+            root,
+            work,
+            lambda result: finished(on_success, result),
+            lambda error: finished(on_error, error)
+        )
+
+    def cancel(self):
+        """
+        Interrumpe la consulta en curso de la pestaña, si la hay.
+
+        Returns:
+            True si había una consulta que interrumpir
+        """
+        if self.busy and self.connection:
+            self.connection.interrupt()
+            return True
+        return False
+
+    def close(self):
+        """
+        Cierra el contexto. Si hay una consulta en curso se interrumpe y la sesión
+        se libera cuando el hilo de trabajo termina.
+        """
+        self.closed = True
+        if self.watcher:
+            self.watcher.stop()
+        if self.busy:
+            self.cancel()
+        else:
+            self.release()
+
+    def release(self):
+        """
+        Devuelve la sesión de la pestaña al registro de bases de datos.
+        """
+        if self.connection and self.db_manager:
+            self.db_manager.release_session(self.connection, self.db_path)
+        self.connection = None
+        self.db_path = None
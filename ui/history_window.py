@@ -0,0 +1,143 @@
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+from db.history import ORDER_RECENT, ORDER_SLOWEST, ORDER_FREQUENT
+
+# Criterios de ordenación que se muestran en la ventana
+ORDER_LABELS = {
+    "Recientes": ORDER_RECENT,
+    "Más lentas": ORDER_SLOWEST,
+    "Más frecuentes": ORDER_FREQUENT,
+}
+
+HISTORY_COLUMNS = ("Fecha", "Duración", "Filas", "Estado", "Veces", "Base de Datos")
+
+# Milisegundos de espera tras la última tecla antes de buscar
+SEARCH_DELAY = 200
+
+
+class HistoryWindow:
+    """
+    Ventana de búsqueda en el historial de consultas.
+    Permite buscar por texto, ordenar por recientes, más lentas o más frecuentes
+    y abrir una sentencia en un editor nuevo con doble clic.
+    """
+
+    def __init__(self, parent, history, db_path, open_sql):
+        """
+        Crea la ventana y muestra las ejecuciones más recientes.
+
+        Args:
+            parent: Ventana principal de la aplicación
+            history: QueryHistory de la aplicación
+            db_path: Base de datos activa, para filtrar por ella (None si no hay conexión)
+            open_sql: Función que recibe un texto SQL y lo abre en un editor
+        """
+        self.history = history
+        self.db_path = db_path
+        self.open_sql = open_sql
+        self.search_job = None
+        self.statements = {}   # Identificador del elemento -> texto SQL
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Historial de Consultas")
+        self.dialog.geometry("900x450")
+        self.create_widgets()
+        self.search()
+
+    def create_widgets(self):
+        """
+        Crea la barra de búsqueda y la tabla del historial.
+        """
+        search_bar = ttk.Frame(self.dialog)
+        search_bar.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Label(search_bar, text="Buscar:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_bar, textvariable=self.search_var)
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.search_var.trace_add("write", lambda *args: self.schedule_search())
+
+        self.order_var = tk.StringVar(value="Recientes")
+        order_box = ttk.Combobox(
+            search_bar, textvariable=self.order_var, values=list(ORDER_LABELS), state="readonly", width=15
+        )
+        order_box.pack(side=tk.LEFT, padx=5)
+        order_box.bind("<<ComboboxSelected>>", lambda e: self.search())
+
+        self.current_db_var = tk.BooleanVar(value=self.db_path is not None)
+        ttk.Checkbutton(
+            search_bar, text="Solo la base de datos activa", variable=self.current_db_var, command=self.search,
+            state="normal" if self.db_path else "disabled"
+        ).pack(side=tk.LEFT, padx=5)
+        ttk.Button(search_bar, text="Borrar historial", command=self.clear).pack(side=tk.RIGHT)
+
+        table_frame = ttk.Frame(self.dialog)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=5)
+        self.table = ttk.Treeview(table_frame, columns=HISTORY_COLUMNS, show='tree headings')
+        self.table.heading("#0", text="SQL")
+        self.table.column("#0", width=350)
+        for column in HISTORY_COLUMNS:
+            self.table.heading(column, text=column)
+            self.table.column(column, width=80)
+        self.table.column("Fecha", width=130)
+        self.table.column("Base de Datos", width=200)
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.table.yview)
+        self.table.configure(yscrollcommand=scrollbar.set)
+        self.table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.table.bind("<Double-Button-1>", self.on_open)
+
+        self.status_label = ttk.Label(self.dialog, text="")
+        self.status_label.pack(fill=tk.X, padx=5, pady=5)
+        search_entry.focus_set()
+
+    def schedule_search(self):
+        """
+        Busca cuando se deja de escribir durante SEARCH_DELAY milisegundos.
+        """
+        if self.search_job:
+            self.dialog.after_cancel(self.search_job)
+        self.search_job = self.dialog.after(SEARCH_DELAY, self.search)
+
+    def search(self):
+        """
+        Muestra las ejecuciones que coinciden con la búsqueda, en el orden elegido.
+        """
+        self.search_job = None
+        started = time.perf_counter()
+        results = self.history.search(
+            self.search_var.get(),
+            self.db_path if self.current_db_var.get() else None,
+            ORDER_LABELS[self.order_var.get()]
+        )
+        elapsed = time.perf_counter() - started
+
+        self.table.delete(*self.table.get_children())
+        self.statements = {}
+        for sql, db_path, executed_at, duration, rows, status, executions in results:
+            item = self.table.insert("", tk.END, text=" ".join(sql.split())[:200], values=(
+                time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(executed_at)),
+                "" if duration is None else f"{duration * 1000:.1f} ms",
+                "" if rows is None else rows,
+                status,
+                executions,
+                db_path or "",
+            ))
+            self.statements[item] = sql
+        self.status_label.config(text=f"{len(results)} resultados en {elapsed * 1000:.1f} ms")
+
+    def on_open(self, event=None):
+        """
+        Abre la sentencia seleccionada en un editor nuevo.
+        """
+        selection = self.table.selection()
+        if selection:
+            self.open_sql(self.statements[selection[0]])
+
+    def clear(self):
+        """
+        Borra todo el historial tras pedir confirmación.
+        """
+        if messagebox.askyesno("Historial", "¿Borrar todo el historial de consultas?", parent=self.dialog):
+            self.history.clear()
+            self.search()
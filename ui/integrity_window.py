@@ -0,0 +1,191 @@
+import queue
+import tkinter as tk
+from tkinter import ttk
+from ui.background import run_in_background
+from utils.integrity import IntegrityChecker, CHECK_QUICK, CHECK_FULL
+
+FINDING_COLUMNS = ("Tipo", "Detalle")
+
+# Milisegundos entre dos lecturas de los hallazgos enviados por el hilo de trabajo
+POLL_INTERVAL = 100
+
+
+class IntegrityWindow:
+    """
+    Ventana de comprobación de integridad y de claves foráneas.
+
+    La comprobación se ejecuta tabla a tabla en un hilo de trabajo con una conexión de
+    solo lectura del pool. El progreso y los hallazgos llegan por una cola que se vacía
+    periódicamente, de modo que se ven mientras la comprobación avanza.
+    """
+
+    def __init__(self, parent, db_manager, db_path, log):
+        """
+        Crea la ventana.
+
+        Args:
+            parent: Ventana principal de la aplicación
+            db_manager: Registro de bases de datos de la aplicación
+            db_path: Base de datos a comprobar
+            log: Función que recibe un mensaje y su tipo para la consola
+        """
+        self.parent = parent
+        self.db_manager = db_manager
+        self.db_path = db_path
+        self.log = log
+        self.checker = None
+        self.running = False
+        self.cancel_requested = False
+        self.events = queue.Queue()
+        self.poll_job = None
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(f"Comprobar Integridad - {db_path}")
+        self.dialog.geometry("800x450")
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+        self.create_widgets()
+
+    def create_widgets(self):
+        """
+        Crea las opciones, la tabla de hallazgos y la barra de progreso.
+        """
+        options = ttk.Frame(self.dialog)
+        options.pack(fill=tk.X, padx=10, pady=(10, 5))
+        self.full_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            options, text="Comprobación completa (integrity_check, más lenta)", variable=self.full_var
+        ).pack(side=tk.LEFT)
+        self.cancel_button = ttk.Button(options, text="Cancelar", command=self.cancel, state="disabled")
+        self.cancel_button.pack(side=tk.RIGHT)
+        self.start_button = ttk.Button(options, text="Comprobar", command=self.start)
+        self.start_button.pack(side=tk.RIGHT, padx=5)
+
+        table_frame = ttk.Frame(self.dialog)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10)
+        self.findings_table = ttk.Treeview(table_frame, columns=FINDING_COLUMNS, show='tree headings')
+        self.findings_table.heading("#0", text="Tabla")
+        self.findings_table.column("#0", width=160)
+        self.findings_table.heading("Tipo", text="Tipo")
+        self.findings_table.column("Tipo", width=100)
+        self.findings_table.heading("Detalle", text="Detalle")
+        self.findings_table.column("Detalle", width=500)
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.findings_table.yview)
+        self.findings_table.configure(yscrollcommand=scrollbar.set)
+        self.findings_table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        status_bar = ttk.Frame(self.dialog)
+        status_bar.pack(fill=tk.X, padx=10, pady=(5, 10))
+        self.progress = ttk.Progressbar(status_bar, mode='determinate', length=200)
+        self.progress.pack(side=tk.LEFT)
+        self.status_label = ttk.Label(status_bar, text="")
+        self.status_label.pack(side=tk.LEFT, padx=5)
+
+    def start(self):
+        """
+        Inicia la comprobación en segundo plano.
+        """
+        if self.running:
+            return
+        self.running = True
+        self.cancel_requested = False
+        check = CHECK_FULL if self.full_var.get() else CHECK_QUICK
+        self.findings_table.delete(*self.findings_table.get_children())
+        self.progress.config(value=0, maximum=1)
+        self.start_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.status_label.config(text="Preparando...")
+        events = self.events = queue.Queue()
+
+        def work():
+            with self.db_manager.read_connection(self.db_path) as connection:
+                self.checker = IntegrityChecker(connection, check)
+                if self.cancel_requested:
+                    return False
+                return self.checker.run(
+                    lambda *finding: events.put(("finding", finding)),
+                    lambda *position: events.put(("progress", position))
+                )
+
+        self.log(f"Comprobación de integridad ({check}) de {self.db_path}: en curso...", 'info')
+        self.poll_job = self.dialog.after(POLL_INTERVAL, self.poll)
+        run_in_background(self.parent, work, self.on_finished, self.on_error)
+
+    def poll(self):
+        """
+        Muestra el progreso y los hallazgos enviados desde el hilo de trabajo.
+        """
+        self.poll_job = None
+        if not self.dialog.winfo_exists():
+            return
+        self._drain()
+        self.poll_job = self.dialog.after(POLL_INTERVAL, self.poll)
+
+    def _drain(self):
+        """Vacía la cola de eventos del hilo de trabajo."""
+        while True:
+            try:
+                kind, value = self.events.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "finding":
+                table, finding_type, message = value
+                self.findings_table.insert("", tk.END, text=table, values=(finding_type, message))
+            else:
+                index, total, table = value
+                self.progress.config(value=index, maximum=max(total, 1))
+                if table is not None:
+                    self.status_label.config(text=f"Tabla {index + 1} de {total}: {table}")
+
+    def on_finished(self, completed):
+        """
+        Muestra el resumen al terminar o cancelar la comprobación.
+
+        Args:
+            completed: False si la comprobación se canceló
+        """
+        findings = self.checker.findings if self.checker else 0
+        message = (f"Completada: {findings} problemas encontrados" if completed
+                   else f"Cancelada: {findings} problemas encontrados hasta ahora")
+        self._finish(message)
+        self.log(f"Comprobación de integridad de {self.db_path}: {message.lower()}",
+                 'success' if completed and not findings else 'info')
+
+    def on_error(self, error):
+        """
+        Muestra el error de la comprobación.
+
+        Args:
+            error: Excepción producida
+        """
+        self._finish(f"Error: {str(error)}")
+        self.log(f"Comprobación de integridad de {self.db_path}: {str(error)}", 'error')
+
+    def cancel(self):
+        """
+        Cancela la comprobación en curso.
+        """
+        self.cancel_requested = True
+        if self.running and self.checker:
+            self.checker.cancel()
+
+    def close(self):
+        """
+        Cierra la ventana, cancelando la comprobación en curso si la hay.
+        """
+        self.cancel()
+        self.dialog.destroy()
+
+    def _finish(self, message):
+        """Detiene la lectura de eventos y restaura los botones."""
+        self.running = False
+        self.checker = None
+        if self.poll_job:
+            self.dialog.after_cancel(self.poll_job)
+            self.poll_job = None
+        if not self.dialog.winfo_exists():
+            return
+        self._drain()
+        self.start_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+        self.status_label.config(text=message)
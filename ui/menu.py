@@ -28,6 +28,12 @@ class Menu:
         self.new_editor_command = None
         self.open_sql_command = None
         self.save_sql_command = None
+        # Etiquetas de entradas del menú Herramientas que requieren conexión
+        self.tool_entries = ["Generar ERD", "Exportar Base de Datos"]
+        # Etiquetas de entradas del menú Herramientas que escriben en la base de datos
+        self.write_entries = []
+        # Etiquetas de entradas del menú Base de Datos que solo valen para copias en memoria
+        self.memory_entries = []
 
     def create_menu(self):
         """
@@ -43,13 +49,13 @@ class Menu:
         self.menu_bar.add_cascade(label="Archivo", menu=self.file_menu)
 
         # Configurar menú Base de Datos
-        db_menu = tk.Menu(self.menu_bar, tearoff=0)
-        self.menu_bar.add_cascade(label="Base de Datos", menu=db_menu)
-        db_menu.add_command(label="Conectar Base de Datos", command=self.connect_db)
-        db_menu.add_command(label="Crear Nueva Base de Datos", command=self.create_new_db)
-        db_menu.add_command(label="Desconectar Base de Datos", command=self.disconnect_db) 
-        db_menu.add_separator()
-        db_menu.add_command(label="Salir", command=self.root.quit)
+        self.db_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="Base de Datos", menu=self.db_menu)
+        self.db_menu.add_command(label="Conectar Base de Datos", command=self.connect_db)
+        self.db_menu.add_command(label="Crear Nueva Base de Datos", command=self.create_new_db)
+        self.db_menu.add_command(label="Desconectar Base de Datos", command=self.disconnect_db) 
+        self.db_menu.add_separator()
+        self.db_menu.add_command(label="Salir", command=self.root.quit)
 
         # Configurar menú Herramientas
         self.tools_menu = tk.Menu(self.menu_bar, tearoff=0)
@@ -107,9 +113,131 @@ class Menu:
         )
 
         # Configurar menú de Ayuda
-        help_menu = tk.Menu(self.menu_bar, tearoff=0)
-        self.menu_bar.add_cascade(label="Ayuda", menu=help_menu)
-        help_menu.add_command(label="Acerca de", command=self.show_about)
+        self.help_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="Ayuda", menu=self.help_menu)
+        self.help_menu.add_command(label="Acerca de", command=self.show_about)
+
+    def add_tool(self, label, command, writes=False):
+        """
+        Añade una herramienta al menú Herramientas, deshabilitada hasta que haya conexión.
+
+        Args:
+            label: Etiqueta de la entrada del menú
+            command: Función que ejecuta la herramienta
+            writes: True si la herramienta escribe en la base de datos activa
+        """
+        self.tools_menu.add_command(label=label, command=command, state="disabled")
+        self.tool_entries.append(label)
+        if writes:
+            self.write_entries.append(label)
+
+    def add_read_only_menu(self, open_read_only, open_immutable):
+        """
+        Añade al menú Base de Datos las opciones para abrir bases de datos sin escritura.
+
+        Args:
+            open_read_only: Función para abrir una base de datos en solo lectura
+            open_immutable: Función para abrir una base de datos como snapshot inmutable
+        """
+        position = self.db_menu.index("Conectar Base de Datos") + 1
+        self.db_menu.insert_command(position, label="Abrir Solo Lectura...", command=open_read_only)
+        self.db_menu.insert_command(position + 1, label="Abrir Snapshot Inmutable...", command=open_immutable)
+
+    def add_memory_menu(self, open_in_memory, write_back, save_copy_as):
+        """
+        Añade al menú Base de Datos las opciones para trabajar con una copia en memoria.
+
+        Args:
+            open_in_memory: Función para abrir una base de datos como copia en memoria
+            write_back: Función que escribe la copia en memoria en su archivo original
+            save_copy_as: Función que guarda la copia en memoria en otro archivo
+        """
+        position = self.db_menu.index("Abrir Snapshot Inmutable...") + 1
+        self.db_menu.insert_command(position, label="Abrir en Memoria...", command=open_in_memory)
+        self.memory_entries = ["Escribir de Vuelta al Archivo", "Guardar Copia en Memoria Como..."]
+        self.db_menu.insert_command(
+            position + 1, label=self.memory_entries[0], command=write_back, state="disabled"
+        )
+        self.db_menu.insert_command(
+            position + 2, label=self.memory_entries[1], command=save_copy_as, state="disabled"
+        )
+
+    def add_database_registry_menu(self, attach_command):
+        """
+        Añade al menú Base de Datos el submenú de bases de datos abiertas
+        y la opción para adjuntar otra base de datos a la activa.
+
+        Args:
+            attach_command: Función para adjuntar una base de datos con ATTACH
+        """
+        self.active_db_var = tk.StringVar()
+        self.open_dbs_menu = tk.Menu(self.db_menu, tearoff=0)
+        position = self.db_menu.index("Desconectar Base de Datos") + 1
+        self.db_menu.insert_cascade(position, label="Bases de Datos Abiertas", menu=self.open_dbs_menu)
+        self.db_menu.insert_command(position + 1, label="Adjuntar Base de Datos...", command=attach_command)
+
+    def update_open_databases(self, db_paths, active_path, switch_command):
+        """
+        Reconstruye el submenú de bases de datos abiertas.
+
+        Args:
+            db_paths: Rutas de las bases de datos abiertas
+            active_path: Ruta de la base de datos activa
+            switch_command: Función que recibe la ruta de la base de datos a activar
+        """
+        self.open_dbs_menu.delete(0, "end")
+        self.active_db_var.set(active_path or "")
+        for db_path in db_paths:
+            self.open_dbs_menu.add_radiobutton(
+                label=db_path,
+                value=db_path,
+                variable=self.active_db_var,
+                command=lambda p=db_path: switch_command(p)
+            )
+
+    def add_profile_menu(self, profiles, current_profile, change_profile_command):
+        """
+        Añade al menú Base de Datos un submenú para elegir el perfil de ajuste de la conexión.
+
+        Args:
+            profiles: Nombres de los perfiles disponibles
+            current_profile: Perfil seleccionado inicialmente
+            change_profile_command: Función que recibe el nombre del perfil elegido
+        """
+        self.profile_var = tk.StringVar(value=current_profile)
+        profile_menu = tk.Menu(self.db_menu, tearoff=0)
+        for profile in profiles:
+            profile_menu.add_radiobutton(
+                label=profile,
+                value=profile,
+                variable=self.profile_var,
+                command=lambda p=profile: change_profile_command(p)
+            )
+        # Insertar el submenú antes del separador y la opción Salir
+        self.db_menu.insert_cascade(self.db_menu.index("end") - 1, label="Perfil de Conexión", menu=profile_menu)
+
+    def add_history_menu(self, show_history_command):
+        """
+        Añade al menú Editor la opción para abrir el historial de consultas.
+
+        Args:
+            show_history_command: Función que muestra la ventana del historial
+        """
+        self.editor_menu.add_separator()
+        self.editor_menu.add_command(
+            label="Historial de Consultas",
+            command=show_history_command,
+            accelerator="Ctrl+H"
+        )
+
+    def add_diagnostics_menu(self, show_diagnostics_command):
+        """
+        Añade al menú Ayuda la ventana de diagnóstico del rendimiento.
+
+        Args:
+            show_diagnostics_command: Función que muestra la ventana de diagnóstico
+        """
+        self.help_menu.insert_command(0, label="Diagnóstico", command=show_diagnostics_command)
 
     def show_about(self):
         """
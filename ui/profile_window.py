@@ -0,0 +1,111 @@
+import tkinter as tk
+from tkinter import ttk
+
+# Columnas de la tabla de estadísticas
+STAT_COLUMNS = ("Tipo", "Filas", "Nulos", "Distintos", "Mín", "Máx", "Media", "P25", "P50", "P75", "P95")
+
+
+def _format(value):
+    """Formatea un valor para mostrarlo en la tabla de estadísticas."""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    if isinstance(value, bytes):
+        return f"<BLOB {len(value)} bytes>"
+    text = str(value)
+    return text if len(text) <= 40 else text[:37] + "..."
+
+
+class ColumnProfileWindow:
+    """
+    Ventana que muestra el perfil de las columnas de un resultado:
+    nulos, distintos, mínimo, máximo, media, percentiles e histograma.
+    """
+
+    def __init__(self, parent, profiles, title="Perfil de Columnas"):
+        """
+        Crea la ventana.
+
+        Args:
+            parent: Ventana padre de la aplicación
+            profiles: Lista de perfiles devuelta por profile_columns
+            title: Título de la ventana
+        """
+        self.profiles = profiles
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(title)
+        self.dialog.geometry("900x450")
+        self.create_widgets()
+
+    def create_widgets(self):
+        """
+        Crea la tabla de estadísticas y el lienzo del histograma.
+        """
+        paned = ttk.PanedWindow(self.dialog, orient=tk.VERTICAL)
+        paned.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        # Tabla de estadísticas, una fila por columna del resultado
+        table_frame = ttk.Frame(paned)
+        paned.add(table_frame, weight=2)
+        self.stats_table = ttk.Treeview(table_frame, columns=STAT_COLUMNS, show='tree headings')
+        self.stats_table.heading("#0", text="Columna")
+        self.stats_table.column("#0", width=140)
+        for column in STAT_COLUMNS:
+            self.stats_table.heading(column, text=column)
+            self.stats_table.column(column, width=70, anchor=tk.E)
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.stats_table.yview)
+        self.stats_table.configure(yscrollcommand=scrollbar.set)
+        self.stats_table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        for position, profile in enumerate(self.profiles):
+            percentiles = profile['percentiles']
+            self.stats_table.insert("", tk.END, iid=str(position), text=profile['name'], values=(
+                profile['kind'],
+                profile['rows'],
+                profile['nulls'],
+                _format(profile['distinct']),
+                _format(profile['min']),
+                _format(profile['max']),
+                _format(profile['mean']),
+                *(_format(percentiles.get(p)) for p in (25, 50, 75, 95)),
+            ))
+        self.stats_table.bind("<<TreeviewSelect>>", self.on_select)
+
+        # Histograma de la columna seleccionada
+        histogram_frame = ttk.LabelFrame(paned, text="Histograma")
+        paned.add(histogram_frame, weight=1)
+        self.canvas = tk.Canvas(histogram_frame, background='white', height=150)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", lambda e: self.on_select())
+
+    def on_select(self, event=None):
+        """
+        Dibuja el histograma de la columna seleccionada.
+        """
+        self.canvas.delete("all")
+        selection = self.stats_table.selection()
+        if not selection:
+            return
+        profile = self.profiles[int(selection[0])]
+        if not profile['histogram']:
+            self.canvas.create_text(10, 10, anchor=tk.NW, text="Sin histograma (columna no numérica)")
+            return
+
+        counts, edges = profile['histogram']
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        margin = 20
+        bar_width = (width - 2 * margin) / len(counts)
+        highest = max(counts) or 1
+        for position, count in enumerate(counts):
+            x0 = margin + position * bar_width
+            bar_height = (height - 2 * margin) * count / highest
+            self.canvas.create_rectangle(
+                x0, height - margin - bar_height, x0 + bar_width - 1, height - margin,
+                fill='#4a7ebb', outline=''
+            )
+        self.canvas.create_text(margin, height - margin + 2, anchor=tk.NW, text=_format(edges[0]))
+        self.canvas.create_text(width - margin, height - margin + 2, anchor=tk.NE, text=_format(edges[-1]))
+        self.canvas.create_text(margin, margin - 2, anchor=tk.SW, text=f"máx. {highest}")
@@ -0,0 +1,174 @@
+import tkinter as tk
+from tkinter import ttk
+from ui.sql_executor import cell_text, display_results
+
+# Milisegundos de espera tras la última tecla antes de aplicar el filtro
+FILTER_DELAY = 200
+
+
+class ResultsGrid:
+    """
+    Ordenación y filtrado en el cliente de una tabla de resultados.
+
+    Al hacer clic en un encabezado se ordena por esa columna y la caja de filtro
+    muestra solo las filas que contienen el texto escrito. Ambas operaciones trabajan
+    sobre los arreglos de índices del ResultBuffer y reordenan los elementos ya
+    existentes del Treeview con una sola llamada, sin volver a consultar SQLite.
+    Un doble clic sobre una celda abre su valor completo.
+    """
+
+    def __init__(self, parent, results_table, open_value=None, toggle_watch=None):
+        """
+        Crea la barra de filtro sobre la tabla de resultados.
+
+        Args:
+            parent: Frame que contiene la tabla de resultados
+            results_table: Treeview de resultados
+            open_value: Función (resultado, fila, columna) que abre el valor de una celda
+            toggle_watch: Función que recibe True o False al activar o desactivar el modo vigilancia
+        """
+        self.results_table = results_table
+        self.open_value = open_value
+        self.result = None
+        self.filter_job = None
+
+        filter_bar = ttk.Frame(parent)
+        filter_bar.pack(side=tk.TOP, fill=tk.X, before=results_table.master)
+        ttk.Label(filter_bar, text="Filtrar:").pack(side=tk.LEFT, padx=(5, 2))
+        self.filter_var = tk.StringVar()
+        ttk.Entry(filter_bar, textvariable=self.filter_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        self.watch_var = tk.BooleanVar(value=False)
+        if toggle_watch:
+            ttk.Checkbutton(
+                filter_bar, text="Vigilar cambios", variable=self.watch_var,
+                command=lambda: toggle_watch(self.watch_var.get())
+            ).pack(side=tk.RIGHT, padx=5)
+        self.status_label = ttk.Label(filter_bar, text="")
+        self.status_label.pack(side=tk.RIGHT, padx=5)
+        self.filter_var.trace_add("write", lambda *args: self.schedule_filter())
+        results_table.bind("<Double-Button-1>", self.on_double_click, add="+")
+
+    def reset(self):
+        """
+        Vuelve a colocar todas las filas del resultado anterior en la tabla, para que
+        puedan borrarse juntas antes de mostrar un resultado nuevo.
+        """
+        if self.result is not None:
+            self.results_table.set_children("", *map(str, range(self.result.row_count)))
+        self.result = None
+
+    def attach(self, result):
+        """
+        Asocia la tabla a un nuevo resultado y configura los encabezados para ordenar.
+
+        Args:
+            result: ResultBuffer mostrado en la tabla
+        """
+        self.result = result
+        for position, column in enumerate(result.columns):
+            self.results_table.heading(column, text=column, command=lambda p=position: self.sort_by(p))
+        if self.filter_var.get():
+            self.apply_filter()
+        else:
+            self.status_label.config(text=f"{result.row_count} filas")
+
+    def apply_diff(self, result):
+        """
+        Sustituye el resultado mostrado por uno nuevo de la misma consulta modificando solo
+        las filas que cambiaron: como el identificador de cada elemento es el índice de su
+        fila, se actualizan las posiciones cuyo contenido es distinto y se añaden o eliminan
+        las del final. Se conservan el orden y el filtro elegidos.
+
+        Args:
+            result: Nuevo ResultBuffer
+
+        Returns:
+            Número de filas de la tabla que se modificaron, añadieron o eliminaron
+        """
+        previous = self.result
+        if previous is None or previous.columns != result.columns:
+            self.reset()
+            display_results(result.rows, [(column,) for column in result.columns], self.results_table)
+            self.attach(result)
+            return result.row_count
+
+        # Volver a colocar todas las filas para poder actualizarlas por su índice
+        self.results_table.set_children("", *map(str, range(previous.row_count)))
+        old_rows, new_rows = previous.rows, result.rows
+        changed = 0
+        for position in range(min(len(old_rows), len(new_rows))):
+            if old_rows[position] != new_rows[position]:
+                self.results_table.item(str(position), values=[cell_text(value) for value in new_rows[position]])
+                changed += 1
+        if len(new_rows) > len(old_rows):
+            for position in range(len(old_rows), len(new_rows)):
+                values = [cell_text(value) for value in new_rows[position]]
+                self.results_table.insert("", tk.END, iid=str(position), values=values)
+        elif len(new_rows) < len(old_rows):
+            self.results_table.delete(*map(str, range(len(new_rows), len(old_rows))))
+
+        result.filter_text = self.filter_var.get()
+        if previous.sort_column is not None:
+            result.sort(previous.sort_column, previous.sort_descending)
+        self.result = result
+        self.refresh()
+        return changed + abs(len(new_rows) - len(old_rows))
+
+    def sort_by(self, position):
+        """
+        Ordena por una columna; un segundo clic sobre la misma columna invierte el orden.
+
+        Args:
+            position: Posición de la columna
+        """
+        if self.result is None:
+            return
+        descending = self.result.sort_column == position and not self.result.sort_descending
+        self.result.sort(position, descending)
+        for index, column in enumerate(self.result.columns):
+            arrow = (" ▼" if descending else " ▲") if index == position else ""
+            self.results_table.heading(column, text=column + arrow)
+        self.refresh()
+
+    def schedule_filter(self):
+        """
+        Aplica el filtro cuando se deja de escribir durante FILTER_DELAY milisegundos.
+        """
+        if self.filter_job:
+            self.results_table.after_cancel(self.filter_job)
+        self.filter_job = self.results_table.after(FILTER_DELAY, self.apply_filter)
+
+    def apply_filter(self):
+        """
+        Aplica el texto de la caja de filtro al resultado.
+        """
+        self.filter_job = None
+        if self.result is None:
+            return
+        self.result.filter_text = self.filter_var.get()
+        self.refresh()
+
+    def refresh(self):
+        """
+        Muestra las filas visibles en el orden actual con una sola llamada a set_children.
+        Las filas que no pasan el filtro se desvinculan, pero no se eliminan.
+        """
+        visible = self.result.visible_rows()
+        self.results_table.set_children("", *map(str, visible))
+        if len(visible) == self.result.row_count:
+            self.status_label.config(text=f"{self.result.row_count} filas")
+        else:
+            self.status_label.config(text=f"{len(visible)} de {self.result.row_count} filas")
+
+    def on_double_click(self, event):
+        """
+        Abre el valor de la celda sobre la que se hizo doble clic.
+        """
+        if self.result is None or self.open_value is None:
+            return
+        if self.results_table.identify_region(event.x, event.y) != "cell":
+            return
+        item = self.results_table.identify_row(event.y)
+        column = self.results_table.identify_column(event.x)  # '#1', '#2'...
+        if item and column:
+            self.open_value(self.result, int(item), int(column[1:]) - 1)
@@ -1,78 +1,143 @@
-import sqlite3
+import re
 import tkinter as tk
 from tkinter import messagebox
+from utils.instrumentation import timed
 
-def on_table_select(event, tables_listbox, sql_text, execute_sql, ui_builder):
+# Sentencias que no modifican la base de datos
+READ_ONLY_KEYWORDS = ("select", "with", "explain", "pragma", "values")
+
+# Caracteres de un texto que se muestran en una celda de la tabla de resultados
+CELL_TEXT_LENGTH = 256
+
+# Comentarios SQL al inicio de una sentencia
+LEADING_COMMENTS = re.compile(r"^(\s+|--[^\n]*(\n|$)|/\*.*?\*/)*", re.DOTALL)
+
+def is_read_only_sql(sql_command):
     """
-    Maneja la selección de una tabla desde la lista de tablas para ejecutar una consulta SELECT *.
+    Indica si una sentencia SQL es de solo lectura según su primera palabra clave.
 
     Parameters:
-    - event: El evento de selección de la tabla.
-    - tables_listbox: Lista de tablas disponibles.
-    - sql_text: Área de texto para la consulta SQL.
-    - execute_sql: Función para ejecutar la consulta SQL.
-    - ui_builder: Objeto encargado de la interfaz de usuario para mostrar mensajes.
-
-    Modifica la consulta SQL para obtener todos los registros de la tabla seleccionada.
-    Utiliza la consola para mostrar la consulta que se está ejecutando.
+    - sql_command: Texto SQL a evaluar.
+
+    Es una comprobación orientativa para la interfaz; la conexión de solo lectura
+    de SQLite sigue siendo la que garantiza que no se escriba en el archivo.
     """
-    selected_index = tables_listbox.curselection()  # Obtiene la tabla seleccionada
-    if selected_index:
-        table_name = tables_listbox.get(selected_index)  # Nombre de la tabla seleccionada
-        sql_command = f"SELECT * FROM {table_name}"  # Comando SQL para seleccionar todos los registros de la tabla
-        ui_builder.append_to_console(f"Executing: {sql_command}", 'info')  # Muestra el comando en la consola
-        execute_sql(sql_command)  # Ejecuta la consulta SQL
-
-def execute_sql(db_connection, sql_text, results_table, update_tables_list, ui_builder, custom_sql=None):
+    statement = LEADING_COMMENTS.sub("", sql_command, count=1)
+    first_word = statement.split(None, 1)[0].lower() if statement.strip() else ""
+    return first_word in READ_ONLY_KEYWORDS
+
+def validate_sql_command(db_connection, sql_command, ui_builder, read_only=False):
     """
-    Ejecuta una consulta SQL en la base de datos y maneja el resultado.
+    Comprueba que haya SQL y conexión antes de ejecutar, mostrando el motivo si no es así.
 
     Parameters:
     - db_connection: Conexión a la base de datos SQLite.
-    - sql_text: Área de texto donde se encuentra la consulta SQL.
-    - results_table: Tabla en la interfaz para mostrar los resultados.
-    - update_tables_list: Función para actualizar la lista de tablas disponibles.
+    - sql_command: Texto SQL a ejecutar.
     - ui_builder: Objeto para mostrar mensajes en la consola de la interfaz.
-    - custom_sql (opcional): Consulta SQL personalizada para ejecutar.
+    - read_only (opcional): Si la conexión es de solo lectura, se rechazan las sentencias de escritura.
 
-    Esta función ejecuta el SQL ingresado, maneja la ejecución de múltiples comandos SQL,
-    muestra los resultados si es una consulta SELECT, o un mensaje de éxito si no lo es.
+    Devuelve True si el SQL puede ejecutarse.
     """
-    sql_command = custom_sql if custom_sql else sql_text.get("1.0", tk.END).strip()  # Obtiene el SQL, o usa el proporcionado
-    
     # Verifica que el SQL no esté vacío y que haya conexión a la base de datos
     if not sql_command or not db_connection:
         error_msg = "Please connect to a database and enter an SQL command."
         ui_builder.append_to_console(error_msg, 'error')  # Muestra mensaje de error en la consola
         messagebox.showwarning("Warning", error_msg)  # Muestra advertencia al usuario
-        return
-        
-    try:
-        cursor = db_connection.cursor()  # Crea un cursor para ejecutar la consulta
-        
-        # Si hay múltiples comandos SQL, usa executescript()
-        if ";" in sql_command:
-            cursor.executescript(sql_command)
-        else:
-            cursor.execute(sql_command)  # Ejecuta el comando SQL
-        
-        db_connection.commit()  # Confirma los cambios en la base de datos
-        
-        if sql_command.lower().startswith("select"):  # Si es una consulta SELECT
-            rows = cursor.fetchall()  # Obtiene todas las filas del resultado
-            display_results(rows, cursor.description, results_table)  # Muestra los resultados en la interfaz
-            ui_builder.append_to_console(f" {sql_command}. Query executed successfully. {len(rows)} rows returned.", 'success')
-        else:
-            success_msg = "SQL command executed successfully."
-            ui_builder.append_to_console(success_msg, 'success')  # Muestra el mensaje de éxito
-            messagebox.showinfo("Success", success_msg)  # Muestra información de éxito al usuario
-            update_tables_list(db_connection)  # Actualiza la lista de tablas disponibles
-            
-    except sqlite3.Error as e:
-        error_msg = str(e)  # En caso de error en SQL, se captura y muestra el mensaje
-        ui_builder.append_to_console(f"Error: {error_msg}", 'error')  # Muestra el error en la consola
-        messagebox.showerror("SQL Error", error_msg)  # Muestra el mensaje de error al usuario
+        return False
+
+    # Rechaza sentencias de escritura si la base de datos se abrió sin permisos de escritura
+    if read_only and not all(is_read_only_sql(part) for part in sql_command.split(";") if part.strip()):
+        error_msg = "La base de datos está abierta en modo solo lectura."
+        ui_builder.append_to_console(error_msg, 'error')
+        messagebox.showwarning("Solo Lectura", error_msg)
+        return False
+    return True
+
+def run_sql(db_connection, sql_command, params=None, many=False):
+    """
+    Ejecuta el SQL en la conexión indicada sin tocar la interfaz, por lo que puede
+    llamarse desde un hilo de trabajo.
+
+    Parameters:
+    - db_connection: Conexión a la base de datos SQLite.
+    - sql_command: Texto SQL a ejecutar.
+    - params (opcional): Valores de los parámetros de la sentencia (tupla o diccionario),
+      o una lista de ellos si many es True.
+    - many (opcional): Si es True, la sentencia se ejecuta una vez por cada fila de
+      params con executemany, reutilizando la sentencia preparada.
+
+    Devuelve una tupla (rows, description); ambos son None si la sentencia no devuelve filas.
+    """
+    cursor = db_connection.cursor()  # Crea un cursor para ejecutar la consulta
+    statement = sql_command.strip().rstrip(";")  # El punto y coma final no indica varios comandos
+
+    if many:
+        cursor.executemany(statement, params)  # Una ejecución por cada fila de parámetros
+    elif params is not None:
+        cursor.execute(statement, params)  # Los parámetros solo admiten una sentencia
+    # Si hay múltiples comandos SQL, usa executescript()
+    elif ";" in statement:
+        cursor.executescript(sql_command)
+    else:
+        cursor.execute(statement)  # Ejecuta el comando SQL
+
+    if cursor.description:  # La sentencia devuelve filas (SELECT, WITH, PRAGMA...)
+        rows = cursor.fetchall()  # Obtiene todas las filas del resultado
+        db_connection.commit()
+        return rows, cursor.description
+
+    db_connection.commit()  # Confirma los cambios en la base de datos
+    return None, None
+
+def show_sql_result(sql_command, rows, description, results_table, refresh_tables, ui_builder):
+    """
+    Muestra en la interfaz el resultado devuelto por run_sql.
+
+    Parameters:
+    - sql_command: Texto SQL ejecutado.
+    - rows: Filas devueltas, o None si la sentencia no devuelve filas.
+    - description: Descripción de las columnas del resultado.
+    - results_table: Tabla en la interfaz para mostrar los resultados.
+    - refresh_tables: Función sin argumentos para actualizar la lista de tablas.
+    - ui_builder: Objeto para mostrar mensajes en la consola de la interfaz.
+    """
+    if description:  # Si es una consulta que devuelve filas
+        display_results(rows, description, results_table)  # Muestra los resultados en la interfaz
+        ui_builder.append_to_console(f" {sql_command}. Query executed successfully. {len(rows)} rows returned.", 'success')
+    else:
+        success_msg = "SQL command executed successfully."
+        ui_builder.append_to_console(success_msg, 'success')  # Muestra el mensaje de éxito
+        messagebox.showinfo("Success", success_msg)  # Muestra información de éxito al usuario
+        refresh_tables()  # Actualiza la lista de tablas disponibles
+
+def show_sql_error(error, ui_builder):
+    """
+    Muestra en la consola y en un cuadro de diálogo un error de SQL.
+
+    Parameters:
+    - error: Excepción de sqlite3 capturada.
+    - ui_builder: Objeto para mostrar mensajes en la consola de la interfaz.
+    """
+    error_msg = str(error)  # En caso de error en SQL, se captura y muestra el mensaje
+    ui_builder.append_to_console(f"Error: {error_msg}", 'error')  # Muestra el error en la consola
+    messagebox.showerror("SQL Error", error_msg)  # Muestra el mensaje de error al usuario
+
+def cell_text(value):
+    """
+    Devuelve el texto de una celda de la tabla de resultados. Los BLOB se muestran como
+    un marcador con su tamaño y los textos largos se recortan, para no convertir ni
+    dibujar valores de varios megabytes.
+
+    Parameters:
+    - value: Valor de la celda.
+    """
+    if isinstance(value, bytes):
+        return f"<BLOB {len(value)} bytes>"
+    if isinstance(value, str) and len(value) > CELL_TEXT_LENGTH:
+        return value[:CELL_TEXT_LENGTH] + "…"
+    return value
 
+@timed()
 def display_results(rows, description, results_table):
     """
     Muestra los resultados de una consulta SELECT en la interfaz gráfica.
@@ -83,13 +148,14 @@ def display_results(rows, description, results_table):
     - results_table: Tabla en la interfaz donde se mostrarán los resultados.
 
     Esta función configura las columnas de la tabla de resultados y luego inserta
-    los datos de las filas obtenidas.
+    los datos de las filas obtenidas, usando como identificador de cada elemento
+    el índice de su fila. Los valores grandes se muestran recortados (ver cell_text).
     """
-    for row in results_table.get_children():  # Elimina cualquier dato previo en la tabla
-        results_table.delete(row)
+    results_table.delete(*results_table.get_children())  # Elimina cualquier dato previo en la tabla
     columns = [desc[0] for desc in description]  # Extrae los nombres de las columnas
     results_table.config(columns=columns)  # Configura las columnas en la tabla
     for col in columns:
         results_table.heading(col, text=col)  # Define los encabezados de las columnas
-    for row in rows:
-        results_table.insert("", tk.END, values=row)  # Inserta las filas de resultados
+    for position, row in enumerate(rows):
+        # El identificador de cada elemento es el índice de la fila, para poder reordenar sin recrearlos
+        results_table.insert("", tk.END, iid=str(position), values=[cell_text(value) for value in row])  # Inserta las filas de resultados
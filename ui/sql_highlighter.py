@@ -0,0 +1,227 @@
+from collections import defaultdict
+from utils.sql_lexer import STATE_NORMAL, TOKEN_TYPES, tokenize_line
+
+# Colores de cada tipo de token
+TOKEN_STYLES = {
+    'keyword': {'foreground': '#0000cc'},
+    'string': {'foreground': '#a31515'},
+    'comment': {'foreground': '#008000'},
+    'number': {'foreground': '#098658'},
+    'identifier': {'foreground': '#795e26'},
+    'parameter': {'foreground': '#af00db'},
+}
+
+# Líneas que se analizan en cada pasada en tiempo ocioso
+LINES_PER_SLICE = 400
+
+# Comandos del widget de texto que modifican su contenido
+EDIT_COMMANDS = ('insert', 'delete', 'replace')
+
+
+class SQLHighlighter:
+    """
+    Resaltado de sintaxis SQL incremental para un widget de texto.
+
+    Guarda el estado del analizador al inicio de cada línea e intercepta las
+    modificaciones del widget para volver a analizar solo las líneas afectadas,
+    hasta que el estado de una línea coincide con el que ya tenía. Los tags se
+    aplican por lotes en tiempo ocioso, de modo que la latencia al escribir no
+    depende del tamaño del archivo.
+    """
+
+    def __init__(self, text_widget):
+        """
+        Conecta el resaltado a un widget de texto.
+
+        Args:
+            text_widget: Widget de texto (ScrolledText) del editor SQL
+        """
+        self.text_widget = text_widget
+        self.tk = text_widget.tk
+        for token_type, style in TOKEN_STYLES.items():
+            text_widget.tag_configure(token_type, **style)
+
+        self.widget_name = str(text_widget)
+        self.original_command = self.widget_name
+
+        # line_states[i] es el estado del analizador al inicio de la línea i + 1
+        line_count = self._line_of('end-1c')
+        self.line_states = [STATE_NORMAL] + [None] * (line_count - 1)
+        # line_parameters[i] son los tokens de parámetro (?, :nombre...) de la línea i + 1
+        self.line_parameters = [()] * line_count
+        self.dirty_start = 1          # Primera línea pendiente de analizar
+        self.dirty_end = line_count   # Última línea modificada pendiente
+        self.visible_done = None      # Rango visible ya resaltado de forma provisional
+        self.scheduled = None
+
+        # Interceptar los comandos Tcl del widget para detectar las modificaciones
+        self.original_command = self.widget_name + "_orig"
+        self.tk.call("rename", self.widget_name, self.original_command)
+        self.tk.createcommand(self.widget_name, self._dispatch)
+        self._schedule()
+
+    def close(self):
+        """
+        Desconecta el resaltado y restaura el comando original del widget.
+        """
+        if self.scheduled:
+            self.text_widget.after_cancel(self.scheduled)
+            self.scheduled = None
+        self.tk.deletecommand(self.widget_name)
+        self.tk.call("rename", self.original_command, self.widget_name)
+
+    def parameter_tokens(self):
+        """
+        Devuelve los tokens de parámetro de todo el texto en el orden en que aparecen,
+        a partir de los ya obtenidos al resaltar, sin volver a analizar el texto.
+
+        Returns:
+            Lista de textos de los tokens, o None si aún quedan líneas por analizar
+        """
+        if self.dirty_start:
+            return None
+        return [token for tokens in self.line_parameters if tokens for token in tokens]
+
+    def _call(self, *args):
+        """Llama al comando original del widget."""
+        return self.tk.call((self.original_command,) + args)
+
+    def _line_of(self, index):
+        """Devuelve el número de línea de un índice del widget."""
+        return int(str(self.tk.call(self.original_command, "index", index)).split(".")[0])
+
+    def _dispatch(self, command, *args):
+        """
+        Recibe todas las llamadas al widget. Las que modifican el texto actualizan
+        el estado por línea antes de ejecutarse.
+        """
+        if command in EDIT_COMMANDS:
+            self._before_edit(command, args)
+            result = self._call(command, *args)
+            self._schedule()
+            return result
+        return self._call(command, *args)
+
+    def _before_edit(self, command, args):
+        """
+        Ajusta la lista de estados por línea y el rango pendiente según la edición.
+        """
+        last_line = self._line_of('end-1c')
+        if command == 'insert':
+            line = min(self._line_of(args[0]), last_line)
+            self._lines_inserted(line, ''.join(args[1::2]).count('\n'))
+        elif command == 'delete':
+            if len(args) > 2:
+                # Varios rangos a la vez: se vuelve a analizar desde el primero
+                self._lines_deleted(self._line_of(args[0]), 0)
+                self.dirty_end = last_line
+                return
+            first = min(self._line_of(args[0]), last_line)
+            second = args[1] if len(args) > 1 else f"{args[0]}+1c"
+            self._lines_deleted(first, min(self._line_of(second), last_line) - first)
+        else:  # replace index1 index2 chars ?tags? ...
+            first = min(self._line_of(args[0]), last_line)
+            self._lines_deleted(first, min(self._line_of(args[1]), last_line) - first)
+            self._lines_inserted(first, ''.join(args[2::2]).count('\n'))
+
+    def _lines_inserted(self, line, count):
+        """Registra `count` líneas nuevas a continuación de `line`."""
+        if count:
+            self.line_states[line:line] = [None] * count
+            self.line_parameters[line:line] = [()] * count
+            if self.dirty_end > line:
+                self.dirty_end += count
+        self._mark_dirty(line, line + count)
+
+    def _lines_deleted(self, line, count):
+        """Registra la eliminación de las `count` líneas que siguen a `line`."""
+        if count:
+            del self.line_states[line:line + count]
+            del self.line_parameters[line:line + count]
+            if self.dirty_end > line:
+                self.dirty_end = max(line, self.dirty_end - count)
+        self._mark_dirty(line, line)
+
+    def _mark_dirty(self, first, last):
+        """Amplía el rango de líneas pendientes de analizar."""
+        self.dirty_start = min(self.dirty_start, first) if self.dirty_start else first
+        self.dirty_end = max(self.dirty_end, last)
+        self.visible_done = None
+
+    def _schedule(self):
+        """Programa una pasada de análisis en tiempo ocioso si no hay una pendiente."""
+        if self.scheduled is None and self.dirty_start:
+            self.scheduled = self.text_widget.after_idle(self._process)
+
+    def _process(self):
+        """
+        Analiza un bloque de líneas pendientes y aplica los tags por lotes.
+        Si quedan líneas, programa otra pasada para no bloquear la interfaz.
+        """
+        self.scheduled = None
+        if not self.dirty_start:
+            return
+        total = len(self.line_states)
+        first = min(self.dirty_start, total)
+        last = min(first + LINES_PER_SLICE - 1, total)
+
+        lines = str(self._call("get", f"{first}.0", f"{last}.end")).split("\n")
+        state = self.line_states[first - 1]
+        if state is None:
+            state = STATE_NORMAL
+        ranges = defaultdict(list)
+        converged = False
+        line = first
+        for line, text in enumerate(lines, start=first):
+            tokens, state = tokenize_line(text, state)
+            for token_type, start, end in tokens:
+                ranges[token_type].extend((f"{line}.{start}", f"{line}.{end}"))
+            self.line_parameters[line - 1] = tuple(
+                text[start:end] for token_type, start, end in tokens if token_type == 'parameter'
+            )
+            if line < total:
+                if line >= self.dirty_end and self.line_states[line] == state:
+                    converged = True
+                    break
+                self.line_states[line] = state
+
+        self._apply_tags(first, line, ranges)
+
+        if converged or line >= total:
+            self.dirty_start = None
+            self.dirty_end = 0
+        else:
+            self.dirty_start = line + 1
+            self._highlight_visible()
+            # Ceder el control al bucle de eventos antes de la siguiente pasada
+            self.scheduled = self.text_widget.after(1, self._process)
+
+    def _apply_tags(self, first, last, ranges):
+        """Sustituye los tags de las líneas first..last con una llamada por tipo de token."""
+        for token_type in TOKEN_TYPES:
+            self._call("tag", "remove", token_type, f"{first}.0", f"{last}.end")
+            if ranges[token_type]:
+                self._call("tag", "add", token_type, *ranges[token_type])
+
+    def _highlight_visible(self):
+        """
+        Resalta de forma provisional las líneas visibles que el análisis secuencial
+        todavía no ha alcanzado, suponiendo que empiezan fuera de comentarios y cadenas.
+        El análisis secuencial las corrige al llegar a ellas.
+        """
+        top = self._line_of("@0,0")
+        bottom = self._line_of(f"@0,{self.text_widget.winfo_height()}")
+        if bottom < self.dirty_start or self.visible_done == (top, bottom):
+            return
+        top = max(top, self.dirty_start)
+        lines = str(self._call("get", f"{top}.0", f"{bottom}.end")).split("\n")
+        state = self.line_states[top - 1]
+        if state is None:
+            state = STATE_NORMAL
+        ranges = defaultdict(list)
+        for line, text in enumerate(lines, start=top):
+            tokens, state = tokenize_line(text, state)
+            for token_type, start, end in tokens:
+                ranges[token_type].extend((f"{line}.{start}", f"{line}.{end}"))
+        self._apply_tags(top, bottom, ranges)
+        self.visible_done = (top, bottom)
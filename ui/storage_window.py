@@ -0,0 +1,281 @@
+import sqlite3
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from ui.background import run_in_background
+from utils.storage import MAINTENANCE_OPERATIONS, storage_summary, object_sizes, table_row_estimates, run_maintenance
+
+# Columnas de la tabla de objetos cuando dbstat está disponible
+SIZE_COLUMNS = ("Tipo", "Páginas", "Tamaño", "Relleno", "Desbordamiento", "Fragmentación")
+
+# Columnas de la tabla de objetos sin dbstat
+COUNT_COLUMNS = ("Tipo", "Filas (ANALYZE)")
+
+
+def _format_bytes(size):
+    """Formatea un tamaño en bytes con la unidad más adecuada."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class StorageWindow:
+    """
+    Ventana de almacenamiento y mantenimiento de una base de datos.
+
+    Muestra el tamaño, el relleno de las páginas, las páginas de desbordamiento y la
+    fragmentación de cada tabla e índice (con dbstat), además del espacio libre del
+    archivo, y permite ejecutar VACUUM, VACUUM INTO, el vaciado incremental, ANALYZE y
+    PRAGMA optimize en segundo plano.
+    """
+
+    def __init__(self, parent, db_manager, db_path, read_only, log):
+        """
+        Crea la ventana y carga las estadísticas en segundo plano.
+
+        Args:
+            parent: Ventana principal de la aplicación
+            db_manager: Registro de bases de datos de la aplicación
+            db_path: Base de datos a analizar
+            read_only: True si la base de datos no admite escrituras
+            log: Función que recibe un mensaje y su tipo para la consola
+        """
+        self.parent = parent
+        self.db_manager = db_manager
+        self.db_path = db_path
+        self.read_only = read_only
+        self.log = log
+        self.connection = None   # Conexión usada por la operación en curso
+        self.busy = False
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(f"Almacenamiento - {db_path}")
+        self.dialog.geometry("850x500")
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+        self.create_widgets()
+        self.refresh()
+
+    def create_widgets(self):
+        """
+        Crea el resumen, la tabla de objetos, los botones de mantenimiento y la barra de progreso.
+        """
+        self.summary_label = ttk.Label(self.dialog, text="", justify=tk.LEFT)
+        self.summary_label.pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        table_frame = ttk.Frame(self.dialog)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10)
+        self.objects_table = ttk.Treeview(table_frame, show='tree headings')
+        self.objects_table.heading("#0", text="Objeto")
+        self.objects_table.column("#0", width=200)
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.objects_table.yview)
+        self.objects_table.configure(yscrollcommand=scrollbar.set)
+        self.objects_table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        buttons = ttk.Frame(self.dialog)
+        buttons.pack(fill=tk.X, padx=10, pady=5)
+        self.operation_buttons = []
+        for operation, (_, writes) in MAINTENANCE_OPERATIONS.items():
+            button = ttk.Button(buttons, text=operation, command=lambda o=operation: self.run_operation(o))
+            button.pack(side=tk.LEFT, padx=(0, 5))
+            if writes and self.read_only:
+                button.config(state="disabled")
+            self.operation_buttons.append((button, writes))
+        ttk.Button(buttons, text="Actualizar", command=self.refresh).pack(side=tk.RIGHT)
+
+        status_bar = ttk.Frame(self.dialog)
+        status_bar.pack(fill=tk.X, padx=10, pady=(0, 10))
+        self.progress = ttk.Progressbar(status_bar, mode='indeterminate', length=150)
+        self.progress.pack(side=tk.LEFT)
+        self.status_label = ttk.Label(status_bar, text="")
+        self.status_label.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(status_bar, text="Cancelar", command=self.cancel, state="disabled")
+        self.cancel_button.pack(side=tk.RIGHT)
+
+    def refresh(self):
+        """
+        Vuelve a leer las estadísticas de almacenamiento con una conexión de solo lectura.
+        """
+        if self.busy:
+            return
+
+        def work():
+            with self.db_manager.read_connection(self.db_path) as connection:
+                self.connection = connection
+                summary = storage_summary(connection)
+                sizes = object_sizes(connection)
+                counts = table_row_estimates(connection) if sizes is None else None
+                return summary, sizes, counts
+
+        self._start("Analizando almacenamiento...", cancellable=True)
+        run_in_background(self.parent, work, self.show_statistics, self.on_error)
+
+    def show_statistics(self, statistics):
+        """
+        Muestra el resumen del archivo y el tamaño de cada objeto.
+
+        Args:
+            statistics: Tupla (resumen, tamaños con dbstat o None, filas por tabla o None)
+        """
+        self._finish("")
+        if not self.dialog.winfo_exists():
+            return
+        summary, sizes, counts = statistics
+        self.show_summary(summary)
+
+        self.objects_table.delete(*self.objects_table.get_children())
+        if sizes is not None:
+            self.objects_table.configure(columns=SIZE_COLUMNS)
+            for column in SIZE_COLUMNS:
+                self.objects_table.heading(column, text=column)
+                self.objects_table.column(column, width=90, anchor=tk.E)
+            for size in sizes:
+                self.objects_table.insert("", tk.END, text=size['name'], values=(
+                    size['type'],
+                    size['pages'],
+                    _format_bytes(size['bytes']),
+                    f"{size['fill']:.0%}",
+                    size['overflow_pages'],
+                    f"{size['fragmentation']:.0%}",
+                ))
+        else:
+            self.objects_table.configure(columns=COUNT_COLUMNS)
+            for column in COUNT_COLUMNS:
+                self.objects_table.heading(column, text=column)
+                self.objects_table.column(column, width=90, anchor=tk.E)
+            for count in counts:
+                rows = count['rows'] if count['rows'] is not None else "?"
+                self.objects_table.insert("", tk.END, text=count['name'], values=(count['type'], rows))
+            self.status_label.config(
+                text="dbstat no disponible: se muestran las filas estimadas por ANALYZE y el total de páginas"
+            )
+
+    def show_summary(self, summary):
+        """
+        Muestra el resumen de páginas del archivo.
+
+        Args:
+            summary: Diccionario devuelto por storage_summary
+        """
+        self.summary_label.config(text=(
+            f"Tamaño: {_format_bytes(summary['file_bytes'])}  "
+            f"({summary['page_count']} páginas de {summary['page_size']} bytes)\n"
+            f"Páginas libres: {summary['freelist_count']} ({_format_bytes(summary['free_bytes'])}, "
+            f"{summary['free_ratio']:.1%})  ·  auto_vacuum: {summary['auto_vacuum']}"
+        ))
+
+    def run_operation(self, operation):
+        """
+        Ejecuta una operación de mantenimiento en segundo plano. Las operaciones que escriben
+        usan una conexión de sesión propia; VACUUM INTO usa una conexión de solo lectura.
+
+        Args:
+            operation: Clave de MAINTENANCE_OPERATIONS
+        """
+        if self.busy:
+            return
+        _, writes = MAINTENANCE_OPERATIONS[operation]
+        target_path = None
+        if operation == "VACUUM INTO":
+            target_path = filedialog.asksaveasfilename(
+                parent=self.dialog,
+                defaultextension=".db",
+                filetypes=[("SQLite DB", "*.db *.sqlite3")]
+            )
+            if not target_path:
+                return
+        elif operation == "VACUUM" and not messagebox.askyesno(
+            "VACUUM", "VACUUM reescribe todo el archivo y bloquea la base de datos mientras dura. ¿Continuar?",
+            parent=self.dialog
+        ):
+            return
+
+        if self.db_path not in self.db_manager.open_databases():
+            messagebox.showwarning("Advertencia", "La base de datos ya no está abierta.", parent=self.dialog)
+            return
+        # La sesión se abre y se cierra en el hilo de la interfaz, el único que modifica el registro
+        try:
+            session = self.db_manager.acquire_session(self.db_path) if writes else None
+        except sqlite3.Error as e:
+            self.on_error(e)
+            return
+
+        def work():
+            if session:
+                connection = session[0]
+                self.connection = connection
+                try:
+                    return run_maintenance(connection, operation)
+                finally:
+                    self.connection = None
+            with self.db_manager.read_connection(self.db_path) as connection:
+                self.connection = connection
+                try:
+                    return run_maintenance(connection, operation, target_path)
+                finally:
+                    self.connection = None
+
+        def release():
+            if session:
+                self.db_manager.release_session(*session)
+
+        def on_success(summary):
+            release()
+            self._finish(f"{operation}: completado")
+            self.log(f"{operation} sobre {self.db_path}: completado", 'success')
+            if self.dialog.winfo_exists():
+                self.show_summary(summary)
+                self.refresh()
+
+        def on_error(error):
+            release()
+            self.on_error(error)
+
+        self.log(f"{operation} sobre {self.db_path}: en curso...", 'info')
+        self._start(f"{operation} en curso...", cancellable=True)
+        run_in_background(self.parent, work, on_success, on_error)
+
+    def on_error(self, error):
+        """
+        Muestra el error de una operación.
+
+        Args:
+            error: Excepción producida
+        """
+        self._finish(f"Error: {str(error)}")
+        self.log(f"Almacenamiento de {self.db_path}: {str(error)}", 'error')
+
+    def cancel(self):
+        """
+        Interrumpe la operación en curso.
+        """
+        if self.busy and self.connection:
+            self.connection.interrupt()
+
+    def close(self):
+        """
+        Cierra la ventana, interrumpiendo la operación en curso si la hay.
+        """
+        self.cancel()
+        self.dialog.destroy()
+
+    def _start(self, message, cancellable=False):
+        """Marca el inicio de una operación: desactiva los botones y anima la barra de progreso."""
+        self.busy = True
+        for button, _ in self.operation_buttons:
+            button.config(state="disabled")
+        self.cancel_button.config(state="normal" if cancellable else "disabled")
+        self.status_label.config(text=message)
+        self.progress.start(15)
+
+    def _finish(self, message):
+        """Marca el final de una operación y restaura el estado de los botones."""
+        self.busy = False
+        self.connection = None
+        if not self.dialog.winfo_exists():
+            return
+        self.progress.stop()
+        self.cancel_button.config(state="disabled")
+        for button, writes in self.operation_buttons:
+            button.config(state="disabled" if writes and self.read_only else "normal")
+        self.status_label.config(text=message)
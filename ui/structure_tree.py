@@ -0,0 +1,203 @@
+import tkinter as tk
+from tkinter import ttk
+from utils.name_filter import NameIndex
+
+# Grupos de objetos del esquema: (tipo en sqlite_master, etiqueta)
+GROUPS = (
+    ("table", "Tablas"),
+    ("view", "Vistas"),
+    ("index", "Índices"),
+    ("trigger", "Triggers"),
+)
+
+# Texto del nodo provisional que hace expandible un nodo aún no cargado
+PLACEHOLDER = "Cargando..."
+
+# Milisegundos de espera tras la última tecla antes de aplicar el filtro
+FILTER_DELAY = 150
+
+
+class StructureTree:
+    """
+    Árbol jerárquico con la estructura de la base de datos: tablas, vistas, índices y triggers.
+
+    Solo se cargan los nombres de los objetos; las columnas, índices y claves foráneas
+    de cada tabla se consultan a la caché del esquema cuando se expande su nodo
+    (<<TreeviewOpen>>), de modo que abrir una base de datos con miles de objetos
+    no requiere inspeccionar cada uno.
+
+    La caja de filtro muestra solo los objetos cuyo nombre coincide con el texto
+    escrito, reordenando en el sitio los nodos ya creados de cada grupo.
+    """
+
+    def __init__(self, parent, on_select_callback):
+        """
+        Crea el árbol dentro del frame indicado.
+
+        Args:
+            parent: Frame contenedor
+            on_select_callback: Función que recibe el evento de selección de un nodo
+        """
+        self.schema_cache = None
+        self.nodes = {}          # Identificador del nodo -> (tipo, nombre)
+        self.placeholders = {}   # Identificador del nodo -> identificador de su nodo provisional
+        self.group_items = {}    # Grupo -> (NameIndex de sus objetos, nodos en el mismo orden)
+        self.group_labels = {}   # Grupo -> etiqueta sin contador
+        self.filter_job = None
+
+        # Caja de filtro sobre el árbol
+        filter_bar = ttk.Frame(parent)
+        filter_bar.pack(side=tk.TOP, fill=tk.X, padx=5, pady=(5, 0))
+        ttk.Label(filter_bar, text="Buscar:").pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        ttk.Entry(filter_bar, textvariable=self.filter_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(2, 0))
+        self.filter_var.trace_add("write", lambda *args: self.schedule_filter())
+
+        scrollbar = ttk.Scrollbar(parent, orient="vertical")
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(parent, show='tree', selectmode='browse', yscrollcommand=scrollbar.set)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=(5, 0), pady=5)
+        scrollbar.config(command=self.tree.yview)
+
+        self.tree.bind("<<TreeviewOpen>>", self.on_open)
+        self.tree.bind("<<TreeviewSelect>>", on_select_callback)
+
+    def clear(self):
+        """
+        Vacía el árbol.
+        """
+        self.tree.delete(*self.tree.get_children())
+        self.nodes = {}
+        self.placeholders = {}
+        self.group_items = {}
+        self.group_labels = {}
+        self.schema_cache = None
+
+    def load(self, schema_cache):
+        """
+        Muestra los grupos de objetos de una base de datos. El grupo de tablas se
+        abre con sus nombres; los demás se cargan al expandirlos.
+
+        Args:
+            schema_cache: SchemaCache de la base de datos activa
+        """
+        self.clear()
+        self.schema_cache = schema_cache
+        schema_cache.refresh_if_changed()
+        for object_type, label in GROUPS:
+            count = len(schema_cache.objects[object_type])
+            group = self._add_node("", f"{label} ({count})", "group", object_type, lazy=count > 0)
+            self.group_labels[group] = label
+            if object_type == "table":
+                self.tree.item(group, open=True)
+                self._load_children(group)
+
+    def _add_node(self, parent, text, kind, name, lazy=False):
+        """
+        Inserta un nodo. Si es `lazy`, se le añade un hijo provisional para que sea expandible.
+        """
+        node = self.tree.insert(parent, tk.END, text=text)
+        self.nodes[node] = (kind, name)
+        if lazy:
+            self.placeholders[node] = self.tree.insert(node, tk.END, text=PLACEHOLDER)
+        return node
+
+    def on_open(self, event=None):
+        """
+        Carga los hijos del nodo que se acaba de expandir, si aún no se cargaron.
+        """
+        self._load_children(self.tree.focus())
+
+    def _load_children(self, node):
+        """
+        Sustituye el hijo provisional de un nodo por sus hijos reales.
+        """
+        placeholder = self.placeholders.pop(node, None)
+        if placeholder is None or self.schema_cache is None:
+            return
+        self.tree.delete(placeholder)
+        kind, name = self.nodes[node]
+
+        if kind == "group":
+            names = self.schema_cache.objects[name]
+            items = []
+            for object_name in names:
+                lazy = name in ("table", "view")
+                text = object_name
+                if name in ("index", "trigger"):
+                    text = f"{object_name}  ({self.schema_cache.table_of.get(object_name, '')})"
+                items.append(self._add_node(node, text, name, object_name, lazy=lazy))
+            self.group_items[node] = (NameIndex(names), items)
+            if self.filter_var.get().strip():
+                self._filter_group(node)
+        elif kind == "table":
+            columns = self._add_node(node, "Columnas", "columns", name, lazy=True)
+            self.tree.item(columns, open=True)
+            self._load_children(columns)
+            self._add_node(node, "Índices", "indexes", name, lazy=True)
+            self._add_node(node, "Claves foráneas", "foreign_keys", name, lazy=True)
+        elif kind == "view":
+            self._add_columns(node, name)
+        elif kind == "columns":
+            self._add_columns(node, name)
+        elif kind == "indexes":
+            for _, index_name, unique, origin, _ in self.schema_cache.indexes(name):
+                detail = "UNIQUE" if unique else ""
+                if origin == "pk":
+                    detail = "PRIMARY KEY"
+                self._add_node(node, f"{index_name}  {detail}".rstrip(), "index", index_name)
+        elif kind == "foreign_keys":
+            for fk in self.schema_cache.foreign_keys(name):
+                self._add_node(node, f"{fk[3]} → {fk[2]}.{fk[4]}", "foreign_key", fk[2])
+
+    def _add_columns(self, node, table_name):
+        """Añade las columnas de una tabla o vista como hijos de un nodo."""
+        for _, column_name, column_type, not_null, _, pk in self.schema_cache.columns(table_name):
+            details = [column_type] if column_type else []
+            if pk:
+                details.append("PK")
+            if not_null:
+                details.append("NOT NULL")
+            self._add_node(node, f"{column_name} : {' '.join(details)}".rstrip(" :"), "column", column_name)
+
+    def schedule_filter(self):
+        """
+        Aplica el filtro cuando se deja de escribir durante FILTER_DELAY milisegundos.
+        """
+        if self.filter_job:
+            self.tree.after_cancel(self.filter_job)
+        self.filter_job = self.tree.after(FILTER_DELAY, self.apply_filter)
+
+    def apply_filter(self):
+        """
+        Aplica el texto de búsqueda a todos los grupos ya cargados.
+        """
+        self.filter_job = None
+        for group in self.group_items:
+            self._filter_group(group)
+
+    def _filter_group(self, group):
+        """
+        Muestra en un grupo solo los nodos que coinciden con la búsqueda, con una sola
+        llamada a set_children. Los demás se desvinculan sin eliminarse.
+        """
+        name_index, items = self.group_items[group]
+        positions = name_index.match(self.filter_var.get())
+        self.tree.set_children(group, *(items[position] for position in positions))
+        label = self.group_labels[group]
+        if len(positions) == len(items):
+            self.tree.item(group, text=f"{label} ({len(items)})")
+        else:
+            self.tree.item(group, text=f"{label} ({len(positions)}/{len(items)})")
+
+    def selected_object(self):
+        """
+        Devuelve el tipo y el nombre del objeto seleccionado.
+
+        Returns:
+            Tupla (tipo, nombre) o None si no hay selección
+        """
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        return self.nodes.get(selection[0])
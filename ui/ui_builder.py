@@ -1,6 +1,14 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import scrolledtext
+from ui.autocomplete import AutoCompleter
+from ui.bind_panel import BindPanel
+from ui.console import ConsoleLog, DEFAULT_MAX_LINES
+from ui.execution_context import ExecutionContext
+from ui.results_grid import ResultsGrid
+from ui.sql_highlighter import SQLHighlighter
+from ui.structure_tree import StructureTree
+from utils.instrumentation import timed
 
 class UIBuilder:
     """
@@ -8,23 +16,33 @@ class UIBuilder:
     Maneja la creación de editores SQL, paneles de resultados y estructura de la base de datos.
     """
 
-    def __init__(self, root, on_table_select_callback):
+    def __init__(self, root, on_table_select_callback, console_max_lines=DEFAULT_MAX_LINES, console_log_file=None):
         """
         Inicializa el constructor de la interfaz de usuario.
 
         Args:
             root: Ventana principal de Tkinter
             on_table_select_callback: Función callback para manejar la selección de tablas
+            console_max_lines: Número máximo de líneas que conserva la consola
+            console_log_file: Ruta opcional de un archivo rotativo con el registro completo de la consola
         """
         self.root = root
         self.on_table_select_callback = on_table_select_callback
         self.editors = {}              # Diccionario para almacenar los editores
         self.editor_count = 0          # Contador de editores creados
         self.results_frame = None      # Frame para resultados
-        self.results_table = None      # Tabla de resultados
-        self.tables_listbox = None     # Lista de tablas
+        self.results_container = None  # Contenedor de las tablas de resultados de cada pestaña
+        self.results_table = None      # Tabla de resultados de la pestaña activa
+        self.current_results = None    # Frame de resultados visible
+        self.structure_tree = None     # Árbol de estructura de la base de datos
         self.notebook = None           # Notebook para editores
         self.console = None            # Consola de mensajes
+        self.console_log = None        # Registro acotado de la consola
+        self.console_max_lines = console_max_lines
+        self.console_log_file = console_log_file
+        self.completion_provider = None  # Función que devuelve el índice de autocompletado
+        self.value_opener = None         # Función (resultado, fila, columna) que abre el valor de una celda
+        self.watch_toggler = None        # Función (contexto, activado) que activa el modo vigilancia
         self.setup_main_layout()
 
     def setup_main_layout(self):
@@ -50,6 +68,7 @@ class UIBuilder:
         # Crear notebook para editores SQL
         self.notebook = ttk.Notebook(self.right_paned)
         self.right_paned.add(self.notebook, weight=2)
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
 
         # Panel de resultados y consola
         self.results_frame = ttk.Frame(self.right_paned)
@@ -64,19 +83,16 @@ class UIBuilder:
         Configura la visualización de resultados y mensajes del sistema.
         """
         # Crear notebook para resultados y consola
-        results_notebook = ttk.Notebook(self.results_frame)
-        results_notebook.pack(fill=tk.BOTH, expand=True)
+        self.results_notebook = ttk.Notebook(self.results_frame)
+        self.results_notebook.pack(fill=tk.BOTH, expand=True)
 
-        # Pestaña de resultados
-        results_frame = ttk.Frame(results_notebook)
-        results_notebook.add(results_frame, text="Results")
-
-        # Crear tabla de resultados con barras de desplazamiento
-        self.create_results_table(results_frame)
+        # Pestaña de resultados; cada editor crea aquí su propia tabla de resultados
+        self.results_container = ttk.Frame(self.results_notebook)
+        self.results_notebook.add(self.results_container, text="Results")
 
         # Pestaña de consola
-        console_frame = ttk.Frame(results_notebook)
-        results_notebook.add(console_frame, text="Console")
+        console_frame = ttk.Frame(self.results_notebook)
+        self.results_notebook.add(console_frame, text="Console")
         
         # Configurar widget de consola
         self.console = scrolledtext.ScrolledText(
@@ -88,51 +104,31 @@ class UIBuilder:
             font=('Courier', 10)
         )
         self.console.pack(fill=tk.BOTH, expand=True)
+        self.console_log = ConsoleLog(self.console, self.console_max_lines, self.console_log_file)
         
     def create_tables_list(self):
         """
-        Crea el panel de estructura de base de datos con lista de tablas.
-        Configura la vista de árbol para mostrar la estructura de la base de datos.
+        Crea el panel de estructura de base de datos.
+        Configura el árbol jerárquico de objetos y su evento de selección.
         """
         tables_frame = ttk.LabelFrame(self.left_frame, text="Database Structure")
-        tables_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
-
-        # Crear tree view para estructura de base de datos
-        self.db_tree = ttk.Treeview(tables_frame, show='tree')
-        self.db_tree.pack(fill=tk.BOTH, expand=True)
-
-        # Agregar barra de desplazamiento
-        scrollbar = ttk.Scrollbar(tables_frame, orient="vertical", command=self.db_tree.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.db_tree.configure(yscrollcommand=scrollbar.set)
+        tables_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        # Estructura de ejemplo
-        db_node = self.db_tree.insert("", "end", text="Database", open=True)
-        tables_node = self.db_tree.insert(db_node, "end", text="Tables", open=True)
-        self.db_tree.insert(tables_node, "end", text="Sample Table")
+        # Crear árbol de estructura con carga diferida de los detalles de cada objeto
+        self.structure_tree = StructureTree(tables_frame, self.on_table_select_callback)
+        self.db_tree = self.structure_tree.tree
 
+    @timed()
     def append_to_console(self, text, type='info'):
         """
         Añade texto a la consola con estilo opcional.
+        El mensaje se muestra en el próximo volcado por lotes de la consola.
 
         Args:
             text: Texto a mostrar en la consola
             type: Tipo de mensaje ('info', 'error', 'success')
         """
-        self.console.config(state='normal')
-        if type == 'error':
-            tag = 'error'
-            self.console.tag_config(tag, foreground='red')
-        elif type == 'success':
-            tag = 'success'
-            self.console.tag_config(tag, foreground='green')
-        else:
-            tag = 'info'
-            self.console.tag_config(tag, foreground='white')
-            
-        self.console.insert(tk.END, f"{text}\n", tag)
-        self.console.see(tk.END)
-        self.console.config(state='disabled')
+        self.console_log.append(text, type)
 
     def create_sql_editor(self, name=None):
         """
@@ -175,11 +171,33 @@ class UIBuilder:
         )
         sql_text.pack(fill=tk.BOTH, expand=True)
 
+        highlighter = SQLHighlighter(sql_text)
+
+        # Panel de valores de los parámetros, visible cuando el SQL los contiene
+        bind_panel = BindPanel(editor_frame, sql_text, sql_frame, highlighter)
+
+        # Crear la tabla de resultados propia de la pestaña
+        results_frame = ttk.Frame(self.results_container)
+        results_table = self.create_results_table(results_frame)
+        results_grid = ResultsGrid(
+            results_frame,
+            results_table,
+            self.open_value,
+            lambda enabled: self.toggle_watch(name, enabled)
+        )
+
         # Almacenar información del editor
         self.editors[name] = {
             'frame': editor_frame,
             'text_widget': sql_text,
-            'close_button': close_button
+            'close_button': close_button,
+            'results_frame': results_frame,
+            'results_table': results_table,
+            'results_grid': results_grid,
+            'bind_panel': bind_panel,
+            'context': ExecutionContext(name, sql_text, results_table, results_grid, bind_panel),
+            'highlighter': highlighter,
+            'autocompleter': AutoCompleter(sql_text, self.get_completion_index)
         }
 
         # Añadir nueva pestaña al notebook
@@ -187,6 +205,7 @@ class UIBuilder:
         
         # Actualizar editor actual
         self.sql_text = sql_text
+        self.show_results_of(name)
         
         # Seleccionar nueva pestaña
         self.notebook.select(editor_frame)
@@ -201,14 +220,22 @@ class UIBuilder:
             name: Nombre del editor a cerrar
         """
         if name in self.editors:
-            frame = self.editors[name]['frame']
-            tab_id = self.notebook.select()
+            editor = self.editors[name]
+            frame = editor['frame']
             
             # Encontrar índice de la pestaña a cerrar
-            tab_index = self.notebook.index(tab_id)
+            tab_index = self.notebook.index(frame)
+            
+            # Detener la consulta en curso y liberar la sesión de la pestaña
+            editor['context'].close()
+            editor['highlighter'].close()
+            editor['autocompleter'].hide()
             
-            # Eliminar pestaña
+            # Eliminar pestaña y su tabla de resultados
             self.notebook.forget(frame)
+            editor['results_frame'].destroy()
+            if self.current_results is editor['results_frame']:
+                self.current_results = None
             del self.editors[name]
             
             # Si quedan editores, seleccionar uno adyacente
@@ -216,81 +243,136 @@ class UIBuilder:
                 new_index = max(0, tab_index - 1)
                 if new_index < self.notebook.index('end'):
                     self.notebook.select(new_index)
-                    remaining_name = list(self.editors.keys())[new_index]
-                    self.sql_text = self.editors[remaining_name]['text_widget']
             else:
                 # Si no quedan editores, crear uno nuevo
                 self.create_sql_editor()
 
-    def get_current_editor(self):
+    def on_tab_changed(self, event=None):
         """
-        Obtiene el widget del editor actualmente activo.
+        Actualiza el editor y la tabla de resultados activos al cambiar de pestaña.
+
+        Args:
+            event: Evento de cambio de pestaña
+        """
+        name = self.get_current_editor_name()
+        if name:
+            self.sql_text = self.editors[name]['text_widget']
+            self.show_results_of(name)
+
+    def show_results_of(self, name):
+        """
+        Muestra en la pestaña "Results" la tabla de resultados del editor indicado.
+
+        Args:
+            name: Nombre del editor
+        """
+        results_frame = self.editors[name]['results_frame']
+        if self.current_results is not results_frame:
+            if self.current_results is not None:
+                self.current_results.pack_forget()
+            results_frame.pack(fill=tk.BOTH, expand=True)
+            self.current_results = results_frame
+        self.results_table = self.editors[name]['results_table']
+
+    def get_current_editor_name(self):
+        """
+        Obtiene el nombre del editor de la pestaña seleccionada.
 
         Returns:
-            Widget del editor activo o None si no hay ninguno
+            Nombre del editor o None si no hay ninguno
         """
         current_tab = self.notebook.select()
-        if current_tab:
-            return self.sql_text
+        for name, editor in self.editors.items():
+            if str(editor['frame']) == current_tab:
+                return name
         return None
 
-    def get_all_editors(self):
+    def get_editor_name(self, text_widget):
         """
-        Obtiene una lista de todos los widgets de editores.
+        Obtiene el nombre del editor al que pertenece un widget de texto.
+
+        Args:
+            text_widget: Widget de texto de un editor
 
         Returns:
-            Lista de widgets de editores
+            Nombre del editor o None si no pertenece a ninguno
         """
-        return [editor['text_widget'] for editor in self.editors.values()]
+        for name, editor in self.editors.items():
+            if editor['text_widget'] is text_widget:
+                return name
+        return None
 
-    def create_tables_list(self):
+    def get_current_context(self):
         """
-        Crea el panel de estructura de base de datos con lista de tablas.
-        Configura la lista y sus eventos de selección.
+        Obtiene el contexto de ejecución de la pestaña seleccionada.
+
+        Returns:
+            ExecutionContext de la pestaña activa o None si no hay ninguna
         """
-        tables_frame = ttk.LabelFrame(self.left_frame, text="Database Structure")
-        tables_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        name = self.get_current_editor_name()
+        return self.editors[name]['context'] if name else None
 
-        # Crear listbox con barra de desplazamiento
-        scrollbar = ttk.Scrollbar(tables_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    def get_all_contexts(self):
+        """
+        Obtiene los contextos de ejecución de todas las pestañas.
 
-        self.tables_listbox = tk.Listbox(
-            tables_frame,
-            yscrollcommand=scrollbar.set,
-            selectmode=tk.SINGLE
-        )
-        self.tables_listbox.pack(fill=tk.BOTH, expand=True, padx=(5, 0), pady=5)
-        
-        scrollbar.config(command=self.tables_listbox.yview)
-        self.tables_listbox.bind("<<ListboxSelect>>", self.on_table_select_callback)
+        Returns:
+            Lista de ExecutionContext
+        """
+        return [editor['context'] for editor in self.editors.values()]
 
-    def create_results_area(self):
+    def get_completion_index(self):
         """
-        Crea el área de resultados con una vista de tabla.
-        Configura la tabla y sus barras de desplazamiento.
+        Obtiene el índice de autocompletado de la base de datos activa.
+
+        Returns:
+            CompletionIndex o None si no hay proveedor o base de datos conectada
         """
-        results_label_frame = ttk.LabelFrame(self.results_frame, text="Results")
-        results_label_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        return self.completion_provider() if self.completion_provider else None
 
-        # Crear barras de desplazamiento
-        x_scrollbar = ttk.Scrollbar(results_label_frame, orient=tk.HORIZONTAL)
-        y_scrollbar = ttk.Scrollbar(results_label_frame)
-        x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
-        y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        # Crear treeview con barras de desplazamiento
-        self.results_table = ttk.Treeview(
-            results_label_frame,
-            show='headings',
-            xscrollcommand=x_scrollbar.set,
-            yscrollcommand=y_scrollbar.set
-        )
-        self.results_table.pack(fill=tk.BOTH, expand=True)
+    def open_value(self, result, row, column):
+        """
+        Abre el valor completo de una celda de resultados.
+
+        Args:
+            result: ResultBuffer mostrado en la tabla
+            row: Índice de la fila en el resultado
+            column: Posición de la columna
+        """
+        if self.value_opener:
+            self.value_opener(result, row, column)
+
+    def toggle_watch(self, name, enabled):
+        """
+        Activa o desactiva el modo vigilancia de la pestaña indicada.
+
+        Args:
+            name: Nombre del editor
+            enabled: True para activar la vigilancia
+        """
+        if self.watch_toggler and name in self.editors:
+            self.watch_toggler(self.editors[name]['context'], enabled)
+
+    def get_current_editor(self):
+        """
+        Obtiene el widget del editor actualmente activo.
+
+        Returns:
+            Widget del editor activo o None si no hay ninguno
+        """
+        current_tab = self.notebook.select()
+        if current_tab:
+            return self.sql_text
+        return None
+
+    def get_all_editors(self):
+        """
+        Obtiene una lista de todos los widgets de editores.
 
-        # Configurar barras de desplazamiento
-        x_scrollbar.config(command=self.results_table.xview)
-        y_scrollbar.config(command=self.results_table.yview)
+        Returns:
+            Lista de widgets de editores
+        """
+        return [editor['text_widget'] for editor in self.editors.values()]
 
     def create_results_table(self, parent):
         """
@@ -298,6 +380,9 @@ class UIBuilder:
 
         Args:
             parent: Widget padre donde se creará la tabla
+
+        Returns:
+            Treeview de resultados creado
         """
         # Crear frame contenedor para la tabla
         table_frame = ttk.Frame(parent)
@@ -308,7 +393,7 @@ class UIBuilder:
         y_scrollbar = ttk.Scrollbar(table_frame)
         
         # Crear treeview
-        self.results_table = ttk.Treeview(
+        results_table = ttk.Treeview(
             table_frame,
             show='headings',
             xscrollcommand=x_scrollbar.set,
@@ -316,14 +401,16 @@ class UIBuilder:
         )
         
         # Configurar comandos de barras de desplazamiento
-        x_scrollbar.config(command=self.results_table.xview)
-        y_scrollbar.config(command=self.results_table.yview)
+        x_scrollbar.config(command=results_table.xview)
+        y_scrollbar.config(command=results_table.yview)
         
         # Disposición de grid para comportamiento correcto de barras
-        self.results_table.grid(row=0, column=0, sticky='nsew')
+        results_table.grid(row=0, column=0, sticky='nsew')
         y_scrollbar.grid(row=0, column=1, sticky='ns')
         x_scrollbar.grid(row=1, column=0, sticky='ew')
         
         # Configurar pesos de grid
         table_frame.grid_rowconfigure(0, weight=1)
-        table_frame.grid_columnconfigure(0, weight=1)
\ No newline at end of file
+        table_frame.grid_columnconfigure(0, weight=1)
+
+        return results_table
\ No newline at end of file
@@ -1,4 +1,4 @@
-import tkinter as tk
+from utils.instrumentation import timed
 
 def update_tools_menu_state(menu, connected):
     """
@@ -8,44 +8,73 @@ def update_tools_menu_state(menu, connected):
     - menu: Menú que contiene las opciones a actualizar.
     - connected: Estado de la conexión a la base de datos (True si está conectado, False si no lo está).
 
-    Esta función habilita o deshabilita las opciones del menú "Generar ERD" y "Exportar Base de Datos"
-    dependiendo de si la conexión a la base de datos está activa o no.
+    Esta función habilita o deshabilita las opciones del menú Herramientas ("Generar ERD",
+    "Exportar Base de Datos" y las añadidas con add_tool) dependiendo de si la conexión
+    a la base de datos está activa o no.
     """
     state = "normal" if connected else "disabled"  # Determina el estado basado en la conexión
-    menu.tools_menu.entryconfig("Generar ERD", state=state)  # Actualiza el estado de "Generar ERD"
-    menu.tools_menu.entryconfig("Exportar Base de Datos", state=state)  # Actualiza el estado de "Exportar Base de Datos"
+    for label in menu.tool_entries:
+        menu.tools_menu.entryconfig(label, state=state)
 
-def update_db_label(db_label, db_path):
+def update_write_actions_state(menu, writable):
+    """
+    Habilita o deshabilita las acciones del menú que escriben en la base de datos.
+
+    Parameters:
+    - menu: Menú que contiene las opciones a actualizar.
+    - writable: True si la conexión actual admite escrituras.
+    """
+    state = "normal" if writable else "disabled"
+    for label in menu.write_entries:
+        menu.tools_menu.entryconfig(label, state=state)
+
+def update_memory_actions_state(menu, memory_copy):
+    """
+    Habilita o deshabilita las acciones del menú que guardan una copia en memoria.
+
+    Parameters:
+    - menu: Menú que contiene las opciones a actualizar.
+    - memory_copy: True si la base de datos activa es una copia en memoria.
+    """
+    state = "normal" if memory_copy else "disabled"
+    for label in menu.memory_entries:
+        menu.db_menu.entryconfig(label, state=state)
+
+def update_db_label(db_label, db_path, profile=None, mode_label=None):
     """
     Actualiza la etiqueta que muestra el estado de la conexión a la base de datos.
 
     Parameters:
     - db_label: Etiqueta de la interfaz gráfica que muestra el estado.
     - db_path: Ruta de la base de datos conectada (vacío si no hay base de datos conectada).
+    - profile (opcional): Nombre del perfil de ajuste aplicado a la conexión.
+    - mode_label (opcional): Descripción del modo de apertura cuando no es lectura/escritura.
 
-    Si hay una base de datos conectada, la etiqueta mostrará la ruta; si no, mostrará "No hay base de datos conectada".
+    Si hay una base de datos conectada, la etiqueta mostrará la ruta y el perfil; si no, mostrará "No hay base de datos conectada".
     """
     if db_path:
-        db_label.config(text=f"Conectado a: {db_path}")  # Muestra la ruta de la base de datos conectada
+        text = f"Conectado a: {db_path}"  # Muestra la ruta de la base de datos conectada
+        if mode_label:
+            text += f"  [{mode_label}]"  # Indica que la conexión no admite escrituras
+        if profile:
+            text += f"  [Perfil: {profile}]"  # Muestra el perfil de ajuste activo
+        db_label.config(text=text)
     else:
         db_label.config(text="No hay base de datos conectada")  # Muestra mensaje si no hay base de datos
 
-def update_tables_list(db_connection, tables_listbox):
+@timed()
+def update_tables_list(schema_cache, structure_tree):
     """
-    Actualiza la lista de tablas en la interfaz gráfica.
+    Actualiza el árbol de estructura de la base de datos en la interfaz gráfica.
 
     Parameters:
-    - db_connection: Conexión a la base de datos SQLite.
-    - tables_listbox: Lista de tablas en la interfaz gráfica.
-
-    Obtiene la lista de tablas de la base de datos y las muestra en el `tables_listbox`.
-    Si no hay conexión a la base de datos, no hace nada.
-    """
-    if not db_connection:
-        return  # Si no hay conexión, no se actualiza la lista
-    cursor = db_connection.cursor()  # Crea un cursor para interactuar con la base de datos
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")  # Consulta las tablas en la base de datos
-    tables = cursor.fetchall()  # Obtiene todas las tablas
-    tables_listbox.delete(0, tk.END)  # Borra cualquier elemento previo en la lista de tablas
-    for table in tables:
-        tables_listbox.insert(tk.END, table[0])  # Inserta cada tabla en la lista
+    - schema_cache: Caché del esquema de la base de datos activa (None si no hay conexión).
+    - structure_tree: Árbol de estructura de la interfaz gráfica.
+
+    Muestra los grupos de tablas, vistas, índices y triggers; los detalles de cada
+    objeto se cargan al expandir su nodo. Si no hay conexión, vacía el árbol.
+    """
+    if schema_cache is None:
+        structure_tree.clear()  # Si no hay conexión, se vacía el árbol
+        return
+    structure_tree.load(schema_cache)
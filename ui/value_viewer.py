@@ -0,0 +1,132 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+# Bytes que muestra cada página de la vista hexadecimal
+HEX_PAGE = 16 * 1024
+
+# Bytes por línea de la vista hexadecimal
+HEX_LINE = 16
+
+
+def hex_dump(data, offset):
+    """
+    Formatea bytes como volcado hexadecimal con desplazamiento, bytes y caracteres ASCII.
+
+    Args:
+        data: Bytes a formatear
+        offset: Desplazamiento del primer byte dentro del valor
+    """
+    lines = []
+    for start in range(0, len(data), HEX_LINE):
+        chunk = data[start:start + HEX_LINE]
+        hex_part = " ".join(f"{byte:02x}" for byte in chunk)
+        ascii_part = "".join(chr(byte) if 32 <= byte < 127 else "." for byte in chunk)
+        lines.append(f"{offset + start:08x}  {hex_part:<{HEX_LINE * 3}} {ascii_part}")
+    return "\n".join(lines)
+
+
+class ValueViewer:
+    """
+    Visor del valor completo de una celda en modo texto o hexadecimal.
+
+    Los bytes se piden por páginas a la función de lectura, de modo que un BLOB de
+    varios megabytes no se carga entero en memoria para mostrarlo ni para guardarlo.
+    """
+
+    def __init__(self, parent, title, size, read, is_blob, close=None):
+        """
+        Crea la ventana y muestra la primera página.
+
+        Args:
+            parent: Ventana principal de la aplicación
+            title: Título de la ventana
+            size: Tamaño del valor en bytes
+            read: Función (desplazamiento, tamaño) -> bytes
+            is_blob: True para abrir en modo hexadecimal, False para abrir en modo texto
+            close: Función opcional que libera el lector al cerrar la ventana
+        """
+        self.size = size
+        self.read = read
+        self.close_reader = close
+        self.offset = 0
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(title)
+        self.dialog.geometry("760x500")
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+
+        toolbar = ttk.Frame(self.dialog)
+        toolbar.pack(fill=tk.X, padx=5, pady=5)
+        self.mode_var = tk.StringVar(value="hex" if is_blob else "text")
+        ttk.Radiobutton(toolbar, text="Hexadecimal", value="hex", variable=self.mode_var,
+                        command=self.show).pack(side=tk.LEFT)
+        ttk.Radiobutton(toolbar, text="Texto", value="text", variable=self.mode_var,
+                        command=self.show).pack(side=tk.LEFT, padx=5)
+        ttk.Button(toolbar, text="Guardar como...", command=self.save).pack(side=tk.RIGHT)
+        self.next_button = ttk.Button(toolbar, text="Siguiente ▶", command=lambda: self.move(1))
+        self.next_button.pack(side=tk.RIGHT, padx=5)
+        self.previous_button = ttk.Button(toolbar, text="◀ Anterior", command=lambda: self.move(-1))
+        self.previous_button.pack(side=tk.RIGHT)
+        self.position_label = ttk.Label(toolbar, text="")
+        self.position_label.pack(side=tk.RIGHT, padx=5)
+
+        self.text = tk.Text(self.dialog, wrap=tk.NONE, font=("Courier", 10))
+        y_scrollbar = ttk.Scrollbar(self.dialog, orient=tk.VERTICAL, command=self.text.yview)
+        self.text.configure(yscrollcommand=y_scrollbar.set)
+        y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text.pack(fill=tk.BOTH, expand=True, padx=(5, 0), pady=(0, 5))
+        self.show()
+
+    def show(self):
+        """
+        Muestra la página actual en el modo elegido. En modo texto se decodifica el valor
+        completo como UTF-8, ya que una página podría cortar un carácter multibyte.
+        """
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        if self.mode_var.get() == "hex":
+            data = self.read(self.offset, HEX_PAGE)
+            self.text.insert("1.0", hex_dump(data, self.offset))
+            end = self.offset + len(data)
+            self.position_label.config(text=f"bytes {self.offset}–{end} de {self.size}")
+            self.previous_button.config(state="normal" if self.offset > 0 else "disabled")
+            self.next_button.config(state="normal" if end < self.size else "disabled")
+        else:
+            data = self.read(0, self.size)
+            self.text.insert("1.0", data.decode("utf-8", errors="replace"))
+            self.position_label.config(text=f"{self.size} bytes")
+            self.previous_button.config(state="disabled")
+            self.next_button.config(state="disabled")
+        self.text.configure(state=tk.DISABLED)
+
+    def move(self, step):
+        """
+        Cambia de página en la vista hexadecimal.
+
+        Args:
+            step: 1 para avanzar, -1 para retroceder
+        """
+        self.offset = min(max(0, self.offset + step * HEX_PAGE), max(0, self.size - 1))
+        self.show()
+
+    def save(self):
+        """
+        Guarda el valor completo en un archivo, copiándolo por páginas.
+        """
+        path = filedialog.asksaveasfilename(parent=self.dialog)
+        if not path:
+            return
+        try:
+            with open(path, 'wb') as file:
+                for offset in range(0, self.size, HEX_PAGE * 4):
+                    file.write(self.read(offset, HEX_PAGE * 4))
+        except OSError as e:
+            messagebox.showerror("Error", f"Error al guardar el archivo: {str(e)}", parent=self.dialog)
+
+    def close(self):
+        """
+        Cierra la ventana y libera el lector.
+        """
+        if self.close_reader:
+            self.close_reader()
+        self.dialog.destroy()
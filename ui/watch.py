@@ -0,0 +1,71 @@
+import sqlite3
+
+# Milisegundos entre dos comprobaciones de PRAGMA data_version
+WATCH_INTERVAL = 1000
+
+
+class QueryWatcher:
+    """
+    Modo vigilancia de una pestaña de resultados.
+
+    Cada WATCH_INTERVAL milisegundos consulta PRAGMA data_version en la conexión de
+    sesión de la pestaña, que solo cambia cuando otra conexión o proceso confirma
+    cambios en la base de datos. La consulta se vuelve a ejecutar únicamente cuando
+    el valor cambia, de modo que vigilar una base de datos sin cambios apenas cuesta nada.
+    """
+
+    def __init__(self, root, context, rerun, interval=WATCH_INTERVAL):
+        """
+        Inicia la vigilancia.
+
+        Args:
+            root: Ventana principal de Tkinter
+            context: ExecutionContext de la pestaña vigilada
+            rerun: Función sin argumentos que vuelve a ejecutar la consulta de la pestaña
+            interval: Milisegundos entre comprobaciones
+        """
+        self.root = root
+        self.context = context
+        self.rerun = rerun
+        self.interval = interval
+        self.connection = context.connection
+        self.version = self._data_version()
+        self.job = self.root.after(self.interval, self.poll)
+
+    def _data_version(self):
+        """Lee PRAGMA data_version de la conexión de sesión vigilada."""
+        return self.connection.execute("PRAGMA data_version;").fetchone()[0]
+
+    def poll(self):
+        """
+        Comprueba si los datos cambiaron y, si es así, vuelve a ejecutar la consulta.
+        Si la pestaña está ejecutando otra consulta se espera al siguiente intervalo;
+        si la pestaña se cerró o cambió de sesión, la vigilancia termina.
+        """
+        self.job = None
+        context = self.context
+        if context.closed or context.connection is not self.connection:
+            self.stop()
+            return
+        if not context.busy:
+            try:
+                version = self._data_version()
+            except sqlite3.Error:
+                self.stop()  # La sesión se cerró al desconectar la base de datos
+                return
+            if version != self.version:
+                self.version = version
+                self.rerun()
+        self.job = self.root.after(self.interval, self.poll)
+
+    def stop(self):
+        """
+        Detiene la vigilancia.
+        """
+        if self.job:
+            self.root.after_cancel(self.job)
+            self.job = None
+        if self.context.watcher is self:
+            self.context.watcher = None
+            if self.context.results_grid:
+                self.context.results_grid.watch_var.set(False)
@@ -0,0 +1,118 @@
+import statistics
+from utils.result_buffer import sort_key
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional; sin él se usa la biblioteca estándar
+    np = None
+
+# Percentiles que se calculan para las columnas numéricas
+PERCENTILES = (25, 50, 75, 95)
+
+# Número de intervalos de los histogramas
+HISTOGRAM_BINS = 20
+
+def _is_number(value):
+    """Indica si un valor es un número de SQLite (INTEGER o REAL)."""
+    return type(value) in (int, float)
+
+
+def _histogram(values, low, high):
+    """Histograma de HISTOGRAM_BINS intervalos sin NumPy."""
+    counts = [0] * HISTOGRAM_BINS
+    width = (high - low) / HISTOGRAM_BINS or 1
+    for value in values:
+        counts[min(int((value - low) / width), HISTOGRAM_BINS - 1)] += 1
+    edges = [low + width * i for i in range(HISTOGRAM_BINS + 1)]
+    return counts, edges
+
+
+def _numeric_stats(values):
+    """
+    Calcula media, percentiles e histograma de valores numéricos.
+    Con NumPy las operaciones son vectorizadas sobre un arreglo.
+    """
+    if np is not None:
+        array = np.fromiter(values, dtype=float, count=len(values))
+        counts, edges = np.histogram(array, bins=HISTOGRAM_BINS)
+        return {
+            'mean': float(array.mean()),
+            'percentiles': dict(zip(PERCENTILES, (float(p) for p in np.percentile(array, PERCENTILES)))),
+            'histogram': (counts.tolist(), edges.tolist()),
+        }
+
+    low, high = min(values), max(values)
+    if len(values) > 1:
+        cuts = statistics.quantiles(values, n=100, method='inclusive')
+        percentiles = {p: cuts[p - 1] for p in PERCENTILES}
+    else:
+        percentiles = {p: float(values[0]) for p in PERCENTILES}
+    return {
+        'mean': statistics.fmean(values),
+        'percentiles': percentiles,
+        'histogram': _histogram(values, low, high),
+    }
+
+
+def profile_values(name, values):
+    """
+    Calcula el perfil de una columna.
+
+    Parameters:
+    - name: Nombre de la columna.
+    - values: Secuencia con los valores de la columna.
+
+    Devuelve un diccionario con el nombre, tipo, número de filas, nulos, distintos,
+    mínimo, máximo, media, percentiles e histograma (los tres últimos solo para columnas numéricas).
+    """
+    total = len(values)
+    non_null = [value for value in values if value is not None]
+    numeric = [value for value in non_null if _is_number(value)]
+    is_numeric = bool(non_null) and len(numeric) == len(non_null)
+
+    profile = {
+        'name': name,
+        'kind': 'numérico' if is_numeric else ('mixto' if numeric else ('texto' if non_null else 'vacío')),
+        'rows': total,
+        'nulls': total - len(non_null),
+        'distinct': None,
+        'min': None,
+        'max': None,
+        'mean': None,
+        'percentiles': {},
+        'histogram': None,
+    }
+
+    if non_null:
+        if is_numeric and np is not None:
+            array = np.fromiter(numeric, dtype=float, count=len(numeric))
+            profile['distinct'] = int(np.unique(array).size)
+            profile['min'], profile['max'] = min(numeric), max(numeric)
+        else:
+            profile['distinct'] = len(set(non_null))
+            profile['min'] = min(non_null, key=sort_key)
+            profile['max'] = max(non_null, key=sort_key)
+
+    if is_numeric:
+        stats = _numeric_stats(numeric)
+        profile['mean'] = stats['mean']
+        profile['percentiles'] = stats['percentiles']
+        profile['histogram'] = stats['histogram']
+    return profile
+
+
+def profile_columns(result_buffer):
+    """
+    Calcula el perfil de todas las columnas de un resultado a partir de su copia por columnas.
+
+    Parameters:
+    - result_buffer: ResultBuffer con el resultado de la consulta.
+
+    Devuelve una lista de perfiles, uno por columna. Todo se calcula sobre las filas ya
+    obtenidas: volver a ejecutar la consulta en SQLite no evitaría recorrerlas para los
+    percentiles y el histograma.
+    """
+    return [
+        profile_values(name, result_buffer.column(position))
+        for position, name in enumerate(result_buffer.columns)
+    ]
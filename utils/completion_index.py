@@ -0,0 +1,129 @@
+import re
+from bisect import bisect_left
+from utils.sql_lexer import SQL_KEYWORDS
+
+# Referencias a tablas con alias opcional: FROM tabla [AS] alias, JOIN tabla alias...
+TABLE_REFERENCE = re.compile(
+    r'\b(?:FROM|JOIN|UPDATE|INTO)\s+("(?:[^"]|"")+"|[A-Za-z_][\w$]*)(?:\s+(?:AS\s+)?([A-Za-z_][\w$]*))?',
+    re.IGNORECASE
+)
+
+# Palabra que se está escribiendo, con un posible prefijo "alias."
+CURRENT_WORD = re.compile(r'(?:([A-Za-z_][\w$]*|"(?:[^"]|"")+")\.)?([\w$]*)$')
+
+
+def _unquote(name):
+    """Quita las comillas dobles de un identificador."""
+    if name.startswith('"') and name.endswith('"'):
+        return name[1:-1].replace('""', '"')
+    return name
+
+
+class PrefixIndex:
+    """
+    Índice de búsqueda por prefijo sobre un arreglo ordenado de nombres en minúsculas.
+    Cada búsqueda es una bisección más la lectura de los resultados.
+    """
+
+    def __init__(self, names):
+        """
+        Construye el índice.
+
+        Args:
+            names: Nombres a indexar (se eliminan duplicados)
+        """
+        pairs = sorted({(name.lower(), name) for name in names})
+        self.keys = [key for key, _ in pairs]
+        self.names = [name for _, name in pairs]
+
+    def lookup(self, prefix, limit=50):
+        """
+        Devuelve hasta `limit` nombres que empiezan por `prefix` (sin distinguir mayúsculas).
+        """
+        prefix = prefix.lower()
+        start = bisect_left(self.keys, prefix)
+        result = []
+        for position in range(start, min(start + limit, len(self.keys))):
+            if not self.keys[position].startswith(prefix):
+                break
+            result.append(self.names[position])
+        return result
+
+
+class CompletionIndex:
+    """
+    Índice de autocompletado construido una vez a partir del esquema: tablas,
+    columnas (globales y por tabla) y palabras clave SQL.
+    """
+
+    def __init__(self, schema_cache):
+        """
+        Construye el índice a partir de la caché del esquema.
+
+        Args:
+            schema_cache: SchemaCache de la base de datos activa
+        """
+        columns_by_table = schema_cache.all_columns()
+        self.version = schema_cache.version
+        self.tables = PrefixIndex(columns_by_table)
+        self.table_names = {name.lower(): name for name in columns_by_table}
+        self.columns_by_table = {
+            name.lower(): PrefixIndex(columns) for name, columns in columns_by_table.items()
+        }
+        self.all_columns = PrefixIndex(
+            column for columns in columns_by_table.values() for column in columns
+        )
+        self.keywords = PrefixIndex(SQL_KEYWORDS)
+
+    def table_aliases(self, statement):
+        """
+        Extrae las tablas referenciadas en una sentencia y sus alias.
+
+        Returns:
+            Diccionario alias o nombre en minúsculas -> nombre de tabla en minúsculas
+        """
+        aliases = {}
+        for match in TABLE_REFERENCE.finditer(statement):
+            table = _unquote(match.group(1)).lower()
+            aliases[table] = table
+            alias = match.group(2)
+            if alias and alias.upper() not in SQL_KEYWORDS:
+                aliases[alias.lower()] = table
+        return aliases
+
+    def complete(self, statement, text_before_cursor, limit=50):
+        """
+        Devuelve las sugerencias para la palabra que se está escribiendo.
+
+        Args:
+            statement: Texto de la sentencia actual, usado para resolver alias
+            text_before_cursor: Texto de la línea hasta el cursor
+            limit: Número máximo de sugerencias
+
+        Returns:
+            Tupla (prefijo escrito, lista de sugerencias)
+        """
+        match = CURRENT_WORD.search(text_before_cursor)
+        qualifier, prefix = match.group(1), match.group(2)
+        aliases = self.table_aliases(statement)
+
+        if qualifier:
+            # Columnas de la tabla indicada por el alias o nombre antes del punto
+            table = aliases.get(_unquote(qualifier).lower(), _unquote(qualifier).lower())
+            index = self.columns_by_table.get(table)
+            return prefix, index.lookup(prefix, limit) if index else []
+
+        if not prefix:
+            return prefix, []
+
+        # Columnas de las tablas de la sentencia, luego tablas, palabras clave y el resto de columnas
+        suggestions = []
+        for table in dict.fromkeys(aliases.values()):
+            index = self.columns_by_table.get(table)
+            if index:
+                suggestions.extend(index.lookup(prefix, limit))
+        suggestions.extend(self.tables.lookup(prefix, limit))
+        suggestions.extend(self.keywords.lookup(prefix, limit))
+        if not aliases:
+            suggestions.extend(self.all_columns.lookup(prefix, limit))
+        return prefix, list(dict.fromkeys(suggestions))[:limit]
@@ -0,0 +1,336 @@
+import math
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from db.schema import quote_identifier
+
+# Número de rangos en que se divide inicialmente cada tabla
+INITIAL_CHUNKS = 1024
+
+# Cada rango distinto se vuelve a dividir en este número de subrangos
+FANOUT = 16
+
+# Rangos con este número de filas o menos se comparan fila a fila
+LEAF_ROWS = 256
+
+# Número máximo de diferencias que se devuelven por tabla
+MAX_DIFFERENCES = 100000
+
+HASH_FUNCTION = "tsuki_row_hash"
+
+DIFF_INSERT = "insert"
+DIFF_DELETE = "delete"
+DIFF_UPDATE = "update"
+
+
+class RowHash:
+    """
+    Agregado SQL que resume un conjunto de filas en un hash de 64 bits.
+
+    Suma el hash de Python de cada fila, por lo que no depende del orden en que SQLite
+    recorra las filas. El hash de las cadenas cambia entre procesos, pero ambos lados se
+    calculan en el mismo proceso. Como hash(1) == hash(1.0), un entero y un real iguales
+    en una columna sin afinidad solo se distinguen al comparar fila a fila.
+    """
+
+    def __init__(self):
+        self.total = 0
+
+    def step(self, *values):
+        self.total += hash(values)
+
+    def finalize(self):
+        # SQLite solo admite enteros con signo de 64 bits
+        return (self.total & 0xFFFFFFFFFFFFFFFF) - (1 << 63)
+
+
+def register_hash_function(db_connection):
+    """
+    Registra el agregado de hash de filas en una conexión.
+
+    Parameters:
+    - db_connection: Conexión a la base de datos SQLite.
+    """
+    db_connection.create_aggregate(HASH_FUNCTION, -1, RowHash)
+
+
+def table_key(db_connection, table):
+    """
+    Determina la columna entera que identifica cada fila de una tabla: la columna
+    INTEGER PRIMARY KEY si existe, rowid en las demás tablas con rowid, o la clave
+    primaria entera de una sola columna en las tablas WITHOUT ROWID.
+
+    Parameters:
+    - db_connection: Conexión a la base de datos SQLite.
+    - table: Nombre de la tabla.
+
+    Devuelve el nombre de la columna, 'rowid', o None si la tabla no tiene una clave entera.
+    """
+    columns = db_connection.execute(f"PRAGMA table_info({quote_identifier(table)});").fetchall()
+    pk_columns = [column for column in columns if column[5]]
+    has_rowid = True
+    try:
+        db_connection.execute(f"SELECT rowid FROM {quote_identifier(table)} LIMIT 0;")
+    except sqlite3.OperationalError:
+        has_rowid = False
+    if len(pk_columns) == 1 and pk_columns[0][2].upper() == "INTEGER":
+        key = pk_columns[0][1]
+        if has_rowid:
+            return key
+        # En una tabla WITHOUT ROWID la clave no es un alias de rowid y admite valores
+        # de cualquier tipo: solo sirve para los rangos si todos son enteros
+        other = db_connection.execute(
+            f"SELECT 1 FROM {quote_identifier(table)} WHERE typeof({quote_identifier(key)}) <> 'integer' LIMIT 1;"
+        ).fetchone()
+        return key if other is None else None
+    return "rowid" if has_rowid else None
+
+
+def sql_literal(value):
+    """
+    Convierte un valor de Python en un literal SQL.
+
+    Parameters:
+    - value: Valor leído de SQLite.
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NULL"   # SQLite guarda NaN como NULL
+        if math.isinf(value):
+            return "9e999" if value > 0 else "-9e999"
+        return repr(value)
+    if isinstance(value, int):
+        return repr(value)
+    if isinstance(value, bytes):
+        return f"X'{value.hex()}'"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class TableDiff:
+    """
+    Comparación de una tabla entre dos bases de datos mediante hashes de rangos de clave.
+
+    Cada lado calcula, en una sola lectura secuencial y en paralelo con el otro, el hash
+    de cada rango de claves con GROUP BY. Solo los rangos cuyo hash difiere se vuelven a
+    dividir, y los rangos pequeños se comparan fila a fila.
+    """
+
+    def __init__(self, left_connection, right_connection, left_table, right_table=None):
+        """
+        Prepara la comparación.
+
+        Args:
+            left_connection: Conexión de solo lectura al lado de referencia
+            right_connection: Conexión de solo lectura al lado que se compara
+            left_table: Tabla del lado de referencia
+            right_table: Tabla del otro lado (por defecto, la del mismo nombre)
+        """
+        self.connections = (left_connection, right_connection)
+        self.tables = (left_table, right_table or left_table)
+        self.key = None
+        self.columns = None
+        self.differences = []
+        self.truncated = False
+        self.problem = None   # Motivo por el que no se pudo comparar la tabla
+        self.executor = None
+
+    def _query_both(self, sql, params=()):
+        """Ejecuta la misma consulta en los dos lados a la vez, cada una en su hilo."""
+        futures = [
+            self.executor.submit(
+                lambda c, t: c.execute(sql.format(table=quote_identifier(t)), params).fetchall(), connection, table
+            )
+            for connection, table in zip(self.connections, self.tables)
+        ]
+        return [future.result() for future in futures]
+
+    def prepare(self):
+        """
+        Comprueba que las dos tablas tengan las mismas columnas y una clave entera común.
+
+        Returns:
+            True si la tabla puede compararse
+        """
+        left, right = self.connections
+        left_columns = [c[1] for c in left.execute(f"PRAGMA table_info({quote_identifier(self.tables[0])});")]
+        right_columns = [c[1] for c in right.execute(f"PRAGMA table_info({quote_identifier(self.tables[1])});")]
+        if left_columns != right_columns:
+            self.problem = "las columnas no coinciden"
+            return False
+        key = table_key(left, self.tables[0])
+        if key is None or key != table_key(right, self.tables[1]):
+            self.problem = "no tiene una clave entera común"
+            return False
+        self.key = key
+        self.columns = left_columns
+        for connection in self.connections:
+            register_hash_function(connection)
+        return True
+
+    def run(self):
+        """
+        Compara la tabla y guarda las diferencias en self.differences.
+
+        Returns:
+            Lista de (tipo, clave, fila) con tipo DIFF_INSERT, DIFF_DELETE o DIFF_UPDATE
+        """
+        if self.columns is None and not self.prepare():
+            return []
+        with ThreadPoolExecutor(max_workers=2) as self.executor:
+            key = self._key_expression()
+            bounds = self._query_both(f"SELECT min({key}), max({key}) FROM {{table}};")
+            lows = [b[0][0] for b in bounds if b[0][0] is not None]
+            highs = [b[0][1] for b in bounds if b[0][1] is not None]
+            if lows:
+                low, high = min(lows), max(highs)
+                width = max(1, -(-(high - low + 1) // INITIAL_CHUNKS))
+                self._compare_range(low, high, width)
+        self.executor = None
+        return self.differences
+
+    def _key_expression(self):
+        """Expresión SQL de la clave de las filas."""
+        return "rowid" if self.key == "rowid" else quote_identifier(self.key)
+
+    def _compare_range(self, low, high, width):
+        """
+        Calcula el hash de los subrangos de ancho `width` entre low y high en ambos lados
+        y desciende a los que difieren.
+        """
+        key = self._key_expression()
+        column_list = ", ".join(quote_identifier(column) for column in self.columns)
+        sql = (
+            f"SELECT ({key} - ?) / ?, count(*), {HASH_FUNCTION}({key}, {column_list}) "
+            f"FROM {{table}} WHERE {key} BETWEEN ? AND ? GROUP BY 1;"
+        )
+        left, right = self._query_both(sql, (low, width, low, high))
+        left_chunks = {bucket: (count, digest) for bucket, count, digest in left}
+        right_chunks = {bucket: (count, digest) for bucket, count, digest in right}
+
+        for bucket in sorted(left_chunks.keys() | right_chunks.keys()):
+            if self.truncated:
+                return
+            left_chunk = left_chunks.get(bucket, (0, None))
+            right_chunk = right_chunks.get(bucket, (0, None))
+            if left_chunk == right_chunk:
+                continue
+            chunk_low = low + bucket * width
+            chunk_high = min(high, chunk_low + width - 1)
+            if width == 1 or max(left_chunk[0], right_chunk[0]) <= LEAF_ROWS:
+                self._compare_rows(chunk_low, chunk_high)
+            else:
+                self._compare_range(chunk_low, chunk_high, max(1, -(-width // FANOUT)))
+
+    def _compare_rows(self, low, high):
+        """Compara fila a fila un rango pequeño de claves."""
+        key = self._key_expression()
+        column_list = ", ".join(quote_identifier(column) for column in self.columns)
+        left, right = self._query_both(
+            f"SELECT {key}, {column_list} FROM {{table}} WHERE {key} BETWEEN ? AND ?;", (low, high)
+        )
+        left_rows = {row[0]: row[1:] for row in left}
+        right_rows = {row[0]: row[1:] for row in right}
+        for row_key in sorted(left_rows.keys() | right_rows.keys()):
+            left_row = left_rows.get(row_key)
+            right_row = right_rows.get(row_key)
+            # repr distingue tipos que == considera iguales, como 1 y 1.0
+            if repr(left_row) == repr(right_row):
+                continue
+            if len(self.differences) >= MAX_DIFFERENCES:
+                self.truncated = True
+                return
+            if right_row is None:
+                self.differences.append((DIFF_INSERT, row_key, left_row))
+            elif left_row is None:
+                self.differences.append((DIFF_DELETE, row_key, right_row))
+            else:
+                self.differences.append((DIFF_UPDATE, row_key, left_row))
+
+    def to_sql(self):
+        """
+        Genera las sentencias que hacen que la tabla del otro lado quede igual que la de referencia.
+
+        Returns:
+            Texto SQL
+        """
+        table = quote_identifier(self.tables[1])
+        key = self._key_expression()
+        column_list = ", ".join(quote_identifier(column) for column in self.columns)
+        statements = []
+        for kind, row_key, row in self.differences:
+            if kind == DIFF_DELETE:
+                statements.append(f"DELETE FROM {table} WHERE {key} = {row_key};")
+            elif kind == DIFF_INSERT:
+                values = ", ".join(sql_literal(value) for value in row)
+                if self.key == "rowid":
+                    statements.append(
+                        f"INSERT INTO {table} (rowid, {column_list}) VALUES ({row_key}, {values});"
+                    )
+                else:
+                    statements.append(f"INSERT INTO {table} ({column_list}) VALUES ({values});")
+            else:
+                assignments = ", ".join(
+                    f"{quote_identifier(column)} = {sql_literal(value)}" for column, value in zip(self.columns, row)
+                )
+                statements.append(f"UPDATE {table} SET {assignments} WHERE {key} = {row_key};")
+        return "\n".join(statements)
+
+
+def common_tables(left_connection, right_connection):
+    """
+    Devuelve las tablas de usuario de ambas bases de datos.
+
+    Parameters:
+    - left_connection: Conexión al lado de referencia.
+    - right_connection: Conexión al lado que se compara.
+
+    Devuelve una tupla (comunes, solo_izquierda, solo_derecha) de listas ordenadas.
+    """
+    query = "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%';"
+    left = {row[0] for row in left_connection.execute(query)}
+    right = {row[0] for row in right_connection.execute(query)}
+    return sorted(left & right), sorted(left - right), sorted(right - left)
+
+
+def diff_databases(left_connection, right_connection, left_label, right_label, progress=None):
+    """
+    Compara todas las tablas comunes de dos bases de datos y genera el SQL que hace que
+    la segunda quede igual que la primera.
+
+    Parameters:
+    - left_connection: Conexión de solo lectura a la base de datos de referencia.
+    - right_connection: Conexión de solo lectura a la base de datos que se compara.
+    - left_label: Nombre de la base de datos de referencia para el informe.
+    - right_label: Nombre de la otra base de datos para el informe.
+    - progress (opcional): Función que recibe el nombre de cada tabla antes de compararla.
+
+    Devuelve el informe como texto SQL, con el resumen en comentarios.
+    """
+    tables, only_left, only_right = common_tables(left_connection, right_connection)
+    summary = [f"-- Comparación de datos: {left_label} -> {right_label}"]
+    body = []
+    for table in only_left:
+        summary.append(f"-- {table}: solo existe en {left_label}")
+    for table in only_right:
+        summary.append(f"-- {table}: solo existe en {right_label}")
+
+    for table in tables:
+        if progress:
+            progress(table)
+        diff = TableDiff(left_connection, right_connection, table)
+        differences = diff.run()
+        if diff.problem:
+            summary.append(f"-- {table}: no comparada ({diff.problem})")
+            continue
+        counts = {kind: 0 for kind in (DIFF_INSERT, DIFF_DELETE, DIFF_UPDATE)}
+        for kind, _, _ in differences:
+            counts[kind] += 1
+        line = (f"-- {table}: {counts[DIFF_INSERT]} filas que faltan, {counts[DIFF_DELETE]} sobrantes, "
+                f"{counts[DIFF_UPDATE]} distintas")
+        if diff.truncated:
+            line += f" (limitado a {MAX_DIFFERENCES} diferencias)"
+        summary.append(line)
+        if differences:
+            body.append(f"\n-- {table}\n{diff.to_sql()}")
+    return "\n".join(summary) + "\n" + "\n".join(body)
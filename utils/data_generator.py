@@ -0,0 +1,383 @@
+import datetime
+import random
+import string
+import threading
+from db.profiles import TUNING_PROFILES
+from db.schema import quote_identifier, foreign_key_graph
+from utils.lazy_values import column_affinity
+
+# Filas que se generan e insertan con cada executemany
+BATCH_ROWS = 50000
+
+# Proporción de valores NULL en las columnas que los admiten
+NULL_RATIO = 0.05
+
+# Valores distintos que se precalculan para las columnas de texto y fecha no únicas
+TEXT_POOL_SIZE = 1000
+DATETIME_POOL_SIZE = 100000
+
+# Rondas seguidas sin ninguna fila nueva tras las que se da por agotada una clave compuesta
+MAX_STALLED_ROUNDS = 50
+
+# Filas mínimas que se generan en cada ronda de reposición de una clave compuesta
+REFILL_ROWS = 1000
+
+# PRAGMAs de "Carga masiva" que se aplican a la conexión de trabajo. journal_mode se omite
+# porque cambia el archivo y no puede cambiarse mientras otras conexiones lo usan en WAL.
+BULK_PRAGMAS = {
+    pragma: value for pragma, value in TUNING_PROFILES["Carga masiva"].items() if pragma != "journal_mode"
+}
+
+WORDS = (
+    "alfa", "luna", "río", "sol", "nube", "piedra", "mar", "bosque", "cielo", "fuego",
+    "viento", "tierra", "árbol", "flor", "nieve", "lago", "monte", "valle", "isla", "estrella",
+)
+
+
+def dependency_order(tables, graph):
+    """
+    Ordena las tablas para que cada una se rellene después de las tablas a las que referencia.
+
+    Parameters:
+    - tables: Tablas que se van a rellenar.
+    - graph: Grafo de claves foráneas devuelto por foreign_key_graph.
+
+    Las referencias a la propia tabla y los ciclos no impiden el orden: en ese caso las
+    tablas restantes se añaden en el orden recibido.
+    """
+    pending = list(tables)
+    ordered = []
+    while pending:
+        ready = [
+            table for table in pending
+            if all(parent == table or parent not in pending for _, _, parent, _ in graph.get(table, []))
+        ]
+        if not ready:
+            ready = pending[:1]   # Ciclo entre tablas: se rompe por la primera
+        for table in ready:
+            pending.remove(table)
+            ordered.append(table)
+    return ordered
+
+
+class KeySample:
+    """
+    Claves existentes de una columna referenciada, de las que se toman los valores de las
+    claves foráneas. Un rango entero sin huecos se muestrea sin cargarlo en memoria.
+    """
+
+    def __init__(self, db_connection, table, column):
+        """
+        Args:
+            db_connection: Conexión de trabajo
+            table: Tabla referenciada
+            column: Columna referenciada (None para la clave primaria)
+        """
+        if column is None:
+            pk = [row[1] for row in db_connection.execute(
+                "SELECT pk, name FROM pragma_table_info(?) WHERE pk > 0 ORDER BY pk;", (table,)
+            )]
+            column = pk[0] if pk else "rowid"
+        column = quote_identifier(column) if column != "rowid" else column
+        source = quote_identifier(table)
+        self.range = None
+        self.values = None
+        low, high, count, integers = db_connection.execute(
+            f"SELECT min({column}), max({column}), count(DISTINCT {column}), "
+            f"count(*) FILTER (WHERE typeof({column}) = 'integer') = count({column}) FROM {source};"
+        ).fetchone()
+        if count and integers and high - low + 1 == count:
+            self.range = (low, high)
+        else:
+            self.values = [row[0] for row in db_connection.execute(
+                f"SELECT DISTINCT {column} FROM {source} WHERE {column} IS NOT NULL;"
+            )]
+        self.size = count or 0
+
+    def choices(self, count):
+        """Devuelve `count` claves al azar (con repetición)."""
+        if self.range:
+            low, high = self.range
+            return random.choices(range(low, high + 1), k=count)
+        return random.choices(self.values, k=count)
+
+    def distinct(self, count, offset):
+        """Devuelve `count` claves distintas, empezando por la que ocupa la posición `offset`."""
+        if self.range:
+            low, high = self.range
+            return list(range(low + offset, low + offset + count))
+        return self.values[offset:offset + count]
+
+
+class ColumnGenerator:
+    """
+    Generador de los valores de una columna según su tipo declarado, sus restricciones
+    NOT NULL, PRIMARY KEY y UNIQUE, y la clave foránea que la referencia, si la hay.
+    """
+
+    def __init__(self, column, declared_type, not_null, unique, start, keys=None):
+        """
+        Args:
+            column: Nombre de la columna
+            declared_type: Tipo declarado
+            not_null: True si la columna no admite NULL
+            unique: True si los valores no pueden repetirse
+            start: Primer valor de la secuencia de los valores únicos
+            keys: KeySample de la tabla referenciada, si la columna es una clave foránea
+        """
+        self.column = column
+        self.declared = (declared_type or "").upper()
+        self.affinity = column_affinity(declared_type)
+        self.nullable = not not_null
+        self.unique = unique
+        self.position = start
+        self.keys = keys
+        self.pool = None   # Valores precalculados de las columnas de texto y fecha
+
+    def values(self, count):
+        """Genera los valores de las `count` filas siguientes."""
+        start = self.position
+        self.position += count
+        if self.keys is not None and self.keys.size == 0:
+            return [None] * count   # La tabla referenciada está vacía y la columna admite NULL
+        if self.keys is not None:
+            if self.unique:
+                if start + count > self.keys.size:
+                    raise ValueError(
+                        f"La columna {self.column} es única y solo hay {self.keys.size} claves padre"
+                    )
+                return self.keys.distinct(count, start)
+            values = self.keys.choices(count)
+        elif self.unique:
+            values = self._sequence(start, count)
+        else:
+            values = self._random(count)
+        if self.nullable and not self.unique:
+            for index in random.sample(range(count), int(count * NULL_RATIO)):
+                values[index] = None
+        return values
+
+    def _sequence(self, start, count):
+        """Valores distintos y ordenados para columnas únicas."""
+        if self.affinity in ("INTEGER", "NUMERIC", "REAL"):
+            return list(range(start + 1, start + count + 1))
+        if self.affinity == "BLOB":
+            return [index.to_bytes(8, "big") for index in range(start, start + count)]
+        return [f"{self.column}_{index}" for index in range(start + 1, start + count + 1)]
+
+    def _random(self, count):
+        """Valores al azar según el tipo declarado de la columna."""
+        declared = self.declared
+        if "BOOL" in declared:
+            return random.choices((0, 1), k=count)
+        if self.affinity == "INTEGER" and "DATE" not in declared and "TIME" not in declared:
+            return random.choices(range(1000001), k=count)
+        if self.affinity in ("REAL", "NUMERIC") and "DATE" not in declared and "TIME" not in declared:
+            return [round(random.random() * 10000, 2) for _ in range(count)]
+        if self.affinity == "BLOB" and declared:
+            return [random.randbytes(16) for _ in range(count)]
+        if self.pool is None:
+            self.pool = self._make_pool()
+        return random.choices(self.pool, k=count)
+
+    def _make_pool(self):
+        """Precalcula los valores entre los que se eligen los de las columnas de texto y fecha."""
+        if "DATE" in self.declared or "TIME" in self.declared:
+            base = datetime.datetime(2020, 1, 1)
+            moments = [
+                base + datetime.timedelta(seconds=random.randrange(5 * 365 * 86400))
+                for _ in range(DATETIME_POOL_SIZE)
+            ]
+            if "TIME" in self.declared:
+                return [moment.isoformat(" ") for moment in moments]
+            return sorted({moment.date().isoformat() for moment in moments})
+        return [
+            f"{random.choice(WORDS)} {random.choice(WORDS)} {''.join(random.choices(string.ascii_lowercase, k=4))}"
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+
+
+class DataGenerator:
+    """
+    Generador de datos de prueba para las tablas de una base de datos.
+
+    Lee las columnas, claves y claves foráneas del catálogo, rellena las tablas padre
+    antes que sus hijas, toma los valores de las claves foráneas de las claves que ya
+    existen en la tabla padre e inserta con executemany por lotes de BATCH_ROWS filas,
+    todo en una única transacción y con los PRAGMAs de carga masiva.
+    """
+
+    def __init__(self, db_connection, row_counts):
+        """
+        Args:
+            db_connection: Conexión de trabajo con permiso de escritura
+            row_counts: Diccionario tabla -> número de filas a generar
+        """
+        self.db_connection = db_connection
+        self.row_counts = row_counts
+        self.cancelled = threading.Event()
+        self.inserted = {}   # Tabla -> filas insertadas
+
+    def cancel(self):
+        """
+        Interrumpe la generación. Puede llamarse desde otro hilo; la transacción se deshace.
+        """
+        self.cancelled.set()
+        self.db_connection.interrupt()
+
+    def run(self, progress=None):
+        """
+        Genera e inserta las filas. Debe ejecutarse en un hilo de trabajo.
+
+        Args:
+            progress: Función opcional que recibe (tabla, filas insertadas, filas pedidas)
+                      tras cada lote
+
+        Returns:
+            True si terminó, False si se canceló (la base de datos queda como estaba)
+        """
+        connection = self.db_connection
+        for pragma, value in BULK_PRAGMAS.items():
+            connection.execute(f"PRAGMA {pragma}={value};")
+        graph = foreign_key_graph(connection)
+        try:
+            for table in dependency_order(list(self.row_counts), graph):
+                if self.cancelled.is_set():
+                    connection.rollback()
+                    return False
+                self._fill_table(table, graph.get(table, []), progress)
+            connection.commit()
+            return True
+        except BaseException:
+            connection.rollback()
+            if self.cancelled.is_set():
+                return False
+            raise
+
+    def _column_generators(self, table, foreign_keys):
+        """Crea un ColumnGenerator por cada columna que hay que rellenar."""
+        connection = self.db_connection
+        columns = connection.execute(
+            "SELECT name, type, \"notnull\", pk, hidden FROM pragma_table_xinfo(?) ORDER BY cid;", (table,)
+        ).fetchall()
+        pk_columns = [name for name, _, _, pk, _ in columns if pk]
+        unique_columns = set()
+        composite_keys = []   # Columnas de las claves PRIMARY KEY y UNIQUE de varias columnas
+        pk_index = False   # Las tablas WITHOUT ROWID tienen un índice de origen 'pk'
+        indexes = connection.execute("SELECT name, \"unique\", origin FROM pragma_index_list(?);", (table,)).fetchall()
+        for index_name, unique, origin in indexes:
+            pk_index = pk_index or origin == "pk"
+            if not unique:
+                continue
+            index_columns = [name for (name,) in connection.execute(
+                "SELECT name FROM pragma_index_info(?) ORDER BY seqno;", (index_name,)
+            )]
+            if len(index_columns) == 1:
+                unique_columns.update(index_columns)
+            elif None not in index_columns:   # Los índices sobre expresiones no se comprueban
+                composite_keys.append(index_columns)
+        rowid_alias = (
+            len(pk_columns) == 1 and not pk_index
+            and next(declared for name, declared, _, _, _ in columns if name == pk_columns[0]).upper() == "INTEGER"
+        )
+        # Con varias claves foráneas sobre la misma columna basta con respetar la primera
+        references = {}
+        for _, from_column, parent, to_column in foreign_keys:
+            references.setdefault(from_column, (parent, to_column))
+
+        source = quote_identifier(table)
+        existing = connection.execute(f"SELECT count(*) FROM {source};").fetchone()[0]
+        generators = []
+        for name, declared, not_null, pk, hidden in columns:
+            if hidden:
+                continue   # Columnas generadas
+            if rowid_alias and pk:
+                continue   # SQLite asigna el rowid
+            unique = name in unique_columns or (pk and len(pk_columns) == 1)
+            start = existing   # Las filas existentes ya usan los primeros valores
+            keys = None
+            if name in references:
+                parent, to_column = references[name]
+                keys = KeySample(connection, parent, to_column)
+                if keys.size == 0 and not_null:
+                    raise ValueError(f"{table}.{name} referencia a {parent}, que no tiene filas")
+            elif unique and column_affinity(declared) in ("INTEGER", "NUMERIC", "REAL"):
+                # Las secuencias numéricas continúan tras el mayor valor existente
+                start = connection.execute(
+                    f"SELECT coalesce(max({quote_identifier(name)}), 0) FROM {source};"
+                ).fetchone()[0]
+                start = int(start) if isinstance(start, (int, float)) else existing
+            generators.append(ColumnGenerator(name, declared, not_null or pk, unique, start, keys))
+
+        # Una clave compuesta solo hay que comprobarla si ninguna de sus columnas es única por
+        # sí misma y SQLite no asigna ninguna de ellas (rowid, columnas generadas)
+        positions = {generator.column: position for position, generator in enumerate(generators)}
+        unique_keys = [
+            [positions[name] for name in key_columns] for key_columns in composite_keys
+            if not any(name in unique_columns or name not in positions for name in key_columns)
+        ]
+        return generators, unique_keys
+
+    def _existing_keys(self, table, generators, key):
+        """Devuelve el conjunto de combinaciones de una clave compuesta que ya hay en la tabla."""
+        columns = ", ".join(quote_identifier(generators[position].column) for position in key)
+        return {
+            row for row in self.db_connection.execute(f"SELECT {columns} FROM {quote_identifier(table)};")
+            if None not in row
+        }
+
+    def _distinct_rows(self, table, generators, unique_keys, seen, count):
+        """
+        Genera `count` filas que no repiten ninguna combinación de las claves compuestas:
+        las filas repetidas se descartan y se generan otras hasta completar el lote.
+        """
+        rows = []
+        stalled = 0
+        while len(rows) < count:
+            accepted = len(rows)
+            wanted = count - accepted if not rows else max(count - accepted, REFILL_ROWS)
+            for row in zip(*(generator.values(wanted) for generator in generators)):
+                values = [tuple(row[position] for position in key) for key in unique_keys]
+                # SQLite no considera repetidas las combinaciones con algún NULL
+                if any(None not in value and value in keys for value, keys in zip(values, seen)):
+                    continue
+                for value, keys in zip(values, seen):
+                    if None not in value:
+                        keys.add(value)
+                rows.append(row)
+                if len(rows) == count:
+                    break
+            stalled = stalled + 1 if len(rows) == accepted else 0
+            if stalled >= MAX_STALLED_ROUNDS:
+                raise ValueError(f"No hay suficientes combinaciones distintas para las claves compuestas de {table}")
+            if self.cancelled.is_set():
+                raise InterruptedError
+        return rows
+
+    def _fill_table(self, table, foreign_keys, progress):
+        """Inserta las filas pedidas de una tabla por lotes."""
+        generators, unique_keys = self._column_generators(table, foreign_keys)
+        seen = [self._existing_keys(table, generators, key) for key in unique_keys]
+        total = self.row_counts[table]
+        if generators:
+            columns = ", ".join(quote_identifier(generator.column) for generator in generators)
+            placeholders = ", ".join("?" for _ in generators)
+            sql = f"INSERT INTO {quote_identifier(table)} ({columns}) VALUES ({placeholders});"
+        else:
+            sql = f"INSERT INTO {quote_identifier(table)} DEFAULT VALUES;"
+        inserted = 0
+        while inserted < total:
+            if self.cancelled.is_set():
+                raise InterruptedError
+            count = min(BATCH_ROWS, total - inserted)
+            if unique_keys:
+                rows = self._distinct_rows(table, generators, unique_keys, seen, count)
+            elif generators:
+                rows = zip(*(generator.values(count) for generator in generators))
+            else:
+                rows = (() for _ in range(count))
+            self.db_connection.executemany(sql, rows)
+            inserted += count
+            self.inserted[table] = inserted
+            if progress:
+                progress(table, inserted, total)
@@ -1,6 +1,8 @@
 import sqlite3
 from graphviz import Digraph
 from tkinter import filedialog
+from db.schema import foreign_key_graph
+from utils.instrumentation import timed
 
 def generate_erd_dialog(db_connection, generate_erd_func):
     """
@@ -24,6 +26,7 @@ def generate_erd_dialog(db_connection, generate_erd_func):
         file_format = 'png' if save_path.endswith('.png') else 'pdf'  # Establece el formato del archivo
         generate_erd_func(db_connection, save_path, file_format)  # Genera y guarda el ERD
 
+@timed()
 def generate_erd(db_connection, save_path, file_format='png'):
     """
     Genera un diagrama de relaciones de entidades (ERD) a partir de la base de datos y lo guarda en un archivo.
@@ -64,16 +67,9 @@ def generate_erd(db_connection, save_path, file_format='png'):
         dot.node(table_name, label=f"{{{table_label}}}", shape='record')  # Define el nodo como un 'record' (tipo tabla)
 
     # Procesar claves foráneas para crear relaciones entre tablas
-    for (table_name,) in tables:
-        cursor.execute(f"PRAGMA foreign_key_list({table_name});")  # Consulta las claves foráneas de la tabla
-        foreign_keys = cursor.fetchall()
-        
+    for from_table, foreign_keys in foreign_key_graph(db_connection).items():
         # Crear las conexiones de claves foráneas entre las tablas
-        for fk in foreign_keys:
-            from_table = table_name
-            from_column = fk[3]  # Columna de la clave foránea
-            to_table = fk[2]  # Tabla de la clave foránea
-            to_column = fk[4]  # Columna referenciada por la clave foránea
+        for _, from_column, to_table, to_column in foreign_keys:
             dot.edge(f"{from_table}:{from_column}", f"{to_table}:{to_column}", arrowhead='normal', color='blue', label='FK')  # Relación de FK
 
     # Guardar el diagrama generado en el archivo especificado
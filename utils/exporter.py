@@ -1,5 +1,76 @@
 import sqlite3
 from tkinter import filedialog, messagebox
+from utils.instrumentation import timed
+
+def ask_export_path():
+    """
+    Muestra el cuadro de diálogo para elegir el archivo SQL de destino de la exportación.
+
+    Returns:
+    - Ruta seleccionada, o una cadena vacía si el usuario cancela.
+    """
+    return filedialog.asksaveasfilename(
+        title="Exportar Base de Datos",
+        defaultextension=".sql",
+        filetypes=[("Archivos SQL", "*.sql")]
+    )
+
+@timed("export_database")
+def write_sql_dump(db_connection, sql_file_path):
+    """
+    Escribe la definición de las tablas y sus datos en un archivo SQL.
+    No usa widgets, por lo que puede ejecutarse en un hilo de trabajo.
+
+    Parameters:
+    - db_connection: Conexión a la base de datos SQLite.
+    - sql_file_path: Ruta del archivo SQL de destino.
+    """
+    with db_connection:
+        cursor = db_connection.cursor()
+
+        # Configura la conexión para manejar caracteres UTF-8
+        cursor.execute("PRAGMA encoding='UTF-8';")
+
+        # Consulta las tablas excluyendo sqlite_sequence
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name != 'sqlite_sequence';")
+        tables = [row[0] for row in cursor.fetchall()]
+
+        # Abre el archivo en modo escritura con codificación UTF-8
+        with open(sql_file_path, "w", encoding='utf-8') as f:
+            # Escribe un encabezado para establecer la codificación
+            f.write("-- coding: utf-8\n")
+            f.write("PRAGMA encoding='UTF-8';\n\n")
+
+            for table in tables:
+                # Obtiene y escribe la definición de la tabla
+                cursor.execute(f"SELECT sql FROM sqlite_master WHERE name = ?", (table,))
+                ddl = cursor.fetchone()[0]
+                f.write(f"{ddl};\n\n") 
+
+                # Obtiene y escribe los datos
+                cursor.execute(f"SELECT * FROM {table}")
+                rows = cursor.fetchall()
+
+                if rows:
+                    columns = [description[0] for description in cursor.description]
+
+                    for row in rows:
+                        # Maneja valores especiales y escapa caracteres
+                        values = []
+                        for value in row:
+                            if value is None:
+                                values.append("NULL")
+                            elif isinstance(value, (int, float)):
+                                values.append(str(value))
+                            else:
+                                # Escapa comillas simples y caracteres especiales
+                                escaped_value = str(value).replace("'", "''")
+                                values.append(f"'{escaped_value}'")
+
+                        insert_statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(values)});"
+                        f.write(f"{insert_statement}\n")
+
+                    f.write("\n")  # Línea en blanco entre tablas
 
 def export_database(db_connection):
     """
@@ -8,68 +79,17 @@ def export_database(db_connection):
     Parameters:
     - db_connection: Conexión a la base de datos SQLite.
     """
-    sql_file_path = filedialog.asksaveasfilename(
-        title="Exportar Base de Datos",
-        defaultextension=".sql",
-        filetypes=[("Archivos SQL", "*.sql")]
-    )
+    sql_file_path = ask_export_path()
     
     if sql_file_path:  # Si se seleccionó una ruta para guardar el archivo
         try:
-            with db_connection:
-                cursor = db_connection.cursor()
-                
-                # Configura la conexión para manejar caracteres UTF-8
-                cursor.execute("PRAGMA encoding='UTF-8';")
-                
-                # Consulta las tablas excluyendo sqlite_sequence
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name != 'sqlite_sequence';")
-                tables = [row[0] for row in cursor.fetchall()]
-                
-                # Abre el archivo en modo escritura con codificación UTF-8
-                with open(sql_file_path, "w", encoding='utf-8') as f:
-                    # Escribe un encabezado para establecer la codificación
-                    f.write("-- coding: utf-8\n")
-                    f.write("PRAGMA encoding='UTF-8';\n\n")
-                    
-                    for table in tables:
-                        # Obtiene y escribe la definición de la tabla
-                        cursor.execute(f"SELECT sql FROM sqlite_master WHERE name = ?", (table,))
-                        ddl = cursor.fetchone()[0]
-                        f.write(f"{ddl};\n\n") 
-                        
-                        # Obtiene y escribe los datos
-                        cursor.execute(f"SELECT * FROM {table}")
-                        rows = cursor.fetchall()
-                        
-                        if rows:
-                            columns = [description[0] for description in cursor.description]
-                            
-                            for row in rows:
-                                # Maneja valores especiales y escapa caracteres
-                                values = []
-                                for value in row:
-                                    if value is None:
-                                        values.append("NULL")
-                                    elif isinstance(value, (int, float)):
-                                        values.append(str(value))
-                                    else:
-                                        # Escapa comillas simples y caracteres especiales
-                                        escaped_value = str(value).replace("'", "''")
-                                        values.append(f"'{escaped_value}'")
-                                
-                                insert_statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(values)});"
-                                f.write(f"{insert_statement}\n")
-                            
-                            f.write("\n")  # Línea en blanco entre tablas
-                
-                messagebox.showinfo(
-                    "Exportación Exitosa",
-                    f"La base de datos se ha exportado correctamente a:\n{sql_file_path}"
-                )
-                
+            write_sql_dump(db_connection, sql_file_path)
+            messagebox.showinfo(
+                "Exportación Exitosa",
+                f"La base de datos se ha exportado correctamente a:\n{sql_file_path}"
+            )
         except Exception as e:
             messagebox.showerror(
                 "Error de Exportación",
                 f"Error al exportar la base de datos:\n{str(e)}"
-            )
\ No newline at end of file
+            )
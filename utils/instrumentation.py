@@ -0,0 +1,206 @@
+import cProfile
+import functools
+import io
+import math
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Duraciones que se conservan por métrica para calcular percentiles
+MAX_SAMPLES = 1000
+
+# Milisegundos entre dos latidos del monitor de retardo del bucle de eventos
+HEARTBEAT_INTERVAL = 200
+
+# Nombre de la métrica del retardo del bucle de eventos
+LAG_METRIC = "retardo del bucle de eventos"
+
+# Funciones que se muestran al detener una captura de cProfile
+PROFILE_LINES = 40
+
+
+def percentile(samples, fraction):
+    """
+    Devuelve el percentil de una lista ordenada por el método del rango más cercano.
+
+    Parameters:
+    - samples: Lista ordenada de valores (no vacía).
+    - fraction: Percentil entre 0 y 1 (0.5 para la mediana).
+    """
+    return samples[max(0, math.ceil(fraction * len(samples)) - 1)]
+
+
+class Metrics:
+    """
+    Registro de duraciones por nombre de acción, seguro entre hilos.
+
+    Cada métrica conserva el número total de mediciones y las MAX_SAMPLES más recientes,
+    con las que se calculan p50, p99 y el máximo.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}   # Nombre -> deque de duraciones en segundos
+        self.counts = {}    # Nombre -> número total de mediciones
+
+    def record(self, name, seconds):
+        """
+        Añade una medición.
+
+        Args:
+            name: Nombre de la acción
+            seconds: Duración en segundos
+        """
+        with self.lock:
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=MAX_SAMPLES)
+                self.counts[name] = 0
+            self.samples[name].append(seconds)
+            self.counts[name] += 1
+
+    def summary(self):
+        """
+        Resume las métricas registradas.
+
+        Returns:
+            Lista de diccionarios con 'name', 'count', 'p50', 'p99' y 'max' (en segundos),
+            ordenada de mayor a menor p99
+        """
+        with self.lock:
+            snapshot = {name: (sorted(samples), self.counts[name]) for name, samples in self.samples.items()}
+        result = [
+            {
+                'name': name,
+                'count': count,
+                'p50': percentile(samples, 0.5),
+                'p99': percentile(samples, 0.99),
+                'max': samples[-1],
+            }
+            for name, (samples, count) in snapshot.items() if samples
+        ]
+        result.sort(key=lambda metric: metric['p99'], reverse=True)
+        return result
+
+    def reset(self):
+        """Borra todas las mediciones."""
+        with self.lock:
+            self.samples = {}
+            self.counts = {}
+
+
+# Registro global de la aplicación
+metrics = Metrics()
+
+
+@contextmanager
+def span(name):
+    """
+    Context manager que mide la duración de un bloque y la registra en `metrics`.
+
+    Parameters:
+    - name: Nombre de la acción.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.record(name, time.perf_counter() - started)
+
+
+def timed(name=None):
+    """
+    Decorador que mide cada llamada a una función o método y la registra en `metrics`.
+
+    Parameters:
+    - name (opcional): Nombre de la acción (por defecto, el de la función).
+    """
+    def decorate(function):
+        metric = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                metrics.record(metric, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+class LagMonitor:
+    """
+    Monitor del retardo del bucle de eventos de Tkinter.
+
+    Programa un latido con `after` cada HEARTBEAT_INTERVAL milisegundos y registra cuánto
+    se retrasó respecto a lo previsto: un retardo alto significa que algún manejador
+    ocupó el hilo de la interfaz y la aplicación no respondía mientras tanto.
+    """
+
+    def __init__(self, root, interval=HEARTBEAT_INTERVAL):
+        """
+        Args:
+            root: Ventana principal de Tkinter
+            interval: Milisegundos entre latidos
+        """
+        self.root = root
+        self.interval = interval
+        self.job = None
+        self.expected = None
+
+    def start(self):
+        """Inicia el monitor."""
+        if self.job is None:
+            self.expected = time.perf_counter() + self.interval / 1000
+            self.job = self.root.after(self.interval, self.beat)
+
+    def beat(self):
+        """Registra el retardo del latido actual y programa el siguiente."""
+        now = time.perf_counter()
+        metrics.record(LAG_METRIC, max(0.0, now - self.expected))
+        self.expected = now + self.interval / 1000
+        self.job = self.root.after(self.interval, self.beat)
+
+    def stop(self):
+        """Detiene el monitor."""
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+
+
+class ProfileCapture:
+    """
+    Captura opcional con cProfile del hilo de la interfaz, para localizar bloqueos en
+    equipos donde no hay depurador. Solo perfila el hilo que la inicia.
+    """
+
+    def __init__(self):
+        self.profiler = None
+
+    @property
+    def active(self):
+        """True mientras hay una captura en curso."""
+        return self.profiler is not None
+
+    def start(self):
+        """Inicia la captura."""
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop(self):
+        """
+        Detiene la captura.
+
+        Returns:
+            Texto con las funciones de mayor tiempo acumulado, o cadena vacía si no había captura
+        """
+        if self.profiler is None:
+            return ""
+        self.profiler.disable()
+        output = io.StringIO()
+        pstats.Stats(self.profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_LINES)
+        self.profiler = None
+        return output.getvalue()
@@ -0,0 +1,105 @@
+import sqlite3
+import threading
+from db.schema import quote_identifier, foreign_key_graph
+
+CHECK_QUICK = "quick_check"
+CHECK_FULL = "integrity_check"
+
+# Número máximo de hallazgos que se informan por tabla y comprobación
+MAX_FINDINGS = 1000
+
+FINDING_INTEGRITY = "integridad"
+FINDING_FOREIGN_KEY = "clave foránea"
+
+
+class IntegrityChecker:
+    """
+    Comprobación de integridad y de claves foráneas de una base de datos, tabla a tabla.
+
+    Cada tabla se comprueba con PRAGMA quick_check(tabla) o integrity_check(tabla) y, si
+    declara claves foráneas, con PRAGMA foreign_key_check(tabla). Los hallazgos se entregan
+    a medida que aparecen y la comprobación puede cancelarse entre tablas o, con
+    Connection.interrupt, en mitad de una tabla grande.
+    """
+
+    def __init__(self, db_connection, check=CHECK_QUICK):
+        """
+        Args:
+            db_connection: Conexión de trabajo (puede ser de solo lectura)
+            check: CHECK_QUICK o CHECK_FULL
+        """
+        self.db_connection = db_connection
+        self.check = check
+        self.cancelled = threading.Event()
+        self.findings = 0
+        self.findings_in_table = 0
+
+    def cancel(self):
+        """
+        Pide que la comprobación termine. Puede llamarse desde otro hilo.
+        """
+        self.cancelled.set()
+        self.db_connection.interrupt()
+
+    def run(self, report, progress=None):
+        """
+        Comprueba todas las tablas. Debe ejecutarse en un hilo de trabajo.
+
+        Args:
+            report: Función que recibe cada hallazgo como (tabla, tipo, mensaje)
+            progress: Función opcional que recibe (índice, total, tabla) antes de cada tabla
+
+        Returns:
+            True si la comprobación terminó, False si se canceló
+        """
+        graph = foreign_key_graph(self.db_connection)
+        tables = [table for table in graph if not table.startswith("sqlite_")]
+        for index, table in enumerate(tables):
+            if self.cancelled.is_set():
+                return False
+            if progress:
+                progress(index, len(tables), table)
+            try:
+                self._check_table(table, report)
+                if graph[table]:
+                    self._check_foreign_keys(table, graph[table], report)
+            except sqlite3.OperationalError:
+                if self.cancelled.is_set():
+                    return False
+                raise
+        if progress:
+            progress(len(tables), len(tables), None)
+        return True
+
+    def _check_table(self, table, report):
+        """Ejecuta quick_check o integrity_check limitado a una tabla y sus índices."""
+        self.findings_in_table = 0
+        cursor = self.db_connection.execute(f"PRAGMA {self.check}({quote_identifier(table)});")
+        for (message,) in cursor:
+            if message == "ok":
+                continue
+            self._report(report, table, FINDING_INTEGRITY, message)
+            if self.findings_in_table >= MAX_FINDINGS:
+                break
+
+    def _check_foreign_keys(self, table, foreign_keys, report):
+        """Ejecuta foreign_key_check sobre una tabla, entregando las filas huérfanas a medida que se leen."""
+        columns = {}
+        for fk_id, from_column, to_table, to_column in foreign_keys:
+            columns.setdefault(fk_id, []).append((from_column, to_column))
+        self.findings_in_table = 0
+        cursor = self.db_connection.execute(f"PRAGMA foreign_key_check({quote_identifier(table)});")
+        for _, rowid, parent, fk_id in cursor:
+            pairs = columns.get(fk_id, [])
+            detail = ", ".join(f"{source} -> {parent}.{target or 'PK'}" for source, target in pairs)
+            row = f"rowid {rowid}" if rowid is not None else "fila sin rowid"
+            self._report(report, table, FINDING_FOREIGN_KEY, f"{row}: sin fila padre ({detail or parent})")
+            if self.findings_in_table >= MAX_FINDINGS:
+                self._report(report, table, FINDING_FOREIGN_KEY, f"se omiten más filas tras {MAX_FINDINGS}")
+                break
+
+    def _report(self, report, table, kind, message):
+        """Cuenta y entrega un hallazgo."""
+        self.findings += 1
+        self.findings_in_table += 1
+        report(table, kind, message)
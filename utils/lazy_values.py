@@ -0,0 +1,255 @@
+import re
+import sqlite3
+from db.schema import quote_identifier
+
+# Caracteres (TEXT) o bytes (BLOB) que se leen de cada valor al mostrar una tabla
+PREVIEW_LENGTH = 256
+
+# Bytes que se leen de cada vez al cargar un valor completo
+BLOB_CHUNK = 64 * 1024
+
+
+def _format_size(size):
+    """Formatea un tamaño en bytes con la unidad más adecuada."""
+    for unit in ("bytes", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size} {unit}" if unit == "bytes" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class LazyValue:
+    """
+    Valor grande de una celda del que solo se leyó el principio.
+    Recuerda la tabla, la columna y el rowid de origen para poder cargar el valor
+    completo bajo demanda con E/S incremental de BLOB.
+    """
+
+    __slots__ = ("prefix", "length", "table", "column", "rowid")
+
+    def __init__(self, prefix, length, table, column, rowid):
+        """
+        Args:
+            prefix: Primeros caracteres o bytes del valor
+            length: Longitud completa (caracteres para TEXT, bytes para BLOB)
+            table: Tabla de origen
+            column: Columna de origen
+            rowid: rowid de la fila de origen
+        """
+        self.prefix = prefix
+        self.length = length
+        self.table = table
+        self.column = column
+        self.rowid = rowid
+
+    @property
+    def is_blob(self):
+        """True si el valor es un BLOB."""
+        return isinstance(self.prefix, bytes)
+
+    def __str__(self):
+        # Texto que muestra la celda de la tabla de resultados
+        if self.is_blob:
+            return f"<BLOB {_format_size(self.length)}>"
+        return f"{self.prefix[:80]}… <{self.length} caracteres>"
+
+    def __repr__(self):
+        return f"LazyValue({self.table!r}, {self.column!r}, {self.rowid!r}, {self.length})"
+
+    def _key(self):
+        return (self.is_blob, self.prefix, self.length)
+
+    def __eq__(self, other):
+        return isinstance(other, LazyValue) and self._key() == other._key()
+
+    def __lt__(self, other):
+        if isinstance(other, LazyValue):
+            return self._key() < other._key()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._key())
+
+
+def column_affinity(declared_type):
+    """
+    Devuelve la afinidad de una columna según las reglas de SQLite para su tipo declarado.
+
+    Parameters:
+    - declared_type: Tipo declarado de la columna (puede estar vacío).
+    """
+    declared = (declared_type or "").upper()
+    if "INT" in declared:
+        return "INTEGER"
+    if "CHAR" in declared or "CLOB" in declared or "TEXT" in declared:
+        return "TEXT"
+    if not declared or "BLOB" in declared:
+        return "BLOB"
+    if "REAL" in declared or "FLOA" in declared or "DOUB" in declared:
+        return "REAL"
+    return "NUMERIC"
+
+
+# SELECT * de una sola tabla, con un WHERE, ORDER BY o LIMIT opcional al final
+SIMPLE_TABLE_SELECT = re.compile(
+    r'\s*SELECT\s+\*\s+FROM\s+("(?:[^"]|"")+"|[A-Za-z_][A-Za-z0-9_$]*)'
+    r'\s*((?:WHERE|ORDER\s+BY|LIMIT)\b[^;]*)?;?\s*',
+    re.IGNORECASE | re.DOTALL
+)
+
+# ORDER BY por posición: dejaría de apuntar a la misma columna en la consulta de vista previa
+POSITIONAL_ORDER = re.compile(r"ORDER\s+BY\s+\d", re.IGNORECASE)
+
+
+def simple_table_select(sql):
+    """
+    Reconoce un SELECT * sobre una sola tabla, que puede leerse con TablePreview.
+
+    Parameters:
+    - sql: Texto SQL del editor.
+
+    Devuelve una tupla (tabla, resto de la consulta tras el nombre de la tabla), o None
+    si la consulta es de otro tipo.
+    """
+    match = SIMPLE_TABLE_SELECT.fullmatch(sql)
+    if not match:
+        return None
+    table, suffix = match.group(1), (match.group(2) or "").strip()
+    if POSITIONAL_ORDER.search(suffix):
+        return None
+    if table.startswith('"'):
+        table = table[1:-1].replace('""', '"')
+    return table, suffix
+
+
+class TablePreview:
+    """
+    Consulta de una tabla que lee solo el principio de los valores TEXT y BLOB grandes.
+
+    Las columnas con afinidad TEXT o BLOB se proyectan como substr(...) y length(...);
+    los valores que superan PREVIEW_LENGTH se convierten en LazyValue, que la tabla de
+    resultados muestra como un marcador. El resto de columnas se leen tal cual.
+    """
+
+    def __init__(self, table, columns, suffix=""):
+        """
+        Args:
+            table: Nombre de la tabla (con rowid)
+            columns: Lista de (nombre, tipo declarado) de sus columnas
+            suffix: Cláusulas WHERE, ORDER BY o LIMIT que se añaden a la consulta
+        """
+        self.table = table
+        self.columns = [name for name, _ in columns]
+        self.lazy = [column_affinity(declared) in ("TEXT", "BLOB") for _, declared in columns]
+
+        select_list = ["rowid"]
+        for name, lazy in zip(self.columns, self.lazy):
+            column = quote_identifier(name)
+            if lazy:
+                select_list.append(
+                    f"CASE WHEN length({column}) > {PREVIEW_LENGTH} "
+                    f"THEN substr({column}, 1, {PREVIEW_LENGTH}) ELSE {column} END"
+                )
+                select_list.append(f"length({column})")
+            else:
+                select_list.append(column)
+        self.sql = f"SELECT {', '.join(select_list)} FROM {quote_identifier(table)}"
+        if suffix:
+            self.sql += f" {suffix}"
+
+    def convert(self, rows):
+        """
+        Convierte las filas de la consulta en filas del resultado, sustituyendo los
+        valores truncados por LazyValue. Puede ejecutarse en un hilo de trabajo.
+
+        Args:
+            rows: Filas devueltas por self.sql
+
+        Returns:
+            Tupla (filas, descripción) con el mismo formato que run_sql
+        """
+        converted = []
+        for row in rows:
+            rowid = row[0]
+            values = []
+            position = 1
+            for name, lazy in zip(self.columns, self.lazy):
+                value = row[position]
+                if lazy:
+                    length = row[position + 1]
+                    if length is not None and length > PREVIEW_LENGTH and isinstance(value, (str, bytes)):
+                        value = LazyValue(value, length, self.table, name, rowid)
+                    position += 2
+                else:
+                    position += 1
+                values.append(value)
+            converted.append(tuple(values))
+        description = tuple((name, None, None, None, None, None, None) for name in self.columns)
+        return converted, description
+
+
+def table_preview(db_connection, table, columns, suffix=""):
+    """
+    Crea la consulta de vista previa de una tabla si tiene rowid y alguna columna TEXT o BLOB.
+
+    Parameters:
+    - db_connection: Conexión a la base de datos SQLite.
+    - table: Nombre de la tabla.
+    - columns: Lista de (nombre, tipo declarado) de sus columnas.
+    - suffix (opcional): Cláusulas WHERE, ORDER BY o LIMIT de la consulta original.
+
+    Devuelve un TablePreview, o None si la tabla debe leerse con SELECT *.
+    """
+    preview = TablePreview(table, columns, suffix)
+    if not any(preview.lazy):
+        return None
+    try:
+        db_connection.execute(f"SELECT rowid FROM {quote_identifier(table)} LIMIT 0;")
+    except sqlite3.OperationalError:
+        return None  # Tabla WITHOUT ROWID
+    return preview
+
+
+class BlobReader:
+    """
+    Lector por bloques de un valor grande de una celda. Usa Connection.blobopen
+    (Python 3.11+) para leer solo los bytes pedidos; en versiones anteriores lee
+    el valor completo con una consulta.
+    """
+
+    def __init__(self, db_connection, value):
+        """
+        Args:
+            db_connection: Conexión de solo lectura a la base de datos del valor
+            value: LazyValue que se quiere leer
+        """
+        self.value = value
+        self.blob = None
+        self.data = None
+        if hasattr(db_connection, "blobopen"):
+            self.blob = db_connection.blobopen(value.table, value.column, value.rowid, readonly=True)
+            self.size = len(self.blob)
+        else:
+            self.data = db_connection.execute(
+                f"SELECT CAST({quote_identifier(value.column)} AS BLOB) FROM {quote_identifier(value.table)} "
+                "WHERE rowid = ?;", (value.rowid,)
+            ).fetchone()[0]
+            self.size = len(self.data)
+
+    def read(self, offset, size=BLOB_CHUNK):
+        """
+        Lee un bloque de bytes del valor.
+
+        Args:
+            offset: Posición del primer byte
+            size: Número máximo de bytes que se leen
+        """
+        if self.blob is not None:
+            self.blob.seek(offset)
+            return self.blob.read(size)
+        return self.data[offset:offset + size]
+
+    def close(self):
+        """Cierra el BLOB abierto."""
+        if self.blob is not None:
+            self.blob.close()
+            self.blob = None
@@ -0,0 +1,46 @@
+import re
+
+
+class NameIndex:
+    """
+    Índice en memoria de nombres de objetos para filtrar mientras se escribe.
+    Los nombres se pasan a minúsculas una sola vez al construir el índice.
+    """
+
+    def __init__(self, names):
+        """
+        Construye el índice.
+
+        Args:
+            names: Nombres a indexar, en el orden en que se muestran
+        """
+        self.names = list(names)
+        self.lowered = [name.lower() for name in self.names]
+
+    def match(self, query):
+        """
+        Devuelve las posiciones de los nombres que coinciden con la búsqueda, sin
+        distinguir mayúsculas: primero los que empiezan por el texto, después los que
+        lo contienen y por último los que contienen sus letras en orden (búsqueda difusa).
+
+        Args:
+            query: Texto de búsqueda
+
+        Returns:
+            Lista de posiciones en self.names
+        """
+        query = query.strip().lower()
+        if not query:
+            return list(range(len(self.names)))
+
+        prefix, substring, fuzzy = [], [], []
+        fuzzy_pattern = re.compile(".*?".join(map(re.escape, query)))
+        for position, name in enumerate(self.lowered):
+            found = name.find(query)
+            if found == 0:
+                prefix.append(position)
+            elif found > 0:
+                substring.append(position)
+            elif fuzzy_pattern.search(name):
+                fuzzy.append(position)
+        return prefix + substring + fuzzy
@@ -0,0 +1,125 @@
+from utils.lazy_values import LazyValue
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional; sin él se ordena con sorted()
+    np = None
+
+# Orden de los tipos de SQLite al comparar valores: NULL < números < texto < BLOB
+TYPE_RANK = {type(None): 0, int: 1, float: 1, str: 2, bytes: 3}
+
+
+def sort_key(value):
+    """
+    Clave de ordenación que imita la comparación de valores de distinto tipo en SQLite.
+    Un valor recortado (LazyValue) se ordena como texto o BLOB por su principio, después
+    de los valores completos que coinciden con él.
+    """
+    if isinstance(value, LazyValue):
+        return TYPE_RANK[bytes if value.is_blob else str], value.prefix, value.length
+    return TYPE_RANK.get(type(value), 4), value
+
+
+class ResultBuffer:
+    """
+    Resultado de una consulta guardado en memoria.
+
+    Conserva las filas tal como se obtuvieron y, bajo demanda, una copia por columnas
+    que permite calcular estadísticas, ordenar y filtrar sin volver a consultar SQLite.
+    El orden y el filtro se representan con arreglos de índices de fila: ni las filas
+    ni los elementos de la tabla de resultados se copian o se vuelven a crear.
+    """
+
+    def __init__(self, rows, description, sql=None, db_path=None):
+        """
+        Inicializa el resultado.
+
+        Args:
+            rows: Filas devueltas por la consulta
+            description: Descripción de las columnas (cursor.description)
+            sql: Texto SQL que produjo el resultado
+            db_path: Base de datos de la que procede el resultado
+        """
+        self.rows = rows
+        self.columns = [desc[0] for desc in description]
+        self.sql = sql
+        self.db_path = db_path
+        self._column_data = None
+        self._search_text = None
+        self.order = range(len(rows))   # Permutación de índices de fila según el orden actual
+        self.sort_column = None         # Posición de la columna de ordenación
+        self.sort_descending = False
+        self.filter_text = ""
+
+    @property
+    def row_count(self):
+        """Número de filas del resultado."""
+        return len(self.rows)
+
+    def column_data(self):
+        """
+        Devuelve la copia por columnas del resultado: una tupla de valores por columna.
+        Se construye una sola vez.
+        """
+        if self._column_data is None:
+            if self.rows:
+                self._column_data = list(zip(*self.rows))
+            else:
+                self._column_data = [() for _ in self.columns]
+        return self._column_data
+
+    def column(self, position):
+        """
+        Devuelve los valores de una columna.
+
+        Args:
+            position: Posición de la columna en el resultado
+        """
+        return self.column_data()[position]
+
+    def sort(self, position, descending=False):
+        """
+        Calcula la permutación que ordena las filas por una columna.
+
+        Args:
+            position: Posición de la columna
+            descending: True para orden descendente
+        """
+        values = self.column(position)
+        indices = range(len(values))
+        if values and all(type(value) in (int, float) for value in values):
+            if np is not None:
+                permutation = np.argsort(np.fromiter(values, dtype=float, count=len(values)), kind='stable')
+                order = permutation.tolist()
+            else:
+                order = sorted(indices, key=values.__getitem__)
+        else:
+            keys = [sort_key(value) for value in values]
+            order = sorted(indices, key=keys.__getitem__)
+        if descending:
+            order.reverse()
+        self.order = order
+        self.sort_column = position
+        self.sort_descending = descending
+
+    def visible_rows(self, filter_text=None):
+        """
+        Devuelve los índices de las filas visibles: las que contienen el texto del filtro
+        en alguna columna (sin distinguir mayúsculas), en el orden actual.
+
+        Args:
+            filter_text: Nuevo texto de filtro (None conserva el actual)
+        """
+        if filter_text is not None:
+            self.filter_text = filter_text
+        needle = self.filter_text.lower()
+        if not needle:
+            return list(self.order)
+        if self._search_text is None:
+            # Texto de búsqueda de cada fila, en minúsculas, calculado una sola vez
+            self._search_text = [
+                "\x1f".join("" if value is None else str(value) for value in row).lower()
+                for row in self.rows
+            ]
+        search_text = self._search_text
+        return [index for index in self.order if needle in search_text[index]]
@@ -0,0 +1,126 @@
+import re
+
+# Palabras clave de SQLite
+SQL_KEYWORDS = frozenset("""
+ABORT ACTION ADD AFTER ALL ALTER ALWAYS ANALYZE AND AS ASC ATTACH AUTOINCREMENT BEFORE BEGIN
+BETWEEN BY CASCADE CASE CAST CHECK COLLATE COLUMN COMMIT CONFLICT CONSTRAINT CREATE CROSS
+CURRENT CURRENT_DATE CURRENT_TIME CURRENT_TIMESTAMP DATABASE DEFAULT DEFERRABLE DEFERRED
+DELETE DESC DETACH DISTINCT DO DROP EACH ELSE END ESCAPE EXCEPT EXCLUDE EXCLUSIVE EXISTS
+EXPLAIN FAIL FILTER FIRST FOLLOWING FOR FOREIGN FROM FULL GENERATED GLOB GROUP GROUPS HAVING
+IF IGNORE IMMEDIATE IN INDEX INDEXED INITIALLY INNER INSERT INSTEAD INTERSECT INTO IS ISNULL
+JOIN KEY LAST LEFT LIKE LIMIT MATCH MATERIALIZED NATURAL NO NOT NOTHING NOTNULL NULL NULLS OF
+OFFSET ON OR ORDER OTHERS OUTER OVER PARTITION PLAN PRAGMA PRECEDING PRIMARY QUERY RAISE RANGE
+RECURSIVE REFERENCES REGEXP REINDEX RELEASE RENAME REPLACE RESTRICT RETURNING RIGHT ROLLBACK
+ROW ROWS SAVEPOINT SELECT SET TABLE TEMP TEMPORARY THEN TIES TO TRANSACTION TRIGGER UNBOUNDED
+UNION UNIQUE UPDATE USING VACUUM VALUES VIEW VIRTUAL WHEN WHERE WINDOW WITH WITHOUT
+INTEGER TEXT REAL BLOB NUMERIC
+""".split())
+
+# Estados del analizador al inicio de cada línea
+STATE_NORMAL = 0          # Fuera de comentarios y cadenas
+STATE_BLOCK_COMMENT = 1   # Dentro de un comentario /* ... */
+STATE_STRING = 2          # Dentro de una cadena '...'
+STATE_IDENTIFIER = 3      # Dentro de un identificador "..."
+
+# Tipos de token que se resaltan
+TOKEN_TYPES = ("keyword", "string", "comment", "number", "identifier", "parameter")
+
+NORMAL_TOKEN = re.compile(r"""
+    (?P<comment>--.*)
+  | (?P<block>/\*)
+  | (?P<string>')
+  | (?P<identifier>")
+  | (?P<number>(?<![\w.])(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+  | (?P<parameter>\?\d*|[:@$][A-Za-z_][A-Za-z0-9_]*)
+""", re.VERBOSE)
+
+# Cierre de cada construcción que puede abarcar varias líneas
+STRING_END = re.compile(r"(?:[^']|'')*'")
+IDENTIFIER_END = re.compile(r'(?:[^"]|"")*"')
+BLOCK_END = re.compile(r".*?\*/")
+
+CONTINUATIONS = {
+    STATE_BLOCK_COMMENT: (BLOCK_END, "comment"),
+    STATE_STRING: (STRING_END, "string"),
+    STATE_IDENTIFIER: (IDENTIFIER_END, "identifier"),
+}
+
+OPENERS = {
+    "block": (STATE_BLOCK_COMMENT, 2),
+    "string": (STATE_STRING, 1),
+    "identifier": (STATE_IDENTIFIER, 1),
+}
+
+
+def tokenize_line(line, state=STATE_NORMAL):
+    """
+    Divide una línea de SQL en tokens resaltables a partir del estado con el que empieza.
+
+    Parameters:
+    - line: Texto de la línea, sin el salto de línea final.
+    - state: Estado del analizador al inicio de la línea.
+
+    Devuelve una tupla (tokens, end_state), donde tokens es una lista de
+    (tipo, columna_inicio, columna_fin) y end_state es el estado al final de la línea,
+    que será el estado inicial de la siguiente.
+    """
+    tokens = []
+    pos = 0
+    length = len(line)
+
+    # Continuación de un comentario, cadena o identificador de la línea anterior
+    if state != STATE_NORMAL:
+        pattern, token_type = CONTINUATIONS[state]
+        match = pattern.match(line)
+        if not match:
+            if length:
+                tokens.append((token_type, 0, length))
+            return tokens, state
+        tokens.append((token_type, 0, match.end()))
+        pos = match.end()
+
+    while pos < length:
+        match = NORMAL_TOKEN.search(line, pos)
+        if not match:
+            break
+        kind = match.lastgroup
+        start = match.start()
+
+        if kind in OPENERS:
+            open_state, skip = OPENERS[kind]
+            pattern, token_type = CONTINUATIONS[open_state]
+            closing = pattern.match(line, start + skip)
+            if not closing:
+                tokens.append((token_type, start, length))
+                return tokens, open_state
+            tokens.append((token_type, start, closing.end()))
+            pos = closing.end()
+            continue
+
+        end = match.end()
+        if kind == "word":
+            if match.group().upper() in SQL_KEYWORDS:
+                tokens.append(("keyword", start, end))
+        else:
+            tokens.append((kind, start, end))
+        pos = end
+
+    return tokens, STATE_NORMAL
+
+
+def tokenize(sql):
+    """
+    Recorre un texto SQL completo y devuelve sus tokens resaltables.
+
+    Parameters:
+    - sql: Texto SQL.
+
+    Devuelve una lista de (tipo, línea, columna_inicio, columna_fin) con líneas numeradas desde 1.
+    """
+    state = STATE_NORMAL
+    result = []
+    for number, line in enumerate(sql.split("\n"), start=1):
+        tokens, state = tokenize_line(line, state)
+        result.extend((kind, number, start, end) for kind, start, end in tokens)
+    return result
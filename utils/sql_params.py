@@ -0,0 +1,128 @@
+import csv
+import re
+from utils.sql_lexer import tokenize
+
+# Literales numéricos que se convierten al enlazar valores escritos como texto
+INTEGER_VALUE = re.compile(r"[+-]?\d+")
+REAL_VALUE = re.compile(r"[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?")
+
+
+# Caracteres con los que empieza un parámetro; sin ninguno no hace falta analizar el texto
+PARAMETER_CHARS = re.compile(r"[?:@$]")
+
+
+def find_parameters(sql):
+    """
+    Detecta los parámetros de una sentencia SQL con el analizador léxico del editor,
+    de modo que se ignoran los que aparecen dentro de cadenas y comentarios.
+
+    Parameters:
+    - sql: Texto SQL.
+
+    Devuelve la lista de parámetros en el orden de number_parameters.
+    """
+    if not PARAMETER_CHARS.search(sql):
+        return []
+    lines = sql.split("\n")
+    return number_parameters(
+        lines[line - 1][start:end] for kind, line, start, end in tokenize(sql) if kind == "parameter"
+    )
+
+
+def number_parameters(tokens):
+    """
+    Ordena los parámetros de una sentencia tal como los numera SQLite.
+
+    Parameters:
+    - tokens: Textos de los tokens de parámetro en el orden en que aparecen.
+
+    Devuelve la lista de parámetros en el orden en que SQLite los numera: '?' toma el
+    número siguiente al mayor asignado, '?N' toma el número N y cada parámetro con nombre
+    (:nombre, @nombre, $nombre) toma el número siguiente en su primera aparición. Los
+    posicionales se muestran como '?1', '?2'... y los números sin parámetro también.
+    """
+    slots = {}   # Número del parámetro -> nombre con el que se muestra
+    named = set()
+    for token in tokens:
+        last = max(slots, default=0)
+        if token.startswith("?"):
+            position = int(token[1:]) if len(token) > 1 else last + 1
+            slots.setdefault(position, f"?{position}")
+        elif token not in named:
+            named.add(token)
+            slots[last + 1] = token
+    return [slots.get(position, f"?{position}") for position in range(1, max(slots, default=0) + 1)]
+
+
+def convert_value(text):
+    """
+    Convierte un valor escrito como texto al tipo que se enlaza: NULL pasa a None,
+    los literales enteros y reales a números y el resto se deja como texto.
+
+    Parameters:
+    - text: Valor escrito por el usuario.
+    """
+    if text.upper() == "NULL":
+        return None
+    if INTEGER_VALUE.fullmatch(text):
+        return int(text)
+    if REAL_VALUE.fullmatch(text):
+        return float(text)
+    return text
+
+
+def bind_values(parameters, values):
+    """
+    Prepara los valores de una fila en el formato que espera sqlite3: un diccionario si
+    todos los parámetros tienen nombre y una tupla si todos son posicionales. sqlite3 no
+    admite enlazar una tupla a parámetros con nombre, por lo que la mezcla se rechaza.
+
+    Parameters:
+    - parameters: Lista devuelta por find_parameters.
+    - values: Valores (ya convertidos) en el mismo orden que los parámetros.
+    """
+    if len(values) != len(parameters):
+        raise ValueError(f"Se esperaban {len(parameters)} valores y se recibieron {len(values)}")
+    positional = [parameter.startswith("?") for parameter in parameters]
+    if parameters and not any(positional):
+        return {parameter[1:]: value for parameter, value in zip(parameters, values)}
+    if not all(positional):
+        raise ValueError("No se pueden mezclar parámetros con nombre y posicionales (?, ?N) en la misma sentencia")
+    return tuple(values)
+
+
+def parse_parameter_rows(text, parameters):
+    """
+    Convierte filas de valores pegadas o leídas de un CSV en filas enlazables con executemany.
+    El separador (coma, punto y coma o tabulador) se detecta automáticamente; si la primera
+    fila contiene los nombres de los parámetros (solo si todos tienen nombre), se usa como
+    encabezado para ordenar las columnas.
+
+    Parameters:
+    - text: Texto con una fila de valores por línea.
+    - parameters: Lista devuelta por find_parameters.
+
+    Devuelve la lista de filas en el formato de bind_values.
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return []
+    try:
+        dialect = csv.Sniffer().sniff(lines[0], delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    records = list(csv.reader(lines, dialect))
+
+    names = [parameter[1:] for parameter in parameters]
+    header = [value.strip().lstrip(":@$") for value in records[0]]
+    order = None
+    if not any(parameter.startswith("?") for parameter in parameters) and sorted(header) == sorted(names):
+        order = [header.index(name) for name in names]
+        records = records[1:]
+
+    rows = []
+    for record in records:
+        if order is not None and len(record) == len(order):
+            record = [record[position] for position in order]
+        rows.append(bind_values(parameters, [convert_value(value.strip()) for value in record]))
+    return rows
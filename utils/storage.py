@@ -0,0 +1,155 @@
+import sqlite3
+
+# Operaciones de mantenimiento: nombre -> (sentencia SQL, True si escribe en la base de datos)
+MAINTENANCE_OPERATIONS = {
+    "VACUUM": ("VACUUM;", True),
+    "VACUUM INTO": ("VACUUM INTO ?;", False),
+    "Vaciado incremental": ("PRAGMA incremental_vacuum;", True),
+    "ANALYZE": ("ANALYZE;", True),
+    "Optimizar": ("PRAGMA optimize;", True),
+}
+
+AUTO_VACUUM_MODES = {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}
+
+
+def has_dbstat(db_connection):
+    """
+    Indica si la versión de SQLite incluye la tabla virtual dbstat.
+
+    Parameters:
+    - db_connection: Conexión a la base de datos SQLite.
+    """
+    try:
+        db_connection.execute("SELECT 1 FROM dbstat LIMIT 0;")
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def storage_summary(db_connection):
+    """
+    Resume el uso de páginas del archivo de base de datos con PRAGMAs,
+    disponibles en cualquier versión de SQLite.
+
+    Parameters:
+    - db_connection: Conexión a la base de datos SQLite.
+
+    Devuelve un diccionario con 'page_size', 'page_count', 'freelist_count',
+    'file_bytes', 'free_bytes', 'free_ratio' y 'auto_vacuum'.
+    """
+    page_size = db_connection.execute("PRAGMA page_size;").fetchone()[0]
+    page_count = db_connection.execute("PRAGMA page_count;").fetchone()[0]
+    freelist_count = db_connection.execute("PRAGMA freelist_count;").fetchone()[0]
+    auto_vacuum = db_connection.execute("PRAGMA auto_vacuum;").fetchone()[0]
+    return {
+        'page_size': page_size,
+        'page_count': page_count,
+        'freelist_count': freelist_count,
+        'file_bytes': page_size * page_count,
+        'free_bytes': page_size * freelist_count,
+        'free_ratio': freelist_count / page_count if page_count else 0.0,
+        'auto_vacuum': AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum)),
+    }
+
+
+def object_sizes(db_connection):
+    """
+    Calcula con dbstat el espacio que ocupa cada tabla e índice, en una sola consulta.
+
+    Parameters:
+    - db_connection: Conexión a la base de datos SQLite.
+
+    Devuelve una lista de diccionarios ordenada por tamaño con 'name', 'type', 'pages',
+    'bytes', 'payload', 'unused', 'overflow_pages', 'fill' (fracción de cada página
+    ocupada por datos) y 'fragmentation' (fracción de páginas que no siguen a la anterior
+    en el archivo al recorrer el árbol). Si dbstat no está disponible devuelve None.
+    """
+    if not has_dbstat(db_connection):
+        return None
+    query = """
+        WITH pages AS (
+            SELECT name, pageno, pagetype, pgsize, payload, unused,
+                   lag(pageno) OVER (PARTITION BY name ORDER BY path) AS previous
+            FROM dbstat
+        )
+        SELECT pages.name,
+               coalesce(sqlite_master.type, 'table'),
+               count(*),
+               sum(pgsize),
+               sum(payload),
+               sum(unused),
+               sum(pagetype = 'overflow'),
+               sum(previous IS NOT NULL AND pageno != previous + 1)
+        FROM pages LEFT JOIN sqlite_master ON sqlite_master.name = pages.name
+        GROUP BY pages.name
+        ORDER BY sum(pgsize) DESC;
+    """
+    sizes = []
+    for name, object_type, pages, size, payload, unused, overflow, jumps in db_connection.execute(query):
+        sizes.append({
+            'name': name,
+            'type': object_type,
+            'pages': pages,
+            'bytes': size,
+            'payload': payload,
+            'unused': unused,
+            'overflow_pages': overflow,
+            'fill': (size - unused) / size if size else 0.0,
+            'fragmentation': jumps / (pages - 1) if pages > 1 else 0.0,
+        })
+    return sizes
+
+
+def table_row_estimates(db_connection):
+    """
+    Alternativa a object_sizes cuando dbstat no está disponible: estima las filas de cada
+    tabla con las estadísticas de ANALYZE (sqlite_stat1), sin recorrer las tablas. El
+    tamaño del archivo y de la lista de páginas libres lo da storage_summary.
+
+    Parameters:
+    - db_connection: Conexión a la base de datos SQLite.
+
+    Devuelve una lista de diccionarios con 'name', 'type' y 'rows' (None si la tabla no
+    tiene estadísticas).
+    """
+    tables = db_connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name;"
+    ).fetchall()
+    estimates = {}
+    try:
+        for table, stat in db_connection.execute("SELECT tbl, stat FROM sqlite_stat1;"):
+            # El primer número de stat es el de filas de la tabla (o del índice)
+            rows = str(stat or "").split(" ", 1)[0]
+            if rows.isdigit():
+                estimates[table] = max(estimates.get(table, 0), int(rows))
+    except sqlite3.OperationalError:
+        pass   # Sin sqlite_stat1: nunca se ejecutó ANALYZE
+    return [{'name': name, 'type': 'table', 'rows': estimates.get(name)} for (name,) in tables]
+
+
+def run_maintenance(db_connection, operation, target_path=None):
+    """
+    Ejecuta una operación de mantenimiento.
+
+    Parameters:
+    - db_connection: Conexión a la base de datos SQLite. VACUUM INTO admite una conexión
+      de solo lectura, ya que solo escribe en el archivo de destino.
+    - operation: Clave de MAINTENANCE_OPERATIONS.
+    - target_path (opcional): Archivo de destino de VACUUM INTO.
+
+    Devuelve el resumen de almacenamiento tras la operación.
+    """
+    sql, _ = MAINTENANCE_OPERATIONS[operation]
+    if operation == "VACUUM INTO":
+        # query_only también bloquea VACUUM INTO; se desactiva mientras dura la copia
+        query_only = db_connection.execute("PRAGMA query_only;").fetchone()[0]
+        db_connection.execute("PRAGMA query_only=OFF;")
+        try:
+            db_connection.execute(sql, (target_path,))
+        finally:
+            db_connection.execute(f"PRAGMA query_only={query_only};")
+    else:
+        # incremental_vacuum y optimize devuelven filas que hay que recorrer para que se completen
+        db_connection.execute(sql).fetchall()
+        db_connection.commit()
+    return storage_summary(db_connection)
@@ -0,0 +1,127 @@
+import sqlite3
+import threading
+from pathlib import Path
+from db.schema import quote_identifier
+
+# Alias con el que se adjunta la base de datos de origen a la conexión del destino
+SOURCE_ALIAS = "tsuki_source"
+
+
+class TableCopier:
+    """
+    Copia de tablas de una base de datos a otro archivo SQLite sin pasar los datos por Python.
+
+    Abre el archivo de destino, adjunta el origen en solo lectura con ATTACH y, en una
+    única transacción, crea cada tabla con su DDL original, copia las filas con
+    INSERT INTO ... SELECT (con un filtro WHERE opcional por tabla) y crea después sus
+    índices, que así se construyen una sola vez sobre los datos ya copiados.
+    """
+
+    def __init__(self, source_uri, target_path, tables, filters=None):
+        """
+        Args:
+            source_uri: URI de solo lectura de la base de datos de origen
+            target_path: Archivo de destino (se crea si no existe)
+            tables: Nombres de las tablas a copiar
+            filters: Diccionario opcional tabla -> condición WHERE
+        """
+        self.source_uri = source_uri
+        self.target_path = target_path
+        self.tables = list(tables)
+        self.filters = filters or {}
+        self.connection = None
+        self.lock = threading.Lock()   # Protege self.connection entre run() y cancel()
+        self.cancelled = threading.Event()
+        self.copied = {}   # Tabla -> filas copiadas
+
+    def cancel(self):
+        """
+        Interrumpe la copia. Puede llamarse desde otro hilo; la transacción se deshace.
+        """
+        self.cancelled.set()
+        with self.lock:
+            if self.connection:
+                self.connection.interrupt()
+
+    def run(self, progress=None):
+        """
+        Copia las tablas. Debe ejecutarse en un hilo de trabajo.
+
+        Args:
+            progress: Función opcional que recibe (índice, total, tabla) antes de cada tabla
+
+        Returns:
+            True si la copia terminó, False si se canceló (el destino queda como estaba;
+            si la copia creó el archivo, se elimina)
+        """
+        target = Path(self.target_path).resolve()
+        created = not target.exists()
+        # Las URIs de ATTACH solo se aceptan si la conexión también se abrió con una URI
+        connection = sqlite3.connect(target.as_uri(), uri=True)
+        with self.lock:
+            self.connection = connection
+        self.connection.isolation_level = None   # Las transacciones se controlan explícitamente
+        completed = False
+        try:
+            self.connection.execute(f"ATTACH DATABASE ? AS {SOURCE_ALIAS};", (self.source_uri,))
+            self.connection.execute("BEGIN IMMEDIATE;")
+            try:
+                for index, table in enumerate(self.tables):
+                    if self.cancelled.is_set():
+                        self.connection.execute("ROLLBACK;")
+                        return False
+                    if progress:
+                        progress(index, len(self.tables), table)
+                    self._copy_table(table)
+                self.connection.execute("COMMIT;")
+            except BaseException:
+                if self.connection.in_transaction:
+                    self.connection.execute("ROLLBACK;")
+                if self.cancelled.is_set():
+                    return False
+                raise
+            if progress:
+                progress(len(self.tables), len(self.tables), None)
+            completed = True
+            return True
+        finally:
+            with self.lock:
+                self.connection = None
+            connection.close()
+            if created and not completed:
+                target.unlink(missing_ok=True)
+
+    def _copy_table(self, table):
+        """Crea una tabla en el destino, copia sus filas y crea sus índices."""
+        source = f"{SOURCE_ALIAS}.sqlite_master"
+        row = self.connection.execute(
+            f"SELECT sql FROM {source} WHERE type = 'table' AND name = ?;", (table,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"La tabla {table} no existe en el origen")
+        exists = self.connection.execute(
+            "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = ?;", (table,)
+        ).fetchone()
+        if exists:
+            raise ValueError(f"La tabla {table} ya existe en el destino")
+        self.connection.execute(row[0])
+
+        # Las columnas generadas no se insertan: el destino las vuelve a calcular
+        columns = ", ".join(
+            quote_identifier(name) for (name,) in self.connection.execute(
+                f"SELECT name FROM pragma_table_xinfo(?, '{SOURCE_ALIAS}') WHERE hidden = 0 ORDER BY cid;",
+                (table,)
+            )
+        )
+        sql = (f"INSERT INTO main.{quote_identifier(table)} ({columns}) "
+               f"SELECT {columns} FROM {SOURCE_ALIAS}.{quote_identifier(table)}")
+        where = self.filters.get(table, "").strip()
+        if where:
+            sql += f" WHERE {where}"
+        self.copied[table] = self.connection.execute(sql).rowcount
+
+        indexes = self.connection.execute(
+            f"SELECT sql FROM {source} WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL;", (table,)
+        ).fetchall()
+        for (index_sql,) in indexes:
+            self.connection.execute(index_sql)